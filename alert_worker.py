@@ -0,0 +1,302 @@
+"""
+Scheduled renewal-notice alerts.
+
+RenewalAlertWorker checks contracts against their renewal notice date
+(end_date - renewal_notice_days) and end date on a cadence, independent
+of anyone opening the dashboard. Each run only evaluates contracts whose
+notice or end date fell inside the window since the previous run, plus
+contracts added or changed since then; the run's watermarks are kept in
+the database's sync_state table. Fired alerts go into contract_alerts,
+whose unique key deduplicates them, and notifications are emailed in one
+digest per run. Unsent notifications are retried on the next run.
+
+For offline use, LocalSMTPSink is a minimal SMTP server that saves every
+message it receives as an .eml file, standing in for a real mail server.
+"""
+
+import os
+import smtplib
+import socketserver
+import threading
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Dict, List, Optional
+
+from database import Database
+
+
+# sync_state keys holding the previous run's watermarks
+LAST_RUN_KEY = 'renewal_alerts_last_run'
+LAST_CONTRACT_ID_KEY = 'renewal_alerts_last_contract_id'
+LAST_CHANGE_KEY = 'renewal_alerts_changed_since'
+
+# Alert types
+RENEWAL_NOTICE = 'renewal_notice'
+EXPIRED = 'expired'
+
+# Contract statuses that can still be renewed
+RENEWABLE_STATUSES = ('Active', 'Pending Renewal')
+
+
+class SMTPNotifier:
+    """Sends alert digests by email."""
+    
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 sender: Optional[str] = None, recipients: Optional[List[str]] = None):
+        """
+        Initialize the notifier.
+        
+        Args:
+            host: SMTP host (ALERT_SMTP_HOST, default localhost)
+            port: SMTP port (ALERT_SMTP_PORT, default 1025, the local sink's port)
+            sender: From address (ALERT_FROM)
+            recipients: To addresses (ALERT_TO, comma-separated)
+        """
+        self.host = host or os.environ.get('ALERT_SMTP_HOST', 'localhost')
+        self.port = port or int(os.environ.get('ALERT_SMTP_PORT', 1025))
+        self.sender = sender or os.environ.get('ALERT_FROM', 'alerts@vendor-dashboard.local')
+        self.recipients = recipients or os.environ.get('ALERT_TO', 'vendor-ops@localhost').split(',')
+    
+    def send(self, alerts: List[Dict]) -> bool:
+        """
+        Email one digest covering the given alerts.
+        
+        Returns:
+            True if the message was accepted by the SMTP server
+        """
+        message = EmailMessage()
+        message['Subject'] = f"{len(alerts)} contract renewal alert(s)"
+        message['From'] = self.sender
+        message['To'] = ', '.join(self.recipients)
+        message.set_content("\n".join(f"- {alert['message']}" for alert in alerts))
+        
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+                smtp.send_message(message)
+            return True
+        except (OSError, smtplib.SMTPException) as e:
+            print(f"Alert notification error: {e}")
+            return False
+
+
+class RenewalAlertWorker:
+    """Fires renewal-notice and expiry alerts for contracts."""
+    
+    def __init__(self, db: Database, notifier: Optional[SMTPNotifier] = None):
+        """
+        Initialize the worker.
+        
+        Args:
+            db: Database holding contracts, alerts and run state
+            notifier: Notification sender (defaults to SMTPNotifier())
+        """
+        self.db = db
+        self.notifier = notifier or SMTPNotifier()
+        self.last_result = None
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    @staticmethod
+    def evaluate(contract: Dict, today: str) -> List[tuple]:
+        """
+        Alerts due for one contract as of today (YYYY-MM-DD).
+        
+        Returns:
+            List of (contract_id, alert_type, due_date, message)
+        """
+        if contract['status'] not in RENEWABLE_STATUSES or not contract['end_date']:
+            return []
+        
+        name = f"{contract['contract_name']} ({contract['vendor_name'] or 'unknown vendor'})"
+        if contract['end_date'] <= today:
+            return [(contract['id'], EXPIRED, contract['end_date'],
+                     f"{name} ended on {contract['end_date']} and is still {contract['status']}")]
+        if contract['notice_date'] and contract['notice_date'] <= today:
+            return [(contract['id'], RENEWAL_NOTICE, contract['notice_date'],
+                     f"{name} reached its renewal notice date {contract['notice_date']}; "
+                     f"it ends on {contract['end_date']}")]
+        return []
+    
+    def run_once(self, now: Optional[datetime] = None) -> Dict:
+        """
+        Evaluate contracts whose alert window changed since the last run.
+        
+        Args:
+            now: Time of the run (defaults to now)
+        
+        Returns:
+            Dictionary with contracts_checked, alerts_fired and notified counts
+        """
+        now = now or datetime.now()
+        today = now.strftime("%Y-%m-%d")
+        last_run = self.db.get_sync_state(LAST_RUN_KEY)
+        last_contract_id = int(self.db.get_sync_state(LAST_CONTRACT_ID_KEY) or 0)
+        
+        # Contract changes are tracked on the database clock, like updated_at
+        changed_since = self.db.get_sync_state(LAST_CHANGE_KEY)
+        run_started = self.db.get_current_timestamp()
+        
+        # Dates from the previous run's day onwards can have come due since;
+        # the first run looks at everything up to today
+        window_start = last_run[:10] if last_run else None
+        contracts = self.db.get_contracts_for_alerts(window_start, today, changed_since, last_contract_id)
+        
+        alerts = []
+        for contract in contracts.to_dict('records'):
+            alerts.extend(self.evaluate(contract, today))
+        new_ids = self.db.record_contract_alerts(alerts)
+        
+        # Notify every alert not sent yet, including earlier failures
+        pending = self.db.get_pending_alerts()
+        notified = 0
+        if len(pending) > 0 and self.notifier.send(pending.to_dict('records')):
+            self.db.mark_alerts_notified(pending['id'].tolist())
+            notified = len(pending)
+        
+        self.db.set_sync_state(LAST_RUN_KEY, now.strftime("%Y-%m-%d %H:%M:%S"))
+        self.db.set_sync_state(LAST_CHANGE_KEY, run_started)
+        if len(contracts) > 0:
+            self.db.set_sync_state(LAST_CONTRACT_ID_KEY, str(max(last_contract_id, int(contracts['id'].max()))))
+        
+        return {'contracts_checked': len(contracts), 'alerts_fired': len(new_ids), 'notified': notified}
+    
+    def start(self, interval_seconds: float = 3600):
+        """Run run_once every interval_seconds on a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        
+        def run():
+            while not self._stop_event.is_set():
+                try:
+                    self.last_result = self.run_once()
+                except Exception as e:
+                    print(f"Renewal alert error: {e}")
+                self._stop_event.wait(interval_seconds)
+        
+        self._thread = threading.Thread(target=run, name='renewal-alerts', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background alert thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+class _SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP to accept a message and save it."""
+    
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+    
+    def handle(self):
+        self.reply("220 localhost SMTP sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+            
+            if command.startswith(("HELO", "EHLO")):
+                self.reply("250 localhost")
+            elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data_line in iter(self.rfile.readline, b''):
+                    if data_line.rstrip(b"\r\n") == b".":
+                        break
+                    # Undo SMTP dot-stuffing
+                    lines.append(data_line[1:] if data_line.startswith(b"..") else data_line)
+                self.server.save(b"".join(lines))
+                self.reply("250 OK: message saved")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class LocalSMTPSink(socketserver.ThreadingTCPServer):
+    """
+    Local SMTP stand-in that writes each received message to an outbox folder.
+    
+    Point SMTPNotifier at it (the defaults match) to exercise notifications
+    without a mail server.
+    """
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, outbox: str = "outbox", host: str = "localhost", port: int = 1025):
+        """
+        Initialize the sink.
+        
+        Args:
+            outbox: Folder receiving one .eml file per message
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        super().__init__((host, port), _SMTPSinkHandler)
+        self.outbox = outbox
+        self._count = 0
+        self._count_lock = threading.Lock()
+        os.makedirs(outbox, exist_ok=True)
+    
+    @property
+    def port(self) -> int:
+        """Port the sink is listening on."""
+        return self.server_address[1]
+    
+    def save(self, data: bytes) -> str:
+        """Write a received message to the outbox and return its path."""
+        with self._count_lock:
+            self._count += 1
+            name = f"{datetime.now():%Y%m%d-%H%M%S}-{self._count:04d}.eml"
+        path = os.path.join(self.outbox, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+    
+    def start(self):
+        """Serve on a background thread."""
+        threading.Thread(target=self.serve_forever, name='smtp-sink', daemon=True).start()
+    
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Fire contract renewal alerts.")
+    parser.add_argument("--db", default="vendor_management.db", help="SQLite database path")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Seconds between runs (0 runs once and exits)")
+    parser.add_argument("--smtp-sink", metavar="OUTBOX",
+                        help="Also run a local SMTP stand-in saving messages to this folder")
+    args = parser.parse_args()
+    
+    sink = None
+    if args.smtp_sink:
+        sink = LocalSMTPSink(args.smtp_sink, port=int(os.environ.get('ALERT_SMTP_PORT', 1025)))
+        sink.start()
+    
+    worker = RenewalAlertWorker(Database(args.db))
+    if args.interval > 0:
+        worker.start(args.interval)
+        try:
+            worker._thread.join()
+        except KeyboardInterrupt:
+            worker.stop()
+    else:
+        print(worker.run_once())
+    
+    if sink:
+        sink.stop()
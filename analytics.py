@@ -0,0 +1,304 @@
+"""
+Aggregation API for the dashboard's rollups.
+
+Group-bys such as budget by project status, spend by vendor type and
+tickets by type, and time rollups with running totals, go through
+group_aggregate() and time_rollup() instead of ad-hoc pandas code, so
+they can run on an embedded analytical engine at scale:
+
+- 'duckdb' (optional package): SQL over the frame's Arrow form or over a
+  Parquet snapshot file; window queries run in SQL;
+- 'arrow' (optional pyarrow): pyarrow.compute's multi-threaded group_by;
+- 'pandas': groupby, always available.
+
+By default frames smaller than ENGINE_MIN_ROWS use pandas, whose per-call
+overhead is lowest. Larger frames prefer Arrow: DuckDB has to convert a
+frame before scanning it, which costs about what it saves. Parquet files
+prefer DuckDB, which reads only the row groups and columns it needs (see
+the analytics benchmark group). ANALYTICS_ENGINE forces one engine for
+every call. Every engine returns the same frame: the group columns,
+sorted, then one column per aggregation.
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # the arrow engine and Parquet sources are unavailable
+    pa = None
+
+try:
+    import duckdb
+except ImportError:  # the duckdb engine is unavailable
+    duckdb = None
+
+
+# A DataFrame, or the path of a Parquet file (e.g. a read model snapshot)
+Source = Union[pd.DataFrame, str]
+
+# Output column -> (input column, function)
+Aggregations = Dict[str, Tuple[str, str]]
+
+# Supported functions; 'size' counts rows, 'count' non-null values
+AGG_FUNCTIONS = ('sum', 'mean', 'min', 'max', 'count', 'size')
+
+# Time buckets for time_rollup
+FREQUENCIES = ('day', 'week', 'month', 'quarter', 'year')
+
+# Engines tried in order for large frames and for Parquet files
+FRAME_ENGINES = ('arrow', 'duckdb', 'pandas')
+FILE_ENGINES = ('duckdb', 'arrow', 'pandas')
+
+# Inputs with fewer rows than this use pandas
+ENGINE_MIN_ROWS = 100000
+
+_SQL_FUNCTIONS = {'sum': 'SUM({})', 'mean': 'AVG({})', 'min': 'MIN({})', 'max': 'MAX({})',
+                  'count': 'COUNT({})', 'size': 'COUNT(*)'}
+_PANDAS_PERIODS = {'day': 'D', 'week': 'W', 'month': 'M', 'quarter': 'Q', 'year': 'Y'}
+
+_duckdb_connection = None
+_duckdb_lock = threading.Lock()
+
+
+def available_engines() -> List[str]:
+    """List engines usable with the installed packages."""
+    installed = {'duckdb': duckdb is not None, 'arrow': pa is not None, 'pandas': True}
+    return [engine for engine in FILE_ENGINES if installed[engine]]
+
+
+def choose_engine(source: Source) -> str:
+    """Engine for a source (ANALYTICS_ENGINE overrides)."""
+    available = available_engines()
+    forced = os.environ.get('ANALYTICS_ENGINE', 'auto').lower()
+    if forced != 'auto':
+        if forced not in available:
+            raise ValueError(f"Analytics engine not available: {forced}")
+        return forced
+    if not isinstance(source, pd.DataFrame):
+        return next(engine for engine in FILE_ENGINES if engine in available)
+    if len(source) < ENGINE_MIN_ROWS:
+        return 'pandas'
+    return next(engine for engine in FRAME_ENGINES if engine in available)
+
+
+def _validate(aggregations: Aggregations, freq: Optional[str] = None):
+    for name, (_, func) in aggregations.items():
+        if func not in AGG_FUNCTIONS:
+            raise ValueError(f"Unsupported aggregation for {name}: {func}")
+    if freq is not None and freq not in FREQUENCIES:
+        raise ValueError(f"Unsupported frequency: {freq}")
+
+
+def _columns(by: List[str], aggregations: Aggregations, where: Optional[Dict], extra: Iterable[str] = ()) -> List[str]:
+    """Input columns a query reads."""
+    needed = list(by) + [column for column, _ in aggregations.values()] + list(where or {}) + list(extra)
+    return list(dict.fromkeys(needed))
+
+
+def _finish(result: pd.DataFrame, keys: List[str], aggregations: Aggregations) -> pd.DataFrame:
+    """Sort by the group keys and put columns in a common order."""
+    if keys:
+        result = result.sort_values(keys, kind='stable', na_position='last')
+    return result[keys + list(aggregations)].reset_index(drop=True)
+
+
+def _running_totals(result: pd.DataFrame, by: List[str], aggregations: Aggregations) -> pd.DataFrame:
+    """Turn per-period aggregates into running totals within each group."""
+    result = result.sort_values(by + ['period'], kind='stable')
+    grouped = result.groupby(by, observed=True, dropna=False, sort=False) if by else result
+    for name in aggregations:
+        result[name] = grouped[name].cumsum()
+    return result
+
+
+# pandas
+
+def _pandas_frame(source: Source, columns: List[str]) -> pd.DataFrame:
+    if isinstance(source, pd.DataFrame):
+        return source
+    return pd.read_parquet(source, columns=columns)
+
+
+def _pandas_aggregate(source: Source, by: List[str], aggregations: Aggregations, where: Optional[Dict],
+                      bucket: Optional[Tuple[str, str]] = None) -> pd.DataFrame:
+    df = _pandas_frame(source, _columns(by, aggregations, where, [bucket[0]] if bucket else []))
+    if where:
+        mask = pd.Series(True, index=df.index)
+        for column, values in where.items():
+            mask &= df[column].isin(list(values))
+        df = df[mask.to_numpy()]
+    
+    keys = list(by)
+    if bucket:
+        time_column, freq = bucket
+        period = pd.to_datetime(df[time_column]).dt.to_period(_PANDAS_PERIODS[freq]).dt.start_time
+        df = df.assign(period=period.to_numpy())
+        keys = ['period'] + keys
+    
+    if not keys:
+        return pd.DataFrame({name: [df[column].agg(func) if func != 'size' else len(df)]
+                             for name, (column, func) in aggregations.items()})
+    result = df.groupby(keys, observed=True, dropna=False, sort=False).agg(**aggregations).reset_index()
+    return _finish(result, keys, aggregations)
+
+
+# Arrow
+
+def _arrow_table(source: Source, columns: List[str]) -> 'pa.Table':
+    if isinstance(source, pd.DataFrame):
+        return pa.Table.from_pandas(source[columns], preserve_index=False)
+    return pq.read_table(source, columns=columns)
+
+
+def _arrow_aggregate(source: Source, by: List[str], aggregations: Aggregations, where: Optional[Dict],
+                     bucket: Optional[Tuple[str, str]] = None) -> pd.DataFrame:
+    table = _arrow_table(source, _columns(by, aggregations, where, [bucket[0]] if bucket else []))
+    for column, values in (where or {}).items():
+        value_set = pa.array(list(values), type=table[column].type.value_type
+                             if pa.types.is_dictionary(table[column].type) else table[column].type)
+        table = table.filter(pc.is_in(table[column], value_set=value_set))
+    
+    keys = list(by)
+    if bucket:
+        time_column, freq = bucket
+        table = table.append_column('period', pc.floor_temporal(table[time_column], unit=freq))
+        keys = ['period'] + keys
+    
+    specs = [([], 'count_all') if func == 'size' else (column, func) for column, func in aggregations.values()]
+    grouped = table.group_by(keys).aggregate(specs)
+    # Aggregates come back named <column>_<function>
+    outputs = ['count_all' if func == 'size' else f"{column}_{func}" for column, func in aggregations.values()]
+    result = pd.DataFrame({**{key: grouped[key].to_pandas() for key in keys},
+                           **{name: grouped[output].to_pandas() for name, output in zip(aggregations, outputs)}})
+    return _finish(result, keys, aggregations)
+
+
+# DuckDB
+
+def _duckdb_cursor():
+    """Cursor on the process's DuckDB connection (one cursor per query and thread)."""
+    global _duckdb_connection
+    if _duckdb_connection is None:
+        with _duckdb_lock:
+            if _duckdb_connection is None:
+                _duckdb_connection = duckdb.connect()
+    return _duckdb_connection.cursor()
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _duckdb_aggregate(source: Source, by: List[str], aggregations: Aggregations, where: Optional[Dict],
+                      bucket: Optional[Tuple[str, str]] = None, cumulative: bool = False) -> pd.DataFrame:
+    cursor = _duckdb_cursor()
+    params = []
+    if isinstance(source, pd.DataFrame):
+        columns = _columns(by, aggregations, where, [bucket[0]] if bucket else [])
+        # DuckDB scans Arrow data in place; pandas string columns are converted row by row
+        cursor.register('source_frame', _arrow_table(source, columns) if pa is not None else source[columns])
+        relation = 'source_frame'
+    else:
+        relation = 'read_parquet(?)'
+        params.append(source)
+    
+    keys = [_quote(column) for column in by]
+    select = list(keys)
+    if bucket:
+        time_column, freq = bucket
+        select.insert(0, f"date_trunc('{freq}', {_quote(time_column)}) AS period")
+        keys.insert(0, 'period')
+    select += [f"{_SQL_FUNCTIONS[func].format(_quote(column))} AS {_quote(name)}"
+               for name, (column, func) in aggregations.items()]
+    
+    sql = f"SELECT {', '.join(select)} FROM {relation}"
+    if where:
+        sql += " WHERE " + " AND ".join(f"list_contains(?, {_quote(column)})" for column in where)
+        params += [list(values) for values in where.values()]
+    if keys:
+        sql += f" GROUP BY {', '.join(keys)}"
+    
+    if cumulative:
+        partition = f"PARTITION BY {', '.join(keys[1:])} " if len(keys) > 1 else ""
+        totals = ", ".join(f"SUM({_quote(name)}) OVER ({partition}ORDER BY period) AS {_quote(name)}"
+                           for name in aggregations)
+        sql = f"SELECT {', '.join(keys)}, {totals} FROM ({sql})"
+    
+    try:
+        result = cursor.execute(sql, params).df()
+    finally:
+        cursor.close()
+    
+    # Categoricals arrive as plain strings; restore them so groups sort in category order
+    if isinstance(source, pd.DataFrame):
+        for column in by:
+            if isinstance(source[column].dtype, pd.CategoricalDtype):
+                result[column] = result[column].astype(source[column].dtype)
+    return _finish(result, (['period'] if bucket else []) + by, aggregations)
+
+
+_ENGINES = {
+    'pandas': _pandas_aggregate,
+    'arrow': _arrow_aggregate,
+    'duckdb': _duckdb_aggregate,
+}
+
+
+def group_aggregate(source: Source, by: Union[str, List[str]], aggregations: Aggregations,
+                    where: Optional[Dict[str, Iterable]] = None, engine: Optional[str] = None) -> pd.DataFrame:
+    """
+    Group rows and aggregate them.
+    
+    Args:
+        source: DataFrame or Parquet file path
+        by: Column or columns to group by (empty for one overall row)
+        aggregations: Output column -> (input column, one of AGG_FUNCTIONS)
+        where: Column -> allowed values, applied before grouping
+        engine: Engine to use (default: choose_engine(source))
+    
+    Returns:
+        DataFrame with the group columns, sorted, then the aggregations
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    _validate(aggregations)
+    engine = engine or choose_engine(source)
+    return _ENGINES[engine](source, by, aggregations, where)
+
+
+def time_rollup(source: Source, time_column: str, aggregations: Aggregations, freq: str = 'month',
+                by: Union[str, List[str], None] = None, cumulative: bool = False,
+                where: Optional[Dict[str, Iterable]] = None, engine: Optional[str] = None) -> pd.DataFrame:
+    """
+    Aggregate rows per time period, optionally as running totals.
+    
+    Args:
+        source: DataFrame or Parquet file path
+        time_column: Datetime column bucketed into periods
+        aggregations: Output column -> (input column, one of AGG_FUNCTIONS)
+        freq: Period length, one of FREQUENCIES (weeks start on Monday)
+        by: Further columns to group by; running totals restart per group
+        cumulative: Return running totals over the periods (a window query)
+        where: Column -> allowed values, applied before grouping
+        engine: Engine to use (default: choose_engine(source))
+    
+    Returns:
+        DataFrame with a period column (period start), the by columns and
+        the aggregations, sorted by period then group
+    """
+    by = [] if by is None else [by] if isinstance(by, str) else list(by)
+    _validate(aggregations, freq)
+    if cumulative and any(func in ('mean', 'min', 'max') for _, func in aggregations.values()):
+        raise ValueError("Running totals need additive aggregations (sum, count or size)")
+    engine = engine or choose_engine(source)
+    
+    if engine == 'duckdb':
+        return _duckdb_aggregate(source, by, aggregations, where, (time_column, freq), cumulative)
+    result = _ENGINES[engine](source, by, aggregations, where, (time_column, freq))
+    if cumulative:
+        result = _finish(_running_totals(result, by, aggregations), ['period'] + by, aggregations)
+    return result
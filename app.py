@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -5,6 +6,19 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 from io import BytesIO
+from exports import ExportCache, available_formats, export_bundle, export_table, iter_frame_chunks, EXPORT_FORMATS
+from schema import CATEGORY_SETS, apply_schema, memory_usage
+from dimensions import VendorDimension
+from ticket_queue import PRIORITY_RANKS, TicketQueue, OPEN_STATUSES, RESOLVED
+from kpi_store import KPI_METRICS, compute_kpis, get_kpi_store, kpis_from_stats
+from contract_index import ContractDateIndex
+from database import Database
+from profiler import RenderProfiler, profile_mode
+from shared_cache import database_derived, database_version, get_shared_cache
+from read_model import DEFAULT_READ_MODEL_DIR, ReadModel
+from analytics import group_aggregate
+from backup import DEFAULT_BACKUP_DIR, BackupManager
+from spend_cube import SpendCube
 
 # Page configuration
 st.set_page_config(
@@ -127,6 +141,185 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Session tables, in display order
+DATA_TABLES = ['vendors', 'contracts', 'projects', 'tickets']
+
+# Record that a session table changed so results derived from it are rebuilt
+def bump_data_version(table):
+    st.session_state.data_versions[table] += 1
+
+# Re-apply categorical dtypes, e.g. after rows with new values were appended
+def retype_session_tables():
+    typed = apply_schema({table: st.session_state[table] for table in DATA_TABLES})
+    for table, df in typed.items():
+        st.session_state[table] = df
+
+# Value counts of a column, leaving out categories that have no rows
+def observed_counts(series):
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+# Versions of the given session tables
+def table_versions(tables):
+    return tuple(st.session_state.data_versions[table] for table in tables)
+
+# Object derived from session tables, cached under key and rebuilt when any of them changes
+def session_derived(key, tables, build):
+    versions = table_versions(tables)
+    cached = st.session_state.get(key)
+    if cached is None or cached[0] != versions:
+        cached = (versions, build())
+        st.session_state[key] = cached
+    return cached[1]
+
+# Vendor lookup index for the current vendors table
+def get_vendor_dimension():
+    return session_derived('vendor_dimension', ['vendors'],
+                           lambda: VendorDimension(st.session_state.vendors))
+
+# Expiry and renewal date index for the current contracts table
+def get_contract_index():
+    return session_derived('contract_index', ['contracts'],
+                           lambda: ContractDateIndex(st.session_state.contracts))
+
+# Dashboard KPIs for the current tables
+def get_current_kpis():
+    return session_derived('current_kpis', DATA_TABLES,
+                           lambda: compute_kpis({table: st.session_state[table] for table in DATA_TABLES}))
+
+# SQLite database shared with the background workers
+def database_path():
+    return os.environ.get('VENDOR_DB_PATH', 'vendor_management.db')
+
+@st.cache_resource(show_spinner=False)
+def open_database(db_path):
+    # VENDOR_DB_REPLICA=1 serves reads from an in-memory copy of the database
+    return Database(db_path, replica=os.environ.get('VENDOR_DB_REPLICA') == '1')
+
+# Database handle, or None if the database has not been created
+def get_database():
+    db_path = database_path()
+    return open_database(db_path) if os.path.exists(db_path) else None
+
+# Columnar snapshots of the database, memory-mapped and shared by every app process
+@st.cache_resource(show_spinner=False)
+def open_read_model(db_path):
+    return ReadModel(open_database(db_path), os.environ.get('READ_MODEL_DIR', DEFAULT_READ_MODEL_DIR))
+
+# Online snapshots of the database, shared by the sessions of this process
+@st.cache_resource(show_spinner=False)
+def open_backups(db_path):
+    return BackupManager(open_database(db_path), os.environ.get('BACKUP_DIR', DEFAULT_BACKUP_DIR))
+
+# Value derived from the database, cached for every app process until the
+# tables it reads change (None without a database)
+def shared_database_value(key, tables, build):
+    db = get_database()
+    if db is None:
+        return None
+    return database_derived(db, key, tables, lambda: build(db))
+
+# Contract count and value per vendor in the database
+def summarize_contracts_by_vendor(db):
+    contracts = open_read_model(db.db_path).load('contracts')
+    summary = contracts.groupby('vendor_name', dropna=False).agg(
+        contracts=('id', 'size'), total_value=('contract_value', 'sum'))
+    return summary.sort_values('total_value', ascending=False).reset_index()
+
+# Recent renewal alerts fired by alert_worker.py (empty without a database)
+@st.cache_data(ttl=60, show_spinner=False)
+def get_alert_feed(limit=10):
+    db = get_database()
+    return db.get_alert_feed(limit) if db is not None else pd.DataFrame()
+
+# Pass delta export chunks through, counting changed and deleted rows
+def count_delta_rows(chunks, counts):
+    for chunk in chunks:
+        deleted = int(chunk['is_deleted'].sum())
+        counts['deleted'] += deleted
+        counts['changed'] += len(chunk) - deleted
+        yield chunk
+
+# Period-over-period comparisons offered on the dashboard
+KPI_COMPARISONS = {
+    "Yesterday": timedelta(days=1),
+    "Last week": timedelta(days=7),
+    "Last month": timedelta(days=30),
+}
+
+# Display name for a KPI metric
+def kpi_label(metric):
+    return metric.replace('_', ' ').title()
+
+# Metric delta for display: whole numbers without decimals, None without history
+def format_delta(value):
+    if value is None:
+        return None
+    return int(value) if float(value).is_integer() else round(value, 2)
+
+# Ticket queue for the current tickets table, kept in step with ticket edits
+def get_ticket_queue():
+    return session_derived('ticket_queue', ['tickets'],
+                           lambda: TicketQueue(st.session_state.tickets))
+
+# Change a ticket's status in both the session table and the queue
+def set_ticket_status(ticket_id, status):
+    queue = get_ticket_queue()
+    row = queue.set_status(ticket_id, status)
+    tickets = st.session_state.tickets
+    tickets.iloc[row, tickets.columns.get_loc('status')] = status
+    bump_data_version('tickets')
+    # The queue was updated in place, so it stays valid for the new version
+    st.session_state.ticket_queue = (table_versions(['tickets']), queue)
+
+# Append a ticket to both the session table and the queue; returns its ID
+def create_ticket(vendor_id, ticket_type, priority, description):
+    queue = get_ticket_queue()
+    tickets = st.session_state.tickets
+    ticket_id = f"TKT{len(tickets) + 1:03d}"
+    created = pd.Timestamp.now().floor('s')
+    queue.insert(ticket_id, priority, 'Open', created)
+    new_ticket = pd.DataFrame({
+        'ticket_id': [ticket_id],
+        'vendor_id': [vendor_id],
+        'ticket_type': [ticket_type],
+        'priority': [priority],
+        'status': ['Open'],
+        'created_date': [created],
+        'description': [description],
+    })
+    st.session_state.tickets = pd.concat([tickets, new_ticket], ignore_index=True)
+    retype_session_tables()
+    bump_data_version('tickets')
+    # The new row was appended to the queue too, so it stays valid
+    st.session_state.ticket_queue = (table_versions(['tickets']), queue)
+    return ticket_id
+
+# Spend Analytics measures: display name -> (table, value column, row ID column)
+SPEND_MEASURES = {
+    "Contract Value": ('contracts', 'contract_value', 'contract_id'),
+    "Project Budget": ('projects', 'budget', 'project_id'),
+}
+
+# Precomputed spend rollups for a measure, kept in step with project status edits
+def get_spend_cube(measure):
+    table, value_column, id_column = SPEND_MEASURES[measure]
+    return session_derived(f'spend_cube_{table}', [table, 'vendors'],
+                           lambda: SpendCube(st.session_state[table], value_column, id_column, get_vendor_dimension()))
+
+# Change a project's status in the session table and, once built, its spend cube
+def set_project_status(project_id, status):
+    projects = st.session_state.projects
+    row = int(np.flatnonzero(projects['project_id'].to_numpy() == project_id)[0])
+    projects.iloc[row, projects.columns.get_loc('status')] = status
+    cached = st.session_state.get('spend_cube_projects')
+    current = cached is not None and cached[0] == table_versions(['projects', 'vendors'])
+    bump_data_version('projects')
+    if current:
+        # Move the project's budget to its new status cell instead of rebuilding
+        cached[1].update(project_id, status=status)
+        st.session_state.spend_cube_projects = (table_versions(['projects', 'vendors']), cached[1])
+
 # Initialize session state for data persistence
 def initialize_session_state():
     if 'vendors' not in st.session_state:
@@ -137,6 +330,12 @@ def initialize_session_state():
         st.session_state.projects = create_sample_projects()
     if 'tickets' not in st.session_state:
         st.session_state.tickets = create_sample_tickets()
+    if 'data_versions' not in st.session_state:
+        # First run of this session: store every table with compact dtypes
+        retype_session_tables()
+        st.session_state.data_versions = {table: 0 for table in DATA_TABLES}
+    if 'export_cache' not in st.session_state:
+        st.session_state.export_cache = ExportCache()
 
 # Sample data generation functions
 def create_sample_vendors():
@@ -220,12 +419,91 @@ def create_sample_tickets():
     })
     return tickets
 
-# Helper function to convert dataframe to CSV download
-def convert_df_to_csv(df):
-    return df.to_csv(index=False).encode('utf-8')
+# Export download data, generated only when the button is clicked
+def lazy_table_export(table, export_format):
+    df = st.session_state[table]
+    version = st.session_state.data_versions[table]
+    cache = st.session_state.export_cache
+    return lambda: cache.get_or_build(table, export_format, version,
+                                      lambda: export_table(iter_frame_chunks(df), export_format))
+
+def lazy_bundle_export(export_format):
+    frames = {table: st.session_state[table] for table in DATA_TABLES}
+    version = tuple(st.session_state.data_versions[table] for table in DATA_TABLES)
+    cache = st.session_state.export_cache
+    sources = {table: (lambda df=df: iter_frame_chunks(df)) for table, df in frames.items()}
+    return lambda: cache.get_or_build('bundle', export_format, version,
+                                      lambda: export_bundle(sources, export_format))
 
-# Main application
+# Database export download data, streamed from the database file when clicked
+def lazy_database_export(db, table, export_format):
+    version = database_version(db, [table])
+    cache = st.session_state.export_cache
+    return lambda: cache.get_or_build(f'db:{table}', export_format, version,
+                                      lambda: export_table(db.iter_table(table), export_format,
+                                                           db.get_column_types(table)))
+
+def lazy_database_bundle_export(db, export_format):
+    version = database_version(db, Database.TABLES)
+    cache = st.session_state.export_cache
+    sources = {table: (lambda table=table: db.iter_table(table)) for table in Database.TABLES}
+    return lambda: cache.get_or_build('db:bundle', export_format, version, lambda: export_bundle(
+        sources, export_format, {table: db.get_column_types(table) for table in Database.TABLES}))
+
+# Render profile of the last rerun, in the sidebar
+def show_profile_summary(summary):
+    with st.sidebar.expander(f"⏱️ Render profile: {summary['total_seconds'] * 1000:.0f} ms", expanded=True):
+        st.caption(f"{summary['messages']} messages, {summary['bytes'] / 1024:.1f} KB sent to the browser")
+        
+        ms = lambda seconds: seconds * 1000
+        sections = pd.DataFrame(summary['sections'])
+        sections['ms'] = ms(sections['seconds'])
+        sections['kb'] = sections['bytes'] / 1024
+        st.markdown("**Sections**")
+        st.dataframe(sections[['name', 'ms', 'kb']], hide_index=True, use_container_width=True,
+                     column_config={'ms': st.column_config.ProgressColumn("ms", format="%.0f", min_value=0,
+                                                                           max_value=float(sections['ms'].max())),
+                                    'kb': st.column_config.NumberColumn("KB", format="%.1f")})
+        
+        if summary['elements']:
+            elements = pd.DataFrame(summary['elements'])
+            elements['ms'] = ms(elements['seconds'])
+            elements['kb'] = elements['bytes'] / 1024
+            st.markdown("**Charts and tables**")
+            st.dataframe(elements[['element', 'section', 'ms', 'kb']], hide_index=True, use_container_width=True,
+                         column_config={'ms': st.column_config.NumberColumn("ms", format="%.1f"),
+                                        'kb': st.column_config.NumberColumn("KB", format="%.1f")})
+        
+        if summary['packages']:
+            packages = pd.DataFrame({'package': list(summary['packages']),
+                                     'ms': ms(pd.Series(list(summary['packages'].values())))})
+            st.markdown("**Self time by package**")
+            st.dataframe(packages, hide_index=True, use_container_width=True,
+                         column_config={'ms': st.column_config.ProgressColumn("ms", format="%.0f", min_value=0,
+                                                                               max_value=float(packages['ms'].max()))})
+            
+            functions = pd.DataFrame(summary['top_functions'])
+            functions['cumulative_ms'] = ms(functions['cumulative_seconds'])
+            st.markdown("**Top functions (cumulative)**")
+            st.dataframe(functions[['function', 'calls', 'cumulative_ms']], hide_index=True, use_container_width=True,
+                         column_config={'cumulative_ms': st.column_config.NumberColumn("ms", format="%.0f")})
+
+# Main application; ?profile=1 or DASHBOARD_PROFILE=1 profiles each rerun
 def main():
+    profile = profile_mode(st.query_params)
+    if profile is None:
+        render_app()
+        return
+    
+    profiler = RenderProfiler(use_cprofile=profile == 'full')
+    profiler.start()
+    try:
+        render_app(profiler)
+    finally:
+        profiler.stop()
+    show_profile_summary(profiler.write_log())
+
+def render_app(profiler=None):
     initialize_session_state()
     
     # Sidebar navigation
@@ -235,7 +513,7 @@ def main():
     page = st.sidebar.radio(
         "Navigation",
         ["Dashboard Overview", "Vendor Directory", "Contract Tracker", 
-         "Project Coordination", "Ticket System", "Data Management"]
+         "Project Coordination", "Ticket System", "Spend Analytics", "Data Management"]
     )
     
     st.sidebar.markdown("---")
@@ -246,6 +524,8 @@ def main():
     st.sidebar.metric("Open Tickets", len(st.session_state.tickets[st.session_state.tickets['status'].isin(['Open', 'In Progress'])]))
     
     # Page routing
+    if profiler is not None:
+        profiler.set_page(page)
     if page == "Dashboard Overview":
         show_dashboard()
     elif page == "Vendor Directory":
@@ -256,6 +536,8 @@ def main():
         show_project_coordination()
     elif page == "Ticket System":
         show_ticket_system()
+    elif page == "Spend Analytics":
+        show_spend_analytics()
     elif page == "Data Management":
         show_data_management()
 
@@ -264,32 +546,49 @@ def show_dashboard():
     st.markdown("**Comprehensive view of vendor operations and key metrics**")
     st.markdown("---")
     
-    # Key Metrics Row
-    col1, col2, col3, col4 = st.columns(4)
-    
     vendors_df = st.session_state.vendors
     contracts_df = st.session_state.contracts
     projects_df = st.session_state.projects
     tickets_df = st.session_state.tickets
+    vendor_dim = get_vendor_dimension()
+    contract_index = get_contract_index()
+    
+    kpis = get_current_kpis()
+    kpi_store = get_kpi_store()
+    
+    # Key Metrics Row
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        active_vendors = len(vendors_df[vendors_df['status'] == 'Active'])
-        st.metric("Active Vendors", active_vendors, delta=f"{len(vendors_df[vendors_df['status'] == 'Onboarding'])} onboarding")
+        onboarding = len(vendors_df[vendors_df['status'] == 'Onboarding'])
+        st.metric("Active Vendors", kpis['active_vendors'], help=f"{onboarding} onboarding")
     
     with col2:
-        active_contracts = len(contracts_df[contracts_df['status'] == 'Active'])
-        expiring_soon = len(contracts_df[(contracts_df['end_date'] - datetime.now()) <= timedelta(days=30)])
-        st.metric("Active Contracts", active_contracts, delta=f"-{expiring_soon} expiring soon", delta_color="inverse")
+        expiring_soon = len(contract_index.ending_between(None, datetime.now() + timedelta(days=30)))
+        st.metric("Active Contracts", kpis['active_contracts'], help=f"{expiring_soon} expiring within 30 days")
     
     with col3:
-        active_projects = len(projects_df[projects_df['status'] == 'In Progress'])
         completed_projects = len(projects_df[projects_df['status'] == 'Completed'])
-        st.metric("Active Projects", active_projects, delta=f"{completed_projects} completed")
+        st.metric("Active Projects", kpis['active_projects'], help=f"{completed_projects} completed")
     
     with col4:
-        open_tickets = len(tickets_df[tickets_df['status'].isin(['Open', 'In Progress'])])
-        high_priority = len(tickets_df[(tickets_df['status'].isin(['Open', 'In Progress'])) & (tickets_df['priority'] == 'High')])
-        st.metric("Open Tickets", open_tickets, delta=f"{high_priority} high priority", delta_color="inverse")
+        st.metric("Open Tickets", kpis['open_tickets'], help=f"{kpis['high_priority_tickets']} high priority")
+    
+    # The database's KPIs are snapshotted (at most once per hour), and their
+    # deltas come from the snapshot history. Session tables are never
+    # recorded, so the history only ever holds values from the database.
+    stats = shared_database_value('dashboard_stats', Database.TABLES, lambda db: db.get_dashboard_stats())
+    if stats is not None:
+        database_kpis = kpis_from_stats(stats)
+        kpi_store.record(database_kpis)
+        st.markdown("**Database KPIs**")
+        compare_to = st.radio("Compare with", list(KPI_COMPARISONS), horizontal=True)
+        deltas = kpi_store.deltas(database_kpis, datetime.now() - KPI_COMPARISONS[compare_to])
+        for col, metric in zip(st.columns(len(database_kpis)), database_kpis):
+            with col:
+                value = database_kpis[metric]
+                st.metric(kpi_label(metric), f"${value:,.0f}" if metric == 'total_contract_value' else int(value),
+                          delta=format_delta(deltas[metric]))
     
     st.markdown("---")
     
@@ -298,18 +597,17 @@ def show_dashboard():
     
     # Contract expiration alerts
     today = datetime.now()
-    expiring_30 = contracts_df[(contracts_df['end_date'] - today <= timedelta(days=30)) & 
-                                (contracts_df['end_date'] >= today) &
-                                (contracts_df['status'] == 'Active')]
-    expiring_60 = contracts_df[(contracts_df['end_date'] - today <= timedelta(days=60)) & 
-                                (contracts_df['end_date'] - today > timedelta(days=30)) &
-                                (contracts_df['status'] == 'Active')]
+    expiring_30 = contracts_df.take(contract_index.ending_between(today, today + timedelta(days=30)))
+    expiring_30 = expiring_30[expiring_30['status'] == 'Active']
+    expiring_60 = contracts_df.take(contract_index.ending_between(today + timedelta(days=30), today + timedelta(days=60),
+                                                                  inclusive='right'))
+    expiring_60 = expiring_60[expiring_60['status'] == 'Active']
     
     if len(expiring_30) > 0:
         st.markdown(f'<div class="alert-danger">⚠️ <strong>{len(expiring_30)} contracts expiring within 30 days</strong></div>', 
                    unsafe_allow_html=True)
         for _, contract in expiring_30.iterrows():
-            vendor_name = vendors_df[vendors_df['vendor_id'] == contract['vendor_id']]['vendor_name'].values[0]
+            vendor_name = vendor_dim.name(contract['vendor_id'])
             days_left = (contract['end_date'] - today).days
             st.warning(f"📄 {vendor_name} - Contract {contract['contract_id']} expires in {days_left} days ({contract['end_date'].strftime('%Y-%m-%d')})")
     
@@ -324,6 +622,14 @@ def show_dashboard():
         st.markdown(f'<div class="alert-warning">🎫 <strong>{len(high_priority_tickets)} high priority tickets need attention</strong></div>', 
                    unsafe_allow_html=True)
     
+    # Renewal notices fired by the scheduled alert worker
+    alert_feed = get_alert_feed()
+    if len(alert_feed) > 0:
+        with st.expander(f"📬 Renewal alert feed ({len(alert_feed)} most recent)"):
+            for alert in alert_feed.itertuples():
+                sent = "notified" if alert.notified_at else "pending notification"
+                st.markdown(f"**{alert.fired_at}** · {alert.message} _({sent})_")
+    
     st.markdown("---")
     
     # Charts Row 1
@@ -331,7 +637,7 @@ def show_dashboard():
     
     with col1:
         st.subheader("Vendor Status Distribution")
-        status_counts = vendors_df['status'].value_counts()
+        status_counts = observed_counts(vendors_df['status'])
         fig = px.pie(values=status_counts.values, names=status_counts.index, 
                     color_discrete_sequence=['#28a745', '#ffc107', '#dc3545'])
         fig.update_traces(textposition='inside', textinfo='percent+label')
@@ -339,7 +645,7 @@ def show_dashboard():
     
     with col2:
         st.subheader("Vendor Types")
-        type_counts = vendors_df['vendor_type'].value_counts()
+        type_counts = observed_counts(vendors_df['vendor_type'])
         fig = px.bar(x=type_counts.index, y=type_counts.values,
                     labels={'x': 'Vendor Type', 'y': 'Count'},
                     color=type_counts.values,
@@ -352,7 +658,7 @@ def show_dashboard():
     
     with col1:
         st.subheader("Project Status Overview")
-        project_status = projects_df['status'].value_counts()
+        project_status = observed_counts(projects_df['status'])
         fig = px.bar(x=project_status.index, y=project_status.values,
                     labels={'x': 'Status', 'y': 'Number of Projects'},
                     color=project_status.values,
@@ -362,13 +668,33 @@ def show_dashboard():
     
     with col2:
         st.subheader("Ticket Priority Breakdown")
-        ticket_priority = tickets_df[tickets_df['status'].isin(['Open', 'In Progress'])]['priority'].value_counts()
+        ticket_priority = observed_counts(tickets_df[tickets_df['status'].isin(['Open', 'In Progress'])]['priority'])
         colors = {'High': '#dc3545', 'Medium': '#ffc107', 'Low': '#28a745'}
         fig = go.Figure(data=[go.Pie(labels=ticket_priority.index, values=ticket_priority.values,
                                      marker=dict(colors=[colors.get(x, '#1f77b4') for x in ticket_priority.index]))])
         fig.update_traces(textposition='inside', textinfo='percent+label')
         st.plotly_chart(fig, use_container_width=True)
     
+    # KPI Trends, read from the snapshot store
+    st.subheader("📈 KPI Trends")
+    col1, col2 = st.columns([3, 1])
+    
+    with col2:
+        trend_metrics = st.multiselect("Metrics", KPI_METRICS,
+                                       default=['active_vendors', 'active_contracts'], format_func=kpi_label)
+        trend_freq = st.selectbox("Granularity", ['hour', 'day', 'week', 'month'], index=1)
+        trend_days = st.selectbox("Range", [7, 30, 90, 365], index=2, format_func=lambda d: f"Last {d} days")
+    
+    with col1:
+        history = kpi_store.query(trend_metrics, start=datetime.now() - timedelta(days=trend_days), freq=trend_freq)
+        if trend_metrics and len(history) > 1:
+            fig = px.line(history.rename(columns=kpi_label), markers=True,
+                          labels={'timestamp': 'Date', 'value': 'Value', 'variable': 'Metric'})
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info(f"Trends appear once the database's KPIs have been recorded in more than one {trend_freq} "
+                    "(by this dashboard while the database exists, or by `python kpi_store.py`).")
+    
     # Contract Value Timeline
     st.subheader("Contract Timeline & Value")
     contracts_sorted = contracts_df[contracts_df['status'] == 'Active'].sort_values('end_date')
@@ -446,14 +772,10 @@ def show_vendor_directory():
             create_gdrive_folder = st.checkbox("Create Google Drive folder for this vendor", value=True)
             
             if create_gdrive_folder:
-                st.info("""
-                📁 **This will create:**
-                - Vendor Name/
-                  - Contracts/
-                  - Documents/
-                  - Communications/
-                  - Invoices/
-                """)
+                from google_drive import get_folder_template
+                vendor_template = get_folder_template('vendor')
+                st.info("📁 **This will create:**")
+                st.code(vendor_template.format_tree("Vendor Name"), language="text")
             
             submitted = st.form_submit_button("Add Vendor", type="primary")
             
@@ -478,6 +800,8 @@ def show_vendor_directory():
                     
                     # Add to session state
                     st.session_state.vendors = pd.concat([st.session_state.vendors, new_vendor], ignore_index=True)
+                    retype_session_tables()
+                    bump_data_version('vendors')
                     
                     st.success(f"✅ Vendor '{new_vendor_name}' added successfully! (ID: {new_vendor_id})")
                     
@@ -487,23 +811,32 @@ def show_vendor_directory():
                         st.markdown("**📁 Google Drive Folder Creation**")
                         
                         # Check if google drive is configured
-                        from google_drive import get_drive_manager
+                        from google_drive import get_drive_manager, get_default_parent_folder_id
                         drive_manager = get_drive_manager()
                         
                         if drive_manager.is_configured():
                             with st.spinner("Creating Google Drive folder structure..."):
                                 try:
-                                    # Create vendor folder structure in your specific Drive folder
-                                    # Parent folder: https://drive.google.com/drive/folders/1F_WoeeYSN-Oo550x1VNEcHygHOwgY6ee
+                                    # Create vendor folder structure in the configured parent folder
                                     folder_result = drive_manager.create_project_folder_structure(
                                         new_vendor_name,
-                                        parent_folder_id="1F_WoeeYSN-Oo550x1VNEcHygHOwgY6ee"
+                                        parent_folder_id=get_default_parent_folder_id(),
+                                        template='vendor'
                                     )
                                     
                                     if folder_result:
                                         st.success(f"✅ Google Drive folders created!")
                                         st.markdown(f"📂 [Open Vendor Folder]({folder_result['main_folder_link']})")
                                         
+                                        # Record the folder in the database, where drive_sync.py keeps it current
+                                        db = get_database()
+                                        if db is not None:
+                                            db.add_vendor(new_vendor_name, new_contact_name, new_email, new_phone,
+                                                          new_location, new_status, new_notes,
+                                                          drive_folder_id=folder_result['main_folder_id'],
+                                                          drive_folder_link=folder_result['main_folder_link'],
+                                                          drive_folder_name=new_vendor_name)
+                                        
                                         # Show created subfolders
                                         st.markdown("**Created subfolders:**")
                                         for folder_name in folder_result['subfolders'].keys():
@@ -581,10 +914,11 @@ def show_contract_tracker():
     st.markdown("---")
     
     contracts_df = st.session_state.contracts
-    vendors_df = st.session_state.vendors
+    vendor_dim = get_vendor_dimension()
+    contract_index = get_contract_index()
     
-    # Merge vendor names
-    contracts_display = contracts_df.merge(vendors_df[['vendor_id', 'vendor_name']], on='vendor_id', how='left')
+    # Add vendor names
+    contracts_display = vendor_dim.join_names(contracts_df)
     
     # Filter Section
     col1, col2, col3 = st.columns(3)
@@ -602,13 +936,17 @@ def show_contract_tracker():
     with col3:
         days_to_expiry = st.slider("Days to Expiry", 0, 365, 365)
     
-    # Apply filters
+    # Apply filters: (end_date - today).days <= days_to_expiry means the
+    # contract ends before the start of day days_to_expiry + 1
     today = datetime.now()
-    filtered_contracts = contracts_display[
-        (contracts_display['status'].isin(status_filter)) &
-        (contracts_display['contract_type'].isin(contract_type_filter)) &
-        ((contracts_display['end_date'] - today).dt.days <= days_to_expiry)
+    window_rows = np.sort(contract_index.ending_between(None, today + timedelta(days=days_to_expiry + 1),
+                                                        inclusive='left'))
+    window_contracts = contracts_display.take(window_rows)
+    filtered_contracts = window_contracts[
+        (window_contracts['status'].isin(status_filter)) &
+        (window_contracts['contract_type'].isin(contract_type_filter))
     ]
+    filtered_contracts = filtered_contracts.assign(days_to_expiry=(filtered_contracts['end_date'] - today).dt.days)
     
     st.markdown(f"**Showing {len(filtered_contracts)} contracts**")
     st.markdown("---")
@@ -625,12 +963,12 @@ def show_contract_tracker():
         st.metric("Active Contracts", active_count)
     
     with col3:
-        expiring_30 = len(filtered_contracts[(filtered_contracts['end_date'] - today).dt.days <= 30])
+        expiring_30 = len(filtered_contracts[filtered_contracts['days_to_expiry'] <= 30])
         st.metric("Expiring in 30 Days", expiring_30, delta_color="inverse")
     
     with col4:
-        expiring_60 = len(filtered_contracts[((filtered_contracts['end_date'] - today).dt.days <= 60) & 
-                                            ((filtered_contracts['end_date'] - today).dt.days > 30)])
+        expiring_60 = len(filtered_contracts[(filtered_contracts['days_to_expiry'] <= 60) & 
+                                            (filtered_contracts['days_to_expiry'] > 30)])
         st.metric("Expiring in 31-60 Days", expiring_60)
     
     st.markdown("---")
@@ -638,9 +976,6 @@ def show_contract_tracker():
     # Contracts Table
     st.subheader("Contract Details")
     
-    # Calculate days to expiry
-    filtered_contracts['days_to_expiry'] = (filtered_contracts['end_date'] - today).dt.days
-    
     # Display table
     display_cols = ['contract_id', 'vendor_name', 'contract_type', 'start_date', 'end_date', 
                    'days_to_expiry', 'contract_value', 'po_number', 'status']
@@ -671,16 +1006,15 @@ def show_contract_tracker():
     # Simplified approach - build fresh timeline data
     timeline_data = []
     
-    for _, contract in contracts_df.iterrows():
+    # Only contracts inside the expiry window are visited
+    for _, contract in contracts_df.take(window_rows).iterrows():
         if contract['status'] == 'Active':
             # Get vendor name
-            vendor_match = vendors_df[vendors_df['vendor_id'] == contract['vendor_id']]
-            if len(vendor_match) > 0:
-                vendor_name = vendor_match.iloc[0]['vendor_name']
+            vendor_name = vendor_dim.name(contract['vendor_id'])
+            if vendor_name is not None:
                 
                 # Check if it matches current filters
-                if (contract['contract_type'] in contract_type_filter and
-                    (contract['end_date'] - today).days <= days_to_expiry):
+                if contract['contract_type'] in contract_type_filter:
                     
                     timeline_data.append({
                         'contract_id': contract['contract_id'],
@@ -696,7 +1030,6 @@ def show_contract_tracker():
         
         for contract_info in timeline_data:
             # Calculate renewal date using timedelta
-            from datetime import timedelta
             renewal_date = contract_info['end_date'] - timedelta(days=contract_info['renewal_notice_days'])
             
             # Contract period line
@@ -742,10 +1075,10 @@ def show_project_coordination():
     st.markdown("---")
     
     projects_df = st.session_state.projects
-    vendors_df = st.session_state.vendors
+    vendor_dim = get_vendor_dimension()
     
-    # Merge vendor names
-    projects_display = projects_df.merge(vendors_df[['vendor_id', 'vendor_name']], on='vendor_id', how='left')
+    # Add vendor names
+    projects_display = vendor_dim.join_names(projects_df)
     
     # Filter Section
     col1, col2 = st.columns(2)
@@ -823,7 +1156,19 @@ def show_project_coordination():
                     st.info("Detailed project view would open here")
             with col2:
                 if st.button("Update Status", key=f"update_{project['project_id']}"):
-                    st.info("Status update form would appear here")
+                    st.session_state.editing_project = project['project_id']
+            
+            # Status form, shown only for the project being updated
+            if st.session_state.get('editing_project') == project['project_id']:
+                with col3:
+                    status_options = CATEGORY_SETS['projects']['status']
+                    new_status = st.selectbox("New Status", status_options,
+                                              index=status_options.index(project['status']) if project['status'] in status_options else 0,
+                                              key=f"status_{project['project_id']}")
+                    if st.button("Save Status", key=f"save_{project['project_id']}"):
+                        set_project_status(project['project_id'], new_status)
+                        del st.session_state.editing_project
+                        st.rerun()
     
     st.markdown("---")
     
@@ -831,44 +1176,54 @@ def show_project_coordination():
     st.subheader("🗂️ Google Drive Folder Automation")
     st.markdown("**Automatically create organized folder structures for new projects**")
     
+    from google_drive import get_folder_template
+    project_template = get_folder_template('project')
+    
     with st.expander("Create Google Drive Project Folder"):
         st.info("📁 **Feature:** This creates a standardized folder structure in Google Drive for your project")
-        st.markdown("""
-        **Folder Structure Created:**
-        - 📂 Project Name/
-          - 📁 Contracts/
-          - 📁 Deliverables/
-          - 📁 Meeting Notes/
-          - 📁 Documentation/
-        """)
+        st.markdown("**Folder Structure Created:**")
+        st.code(project_template.format_tree("Project Name"), language="text")
         
         col1, col2 = st.columns(2)
         with col1:
             project_name_gdrive = st.text_input("Project Name", placeholder="e.g., Q4 Dataset Collection")
         with col2:
             vendor_select = st.selectbox("Associated Vendor", 
-                                        options=[''] + list(vendors_df['vendor_name'].values),
+                                        options=[''] + list(vendor_dim.names),
                                         index=0)
         
         if st.button("🚀 Create Google Drive Folder Structure", type="primary"):
             if project_name_gdrive:
                 # Check if google drive is configured
-                from google_drive import get_drive_manager
+                from google_drive import get_drive_manager, get_default_parent_folder_id
                 drive_manager = get_drive_manager()
+                parent_folder_id = get_default_parent_folder_id()
                 
                 if drive_manager.is_configured():
                     with st.spinner("Creating Google Drive folder structure..."):
                         try:
-                            # Create project folder structure in your specific Drive folder
+                            # Create project folder structure in the configured parent folder
                             folder_result = drive_manager.create_project_folder_structure(
                                 project_name_gdrive,
-                                parent_folder_id="1F_WoeeYSN-Oo550x1VNEcHygHOwgY6ee"
+                                parent_folder_id=parent_folder_id,
+                                template='project'
                             )
                             
                             if folder_result:
                                 st.success(f"✅ Google Drive folders created for: **{project_name_gdrive}**")
                                 st.markdown(f"📂 [Open Project Folder]({folder_result['main_folder_link']})")
                                 
+                                # Record the folder in the database, where drive_sync.py keeps it current
+                                db = get_database()
+                                if db is not None:
+                                    db_vendors = db.get_vendors()
+                                    matches = db_vendors.loc[db_vendors['name'] == vendor_select, 'id']
+                                    db.add_project(project_name_gdrive,
+                                                   vendor_id=int(matches.iloc[0]) if len(matches) else None,
+                                                   drive_folder_id=folder_result['main_folder_id'],
+                                                   drive_folder_link=folder_result['main_folder_link'],
+                                                   drive_folder_name=project_name_gdrive)
+                                
                                 # Show created subfolders
                                 st.markdown("**Created subfolders:**")
                                 for folder_name in folder_result['subfolders'].keys():
@@ -878,23 +1233,20 @@ def show_project_coordination():
                         except Exception as e:
                             st.error(f"Error creating folders: {str(e)}")
                 else:
-                    st.warning("""
+                    # Without a configured parent, folders go in the root of My Drive
+                    destination = (drive_manager.get_folder_link(parent_folder_id) if parent_folder_id
+                                   else "My Drive (root)")
+                    st.warning(f"""
                     ⚠️ **Google Drive not configured**
                     
                     **Next Steps to Enable:**
                     1. Set up Google Drive API credentials (see `GOOGLE_DRIVE_SETUP.md` below)
                     2. Place `credentials.json` in the project directory
                     3. Run authentication flow on first use
-                    4. Folders will be created in: https://drive.google.com/drive/folders/1F_WoeeYSN-Oo550x1VNEcHygHOwgY6ee
+                    4. Folders will be created in: {destination}
                     """)
-                    st.code(f"""
-# Folder structure that will be created:
-📂 {project_name_gdrive}/
-├── 📁 Contracts/
-├── 📁 Deliverables/
-├── 📁 Meeting Notes/
-└── 📁 Documentation/
-                    """, language="text")
+                    st.code("# Folder structure that will be created:\n"
+                            + project_template.format_tree(project_name_gdrive), language="text")
             else:
                 st.warning("Please enter a project name")
     
@@ -930,7 +1282,7 @@ def show_project_coordination():
     # Budget Allocation
     st.subheader("Budget Allocation by Status")
     
-    budget_by_status = filtered_projects.groupby('status')['budget'].sum().reset_index()
+    budget_by_status = group_aggregate(filtered_projects, 'status', {'budget': ('budget', 'sum')})
     fig = px.pie(budget_by_status, values='budget', names='status',
                 title='Budget Distribution')
     fig.update_traces(textposition='inside', textinfo='percent+label')
@@ -946,11 +1298,17 @@ def show_ticket_system():
     st.markdown("**Log and track vendor requests, issues, and support tickets**")
     st.markdown("---")
     
+    # Confirmation from the previous run, shown once after the rerun
+    ticket_flash = st.session_state.pop('ticket_flash', None)
+    if ticket_flash:
+        st.success(ticket_flash)
+    
     tickets_df = st.session_state.tickets
-    vendors_df = st.session_state.vendors
+    vendor_dim = get_vendor_dimension()
+    ticket_queue = get_ticket_queue()
     
-    # Merge vendor names
-    tickets_display = tickets_df.merge(vendors_df[['vendor_id', 'vendor_name']], on='vendor_id', how='left')
+    # Add vendor names
+    tickets_display = vendor_dim.join_names(tickets_df)
     
     # Filter Section
     col1, col2, col3, col4 = st.columns(4)
@@ -975,24 +1333,27 @@ def show_ticket_system():
                                  ["All", "Last 7 Days", "Last 30 Days", "Last 90 Days"])
     
     # Apply filters
-    filtered_tickets = tickets_display[
+    ticket_mask = (
         (tickets_display['status'].isin(status_filter)) &
         (tickets_display['priority'].isin(priority_filter)) &
         (tickets_display['ticket_type'].isin(type_filter))
-    ]
+    )
     
     if date_range == "Last 7 Days":
-        filtered_tickets = filtered_tickets[filtered_tickets['created_date'] >= datetime.now() - timedelta(days=7)]
+        ticket_mask &= tickets_display['created_date'] >= datetime.now() - timedelta(days=7)
     elif date_range == "Last 30 Days":
-        filtered_tickets = filtered_tickets[filtered_tickets['created_date'] >= datetime.now() - timedelta(days=30)]
+        ticket_mask &= tickets_display['created_date'] >= datetime.now() - timedelta(days=30)
     elif date_range == "Last 90 Days":
-        filtered_tickets = filtered_tickets[filtered_tickets['created_date'] >= datetime.now() - timedelta(days=90)]
+        ticket_mask &= tickets_display['created_date'] >= datetime.now() - timedelta(days=90)
+    
+    ticket_mask = ticket_mask.to_numpy()
+    filtered_tickets = tickets_display[ticket_mask]
     
     st.markdown(f"**Showing {len(filtered_tickets)} tickets**")
     st.markdown("---")
     
     # Summary Metrics
-    col1, col2, col3, col4 = st.columns(4)
+    col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
         total_tickets = len(filtered_tickets)
@@ -1010,21 +1371,46 @@ def show_ticket_system():
         high_priority = len(filtered_tickets[filtered_tickets['priority'] == 'High'])
         st.metric("High Priority", high_priority, delta_color="inverse")
     
+    with col5:
+        sla_breached = int(ticket_queue.breached_mask()[ticket_mask].sum())
+        st.metric("SLA Breached", sla_breached, delta_color="inverse")
+    
     st.markdown("---")
     
-    # Add New Ticket Button
-    if st.button("➕ Create New Ticket"):
-        st.info("Feature: New ticket form would appear here")
+    # Add New Ticket Section
+    with st.expander("➕ Create New Ticket"):
+        with st.form("create_ticket_form"):
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                new_vendor_id = st.selectbox("Vendor", st.session_state.vendors['vendor_id'].tolist(),
+                                             format_func=lambda vendor_id: vendor_dim.name(vendor_id))
+            
+            with col2:
+                new_ticket_type = st.selectbox("Type", CATEGORY_SETS['tickets']['ticket_type'])
+            
+            with col3:
+                new_priority = st.selectbox("Priority", list(PRIORITY_RANKS), index=1)
+            
+            new_description = st.text_area("Description *", placeholder="What does the vendor need?")
+            
+            if st.form_submit_button("Create Ticket", type="primary"):
+                if new_description:
+                    new_ticket_id = create_ticket(new_vendor_id, new_ticket_type, new_priority, new_description)
+                    # Rerun so the metrics and list above include the new ticket
+                    st.session_state.ticket_flash = f"✅ Ticket {new_ticket_id} created"
+                    st.rerun()
+                else:
+                    st.error("Please describe the ticket")
     
     st.markdown("###")
     
     # Tickets List
     st.subheader("Ticket List")
     
-    # Sort by priority and date
-    priority_order = {'High': 0, 'Medium': 1, 'Low': 2}
-    filtered_tickets['priority_rank'] = filtered_tickets['priority'].map(priority_order)
-    filtered_tickets_sorted = filtered_tickets.sort_values(['priority_rank', 'created_date'], ascending=[True, False])
+    # Queue order (priority, then newest first), restricted to the filtered tickets
+    queue_order = ticket_queue.order_positions()
+    filtered_tickets_sorted = tickets_display.take(queue_order[ticket_mask[queue_order]])
     
     for _, ticket in filtered_tickets_sorted.iterrows():
         # Priority color coding
@@ -1048,10 +1434,13 @@ def show_ticket_system():
                 st.write(f"**Priority:** {ticket['priority']}")
             
             with col2:
+                sla = ticket_queue.sla_status(ticket['ticket_id'])
+                sla_flag = "🚨 SLA breached" if sla['breached'] else "SLA on track"
+                age = f" ({sla['age'].days}d {sla['age'].seconds // 3600}h old)" if sla['age'] is not None else ""
                 st.markdown("**Vendor & Status**")
                 st.write(f"**Vendor:** {ticket['vendor_name']}")
-                st.write(f"**Status:** {ticket['status']}")
-                st.write(f"**Created:** {ticket['created_date'].strftime('%Y-%m-%d')}")
+                st.write(f"**Status:** {ticket['status']} | {sla_flag}")
+                st.write(f"**Created:** {ticket['created_date'].strftime('%Y-%m-%d')}{age} | **Due:** {sla['due'].strftime('%Y-%m-%d %H:%M')}")
             
             with col3:
                 st.markdown("**Description**")
@@ -1060,10 +1449,24 @@ def show_ticket_system():
             col1, col2, col3 = st.columns([1, 1, 4])
             with col1:
                 if st.button("Update", key=f"update_{ticket['ticket_id']}"):
-                    st.info("Update ticket form would appear here")
+                    st.session_state.editing_ticket = ticket['ticket_id']
             with col2:
-                if st.button("Resolve", key=f"resolve_{ticket['ticket_id']}"):
-                    st.success("Ticket marked as resolved")
+                if st.button("Resolve", key=f"resolve_{ticket['ticket_id']}",
+                             disabled=ticket['status'] not in OPEN_STATUSES):
+                    set_ticket_status(ticket['ticket_id'], RESOLVED)
+                    st.rerun()
+            
+            # Status form, shown only for the ticket being updated
+            if st.session_state.get('editing_ticket') == ticket['ticket_id']:
+                with col3:
+                    status_options = list(OPEN_STATUSES) + [RESOLVED]
+                    new_status = st.selectbox("New Status", status_options,
+                                              index=status_options.index(ticket['status']) if ticket['status'] in status_options else 0,
+                                              key=f"status_{ticket['ticket_id']}")
+                    if st.button("Save Status", key=f"save_{ticket['ticket_id']}"):
+                        set_ticket_status(ticket['ticket_id'], new_status)
+                        del st.session_state.editing_ticket
+                        st.rerun()
     
     st.markdown("---")
     
@@ -1072,81 +1475,170 @@ def show_ticket_system():
     
     with col1:
         st.subheader("Tickets by Type")
-        type_counts = filtered_tickets['ticket_type'].value_counts()
-        fig = px.bar(x=type_counts.index, y=type_counts.values,
-                    labels={'x': 'Ticket Type', 'y': 'Count'},
-                    color=type_counts.values,
-                    color_continuous_scale='Reds')
-        fig.update_layout(showlegend=False)
-        st.plotly_chart(fig, use_container_width=True)
+        type_counts = group_aggregate(filtered_tickets, 'ticket_type', {'count': ('ticket_id', 'size')})
+        type_counts = type_counts.sort_values('count', ascending=False)
+        if len(type_counts) > 0:
+            fig = px.bar(type_counts, x='ticket_type', y='count',
+                        labels={'ticket_type': 'Ticket Type', 'count': 'Count'},
+                        color='count',
+                        color_continuous_scale='Reds')
+            fig.update_layout(showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.info("No tickets match the current filters.")
     
     with col2:
         st.subheader("Tickets by Status")
-        status_counts = filtered_tickets['status'].value_counts()
+        status_counts = observed_counts(filtered_tickets['status'])
         colors_map = {'Open': '#ffc107', 'In Progress': '#17a2b8', 'Resolved': '#28a745'}
         fig = go.Figure(data=[go.Pie(labels=status_counts.index, values=status_counts.values,
                                      marker=dict(colors=[colors_map.get(x, '#1f77b4') for x in status_counts.index]))])
         fig.update_traces(textposition='inside', textinfo='percent+label')
         st.plotly_chart(fig, use_container_width=True)
 
+def show_spend_analytics():
+    st.markdown('<p class="main-header">Spend Analytics</p>', unsafe_allow_html=True)
+    st.markdown("**Contract value and project budget by vendor type, month and status**")
+    st.markdown("---")
+    
+    measure = st.radio("Measure", list(SPEND_MEASURES), horizontal=True)
+    cube = get_spend_cube(measure)
+    vendor_dim = get_vendor_dimension()
+    
+    # Filter Section
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        type_filter = st.multiselect("Vendor Type", options=cube.labels('vendor_type'),
+                                     default=cube.labels('vendor_type'))
+    
+    with col2:
+        status_filter = st.multiselect("Status", options=cube.labels('status'),
+                                       default=cube.labels('status'))
+    
+    with col3:
+        months = cube.labels('month')
+        if len(months) > 1:
+            first_month, last_month = st.select_slider("Start Month", options=months,
+                                                       value=(months[0], months[-1]))
+            months = [month for month in months if first_month <= month <= last_month]
+    
+    where = {'vendor_type': type_filter, 'status': status_filter, 'month': months}
+    totals = cube.rollup([], where)
+    if len(totals) == 0:
+        st.info("No spend matches the current filters.")
+        return
+    
+    by_vendor = cube.drill_down(where)
+    
+    # Metrics
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(f"Total {measure}", f"${totals['value'].iloc[0]:,.0f}")
+    with col2:
+        st.metric("Contracts" if measure == "Contract Value" else "Projects", int(totals['count'].iloc[0]))
+    with col3:
+        st.metric("Vendors", len(by_vendor))
+    with col4:
+        st.metric("Average", f"${totals['value'].iloc[0] / totals['count'].iloc[0]:,.0f}")
+    
+    st.caption(f"{len(cube):,} rows precomputed into {cube.n_cells:,} vendor, month and status cells; "
+               "project status updates are applied to the rollups in place.")
+    
+    st.markdown("---")
+    
+    # Rollups
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("By Vendor Type and Status")
+        by_type = cube.rollup(['vendor_type', 'status'], where)
+        fig = px.bar(by_type, x='vendor_type', y='value', color='status',
+                    labels={'vendor_type': 'Vendor Type', 'value': measure, 'status': 'Status'})
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        st.subheader("By Month")
+        by_month = cube.rollup(['month', 'vendor_type'], where)
+        fig = px.bar(by_month, x='month', y='value', color='vendor_type',
+                    labels={'month': 'Month', 'value': measure, 'vendor_type': 'Vendor Type'})
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Vendor type x month pivot
+    st.subheader("Vendor Type by Month")
+    pivot = cube.rollup(['vendor_type', 'month'], where).pivot(
+        index='vendor_type', columns='month', values='value').fillna(0)
+    st.dataframe(pivot.style.format("${:,.0f}"), use_container_width=True)
+    
+    st.markdown("---")
+    
+    # Vendor Drill-Down
+    st.subheader("Vendor Drill-Down")
+    drill_type = st.selectbox("Vendor Type", ["All"] + sorted(by_vendor['vendor_type'].unique()), key="drill_type")
+    if drill_type != "All":
+        by_vendor = cube.drill_down({**where, 'vendor_type': [drill_type]})
+    by_vendor.insert(1, 'vendor_name', vendor_dim.names_for(by_vendor['vendor_id']))
+    st.dataframe(by_vendor, use_container_width=True, hide_index=True,
+                 column_config={'vendor_id': "Vendor ID", 'vendor_name': "Vendor", 'vendor_type': "Type",
+                                'value': st.column_config.NumberColumn(measure, format="$%.0f"),
+                                'count': st.column_config.NumberColumn("Count", format="%d")})
+
 def show_data_management():
     st.markdown('<p class="main-header">Data Management</p>', unsafe_allow_html=True)
     st.markdown("**Import, export, and manage system data**")
     st.markdown("---")
     
-    tab1, tab2, tab3 = st.tabs(["📤 Export Data", "📥 Import Data", "📊 Data Overview"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📤 Export Data", "📥 Import Data", "📊 Data Overview", "🔁 Delta Export"])
     
     with tab1:
-        st.subheader("Export Data to CSV")
+        st.subheader("Export Data")
         st.markdown("Download current data for backup or external analysis")
         
+        export_format = st.radio("Format", available_formats(), horizontal=True)
+        extension, mime = EXPORT_FORMATS[export_format]
+        date_stamp = datetime.now().strftime('%Y%m%d')
+        
+        # The database's tables are streamed from the file in chunks; without
+        # a database, the session's tables are exported
+        db = get_database()
+        sources = ["Database", "Session tables"] if db is not None else ["Session tables"]
+        export_source = st.radio("Source", sources, horizontal=True)
+        if export_source == "Database":
+            stats = shared_database_value('dashboard_stats', Database.TABLES, lambda db: db.get_dashboard_stats())
+            export_tables = list(Database.TABLES)
+            record_counts = {table: stats[f'total_{table}'] for table in export_tables}
+            table_export = lambda table: lazy_database_export(db, table, export_format)
+            bundle_export = lazy_database_bundle_export(db, export_format)
+        else:
+            export_tables = DATA_TABLES
+            record_counts = {table: len(st.session_state[table]) for table in export_tables}
+            table_export = lambda table: lazy_table_export(table, export_format)
+            bundle_export = lazy_bundle_export(export_format)
+        
         col1, col2 = st.columns(2)
         
-        with col1:
-            st.markdown("### Vendors")
-            csv_vendors = convert_df_to_csv(st.session_state.vendors)
-            st.download_button(
-                label="⬇️ Download Vendors CSV",
-                data=csv_vendors,
-                file_name=f"vendors_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-            st.caption(f"📊 {len(st.session_state.vendors)} records")
-            
-            st.markdown("### Projects")
-            csv_projects = convert_df_to_csv(st.session_state.projects)
-            st.download_button(
-                label="⬇️ Download Projects CSV",
-                data=csv_projects,
-                file_name=f"projects_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-            st.caption(f"📊 {len(st.session_state.projects)} records")
+        for table, col in zip(export_tables, [col1, col2, col1, col2]):
+            with col:
+                st.markdown(f"### {table.title()}")
+                st.download_button(
+                    label=f"⬇️ Download {table.title()} ({export_format})",
+                    data=table_export(table),
+                    file_name=f"{table}_{date_stamp}.{extension}",
+                    mime=mime,
+                    key=f"download_{table}",
+                    use_container_width=True
+                )
+                st.caption(f"📊 {record_counts[table]} records")
         
-        with col2:
-            st.markdown("### Contracts")
-            csv_contracts = convert_df_to_csv(st.session_state.contracts)
-            st.download_button(
-                label="⬇️ Download Contracts CSV",
-                data=csv_contracts,
-                file_name=f"contracts_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-            st.caption(f"📊 {len(st.session_state.contracts)} records")
-            
-            st.markdown("### Tickets")
-            csv_tickets = convert_df_to_csv(st.session_state.tickets)
-            st.download_button(
-                label="⬇️ Download Tickets CSV",
-                data=csv_tickets,
-                file_name=f"tickets_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-            st.caption(f"📊 {len(st.session_state.tickets)} records")
+        st.markdown("### All Tables")
+        st.download_button(
+            label=f"⬇️ Download All Tables (ZIP, {export_format})",
+            data=bundle_export,
+            file_name=f"vendor_management_{date_stamp}.zip",
+            mime="application/zip",
+            key="download_bundle",
+            use_container_width=True
+        )
     
     with tab2:
         st.subheader("Import Data from CSV")
@@ -1195,9 +1687,145 @@ def show_data_management():
         
         st.markdown("---")
         
+        st.subheader("Memory Usage")
+        memory_df = memory_usage({table: st.session_state[table] for table in DATA_TABLES})
+        st.dataframe(memory_df, use_container_width=True, hide_index=True,
+                     column_config={'memory_mb': st.column_config.NumberColumn("Memory (MB)", format="%.2f")})
+        st.caption(f"Total: {memory_df['memory_mb'].sum():.2f} MB")
+        
+        st.markdown("---")
+        
         st.subheader("Sample Data")
         st.markdown("**Vendor Table Preview**")
         st.dataframe(st.session_state.vendors.head(), use_container_width=True, hide_index=True)
+        
+        stats = shared_database_value('dashboard_stats', Database.TABLES, lambda db: db.get_dashboard_stats())
+        if stats is not None:
+            st.markdown("---")
+            st.subheader("Database")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Vendors", stats['total_vendors'])
+            col2.metric("Active Contracts", stats['active_contracts'])
+            col3.metric("Active Contract Value", f"${stats['total_contract_value']:,.0f}")
+            col4.metric("Projects", stats['total_projects'])
+            
+            by_vendor = shared_database_value('contracts_by_vendor', ('contracts', 'vendors'),
+                                              summarize_contracts_by_vendor)
+            st.markdown("**Contracts by Vendor**")
+            st.dataframe(by_vendor, use_container_width=True, hide_index=True,
+                         column_config={'total_value': st.column_config.NumberColumn("Total Value", format="$%.0f")})
+            
+            cache = get_shared_cache()
+            st.caption(f"Served from the shared cache in `{cache.cache_dir}` and rebuilt when the database changes "
+                       f"(this process: {cache.stats['local_hits'] + cache.stats['shared_hits']} hits, "
+                       f"{cache.stats['builds']} builds)")
+            
+            lookups = get_database().get_lookup_cache_stats()
+            hits, misses = lookups['hits'].sum(), lookups['misses'].sum()
+            if hits + misses:
+                st.caption(f"Row lookups by ID (this process): {hits / (hits + misses):.0%} served from the "
+                           f"lookup cache ({hits} hits, {misses} misses)")
+            
+            replica_stats = get_database().replica_stats
+            if get_database().replica and replica_stats['refreshes']:
+                st.caption(f"Reads served from an in-memory replica, last copied at {replica_stats['last_refresh_at']} "
+                           f"in {replica_stats['last_refresh_seconds'] * 1000:.0f} ms "
+                           f"({replica_stats['refreshes']} refresh(es) in this process)")
+            
+            read_model = open_read_model(database_path())
+            st.markdown("**Read Model Snapshots**")
+            st.dataframe(read_model.status(), use_container_width=True, hide_index=True,
+                         column_config={'bytes': st.column_config.NumberColumn("Size (bytes)", format="%d")})
+            st.caption(f"Memory-mapped Arrow snapshots in `{read_model.directory}`, rebuilt when their tables change "
+                       f"(this process: {read_model.stats['loads']} loads, {read_model.stats['builds']} builds)")
+            
+            archive_stats = shared_database_value('archive_stats', ('contracts', 'projects'),
+                                                  lambda db: db.get_archive_stats())
+            st.markdown("**Archive**")
+            st.dataframe(archive_stats, use_container_width=True, hide_index=True)
+            st.caption("Expired contracts and completed projects past their retention window are moved to "
+                       "archive tables by `archive_worker.py`; history queries read the `contracts_history` "
+                       "and `projects_history` views.")
+            
+            backups = open_backups(database_path())
+            st.markdown("**Backups**")
+            if st.button("💾 Back Up Now", key="backup_now", disabled=backups.state['running']):
+                try:
+                    manifest = backups.backup(label="manual")
+                    st.success(f"Backed up to `{manifest['file']}` in {manifest['duration_seconds']:.2f}s")
+                except Exception as e:
+                    st.error(f"Backup failed: {e}")
+            
+            snapshots = backups.snapshots()
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("State", "Running" if backups.state['running'] else "Idle")
+            col2.metric("Snapshots", len(snapshots))
+            col3.metric("Last Backup", snapshots[0]['created_at'] if snapshots else "Never")
+            col4.metric("Last Duration", f"{snapshots[0]['duration_seconds']:.2f}s" if snapshots else "-")
+            if backups.state['running']:
+                st.info(f"Backup in progress: {backups.state['copied_pages']} of "
+                        f"{backups.state['total_pages']} pages copied")
+            if snapshots:
+                st.dataframe(backups.status(), use_container_width=True, hide_index=True,
+                             column_config={'duration_seconds': st.column_config.NumberColumn("Duration (s)", format="%.2f"),
+                                            'bytes': st.column_config.NumberColumn("Size (bytes)", format="%d")})
+            st.caption(f"Online snapshots in `{backups.directory}`, copied a few pages at a time so writers are "
+                       f"not blocked, checksummed and kept to the newest {backups.keep}. Schedule with "
+                       "`python backup.py --interval 3600`; restore with `python backup.py --restore FILE`.")
+    
+    with tab4:
+        st.subheader("Delta Export")
+        st.markdown("Download only the database rows changed or deleted since a consumer last synced")
+        
+        db = get_database()
+        if db is None:
+            st.info(f"No database found at `{database_path()}`. Delta exports read the SQLite database "
+                    "used by the background workers (set `VENDOR_DB_PATH` to point elsewhere).")
+        else:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                consumer = st.text_input("Consumer", value="bi-nightly")
+            with col2:
+                delta_table = st.selectbox("Table", Database.TABLES, format_func=str.title)
+            with col3:
+                delta_format = st.selectbox("Format", available_formats(), key="delta_format")
+            
+            watermark = db.get_delta_watermark(consumer, delta_table)
+            since = watermark if db.delta_is_complete(watermark) else None
+            if watermark is None:
+                st.caption("Never synced: the first export contains the whole table.")
+            elif since is None:
+                st.warning(f"Last synced at {watermark} UTC, but the change log has since been compacted, "
+                           "so this export contains the whole table.")
+            else:
+                st.caption(f"Last synced at {watermark} UTC. Deleted rows are included as tombstones "
+                           "(`is_deleted` = 1).")
+            
+            if st.button("Prepare Export", key="prepare_delta"):
+                until = db.get_current_timestamp()
+                counts = {'changed': 0, 'deleted': 0}
+                data = export_table(count_delta_rows(db.iter_table_delta(delta_table, since, until), counts),
+                                    delta_format, {**db.get_column_types(delta_table), 'is_deleted': 'INTEGER'})
+                st.session_state.delta_export = {'key': (consumer, delta_table, delta_format),
+                                                 'until': until, 'data': data, **counts}
+            
+            prepared = st.session_state.get('delta_export')
+            if prepared and prepared['key'] == (consumer, delta_table, delta_format):
+                st.success(f"{prepared['changed']} changed and {prepared['deleted']} deleted rows "
+                           f"up to {prepared['until']} UTC")
+                extension, mime = EXPORT_FORMATS[delta_format]
+                st.download_button(
+                    label=f"⬇️ Download {delta_table.title()} Delta ({delta_format})",
+                    data=prepared['data'],
+                    file_name=f"{delta_table}_delta_{prepared['until'].replace(' ', '_').replace(':', '')}.{extension}",
+                    mime=mime,
+                    key="download_delta"
+                )
+                if st.button("✅ Mark as Synced", key="mark_delta_synced"):
+                    db.set_delta_watermark(consumer, delta_table, prepared['until'])
+                    del st.session_state.delta_export
+                    st.rerun()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,127 @@
+"""
+Scheduled archival of finished rows.
+
+Expired contracts and completed projects stay in the hot tables long
+after anyone works with them, and every default query has to filter them
+out. ArchiveWorker moves those older than a retention window into
+{table}_archive tables in the same database (Database.ARCHIVE_POLICIES
+says which rows are finished), in small batches with a pause in between
+so it never holds the write lock for long. History queries read both
+through the {table}_history views (Database.get_history). Each run then
+compacts the change log (Database.compact_change_log), which would
+otherwise only be trimmed when a process opens the database.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from database import Database
+
+
+# sync_state key holding the previous run's time
+LAST_RUN_KEY = 'archive_last_run'
+
+# Days a finished row stays in its hot table, per table
+DEFAULT_RETENTION_DAYS = {
+    'contracts': 365,
+    'projects': 180,
+}
+
+
+class ArchiveWorker:
+    """Moves finished rows past their retention window into archive tables."""
+    
+    def __init__(self, db: Database, retention_days: Optional[Dict[str, int]] = None,
+                 batch_size: int = 500, pause_seconds: float = 0.05):
+        """
+        Initialize the worker.
+        
+        Args:
+            db: Database holding the tables and their archives
+            retention_days: Table -> days to keep finished rows hot
+                (defaults to DEFAULT_RETENTION_DAYS)
+            batch_size: Rows moved per transaction
+            pause_seconds: Pause between batches, leaving the database to other writers
+        """
+        self.db = db
+        self.retention_days = {**DEFAULT_RETENTION_DAYS, **(retention_days or {})}
+        self.batch_size = batch_size
+        self.pause_seconds = pause_seconds
+        self.last_result = None
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def run_once(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Archive every finished row past its table's retention window,
+        then compact the change log.
+        
+        Args:
+            now: Time of the run (defaults to now)
+        
+        Returns:
+            Table -> number of rows archived, plus 'change_log_compacted':
+            number of change log entries removed
+        """
+        now = now or datetime.now()
+        result = {}
+        for table in Database.ARCHIVE_POLICIES:
+            cutoff = (now - timedelta(days=self.retention_days[table])).strftime("%Y-%m-%d")
+            result[table] = self.db.archive_rows(table, cutoff, self.batch_size, self.pause_seconds)
+        result['change_log_compacted'] = self.db.compact_change_log()
+        self.db.set_sync_state(LAST_RUN_KEY, now.strftime("%Y-%m-%d %H:%M:%S"))
+        return result
+    
+    def start(self, interval_seconds: float = 86400):
+        """Run run_once every interval_seconds on a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        
+        def run():
+            while not self._stop_event.is_set():
+                try:
+                    self.last_result = self.run_once()
+                except Exception as e:
+                    print(f"Archive error: {e}")
+                self._stop_event.wait(interval_seconds)
+        
+        self._thread = threading.Thread(target=run, name='archiver', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background archive thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Archive expired contracts and completed projects.")
+    parser.add_argument("--db", default="vendor_management.db", help="SQLite database path")
+    for table, days in DEFAULT_RETENTION_DAYS.items():
+        parser.add_argument(f"--{table}-days", type=int, default=days,
+                            help=f"Days finished {table} stay in the hot table")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows moved per transaction")
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds between batches")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Seconds between runs (0 runs once and exits)")
+    args = parser.parse_args()
+    
+    worker = ArchiveWorker(Database(args.db),
+                           {table: getattr(args, f"{table}_days") for table in DEFAULT_RETENTION_DAYS},
+                           args.batch_size, args.pause)
+    if args.interval > 0:
+        worker.start(args.interval)
+        try:
+            worker._thread.join()
+        except KeyboardInterrupt:
+            worker.stop()
+    else:
+        print(f"Archived: {worker.run_once()}")
+        print(worker.db.get_archive_stats().to_string(index=False))
@@ -0,0 +1,275 @@
+"""
+Online backups of the SQLite database.
+
+Copying vendor_management.db while the app or the workers write to it can
+produce a torn copy. BackupManager uses the sqlite3 online backup API
+instead: it copies the database a few pages at a time, releasing its
+read lock and pausing between steps so writers are never blocked for
+long (SQLite restarts the copy if a write lands mid-backup). Each snapshot
+is checked with PRAGMA quick_check and saved with a manifest holding its
+SHA-256 checksum, size, change sequence and how long it took. Only the
+newest `keep` snapshots are retained.
+
+restore() refuses a snapshot whose checksum no longer matches, keeps a
+snapshot of the current database first, and then copies the snapshot over
+the live database in one step. Table versions are then moved past their
+pre-restore values, so caches keyed on them (shared_cache, read_model)
+never mistake restored data for data they have already seen.
+
+Run on a schedule with BackupManager.start or python backup.py --interval.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import pandas as pd
+
+from database import Database
+
+
+DEFAULT_BACKUP_DIR = "backups"
+
+
+def file_checksum(path: str) -> str:
+    """SHA-256 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BackupManager:
+    """Point-in-time snapshots of a database, taken online."""
+    
+    def __init__(self, db: Database, directory: str = DEFAULT_BACKUP_DIR, keep: int = 14,
+                 pages: int = 256, step_pause: float = 0.005):
+        """
+        Initialize the manager.
+        
+        Args:
+            db: Database to back up and restore
+            directory: Folder holding the snapshots and their manifests
+            keep: Number of snapshots retained
+            pages: Pages copied per backup step
+            step_pause: Seconds between steps, during which writers can commit
+        """
+        self.db = db
+        self.directory = directory
+        self.keep = keep
+        self.pages = pages
+        self.step_pause = step_pause
+        self.state = {'running': False, 'copied_pages': 0, 'total_pages': 0, 'error': None}
+        self._backup_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+    
+    @property
+    def _stem(self) -> str:
+        return os.path.splitext(os.path.basename(self.db.db_path))[0]
+    
+    def _progress(self, status: int, remaining: int, total: int):
+        self.state['copied_pages'] = total - remaining
+        self.state['total_pages'] = total
+    
+    def backup(self, label: str = "scheduled", prune: bool = True) -> Dict:
+        """
+        Take a snapshot of the database without stopping writers.
+        
+        Args:
+            label: Short tag stored in the file name and manifest (e.g. 'manual')
+            prune: Delete snapshots beyond keep afterwards
+        
+        Returns:
+            The snapshot's manifest
+        """
+        with self._backup_lock:
+            self.state.update(running=True, copied_pages=0, total_pages=0, error=None)
+            started = datetime.now()
+            start = time.perf_counter()
+            name = f"{self._stem}-{started:%Y%m%d-%H%M%S-%f}-{label}.db"
+            path = os.path.join(self.directory, name)
+            try:
+                source = sqlite3.connect(self.db.db_path)
+                target = sqlite3.connect(f"{path}.tmp")
+                try:
+                    source.backup(target, pages=self.pages, progress=self._progress, sleep=self.step_pause)
+                    check = target.execute("PRAGMA quick_check").fetchone()[0]
+                    change_sequence = target.execute("SELECT IFNULL(MAX(seq), 0) FROM change_log").fetchone()[0]
+                finally:
+                    target.close()
+                    source.close()
+                if check != 'ok':
+                    raise RuntimeError(f"Snapshot failed its integrity check: {check}")
+                os.replace(f"{path}.tmp", path)
+                
+                manifest = {
+                    'file': name,
+                    'label': label,
+                    'created_at': started.strftime("%Y-%m-%d %H:%M:%S"),
+                    'duration_seconds': time.perf_counter() - start,
+                    'bytes': os.path.getsize(path),
+                    'pages': self.state['total_pages'],
+                    'change_sequence': change_sequence,
+                    'sha256': file_checksum(path),
+                }
+                with open(f"{path}.json", 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, indent=2)
+            except Exception as e:
+                self.state['error'] = str(e)
+                if os.path.exists(f"{path}.tmp"):
+                    os.remove(f"{path}.tmp")
+                raise
+            finally:
+                self.state['running'] = False
+            
+            if prune:
+                self.prune()
+            return manifest
+    
+    def snapshots(self) -> List[Dict]:
+        """Manifests of the retained snapshots, newest first."""
+        manifests = []
+        for manifest_path in glob.glob(os.path.join(self.directory, f"{glob.escape(self._stem)}-*.db.json")):
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    manifests.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(manifests, key=lambda manifest: manifest['file'], reverse=True)
+    
+    def status(self) -> pd.DataFrame:
+        """Retained snapshots as a table, newest first."""
+        columns = ['file', 'label', 'created_at', 'duration_seconds', 'bytes', 'change_sequence']
+        return pd.DataFrame(self.snapshots(), columns=columns + ['sha256'])[columns]
+    
+    def prune(self) -> List[str]:
+        """Delete all but the newest keep snapshots; returns the files removed."""
+        removed = []
+        for manifest in self.snapshots()[self.keep:]:
+            path = os.path.join(self.directory, manifest['file'])
+            for stale in (path, f"{path}.json"):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+            removed.append(manifest['file'])
+        return removed
+    
+    def verify(self, file: str) -> bool:
+        """Whether a snapshot's checksum still matches its manifest."""
+        path = os.path.join(self.directory, file)
+        try:
+            with open(f"{path}.json", 'r', encoding='utf-8') as f:
+                expected = json.load(f)['sha256']
+            return file_checksum(path) == expected
+        except (OSError, ValueError, KeyError):
+            return False
+    
+    def restore(self, file: str, keep_current: bool = True) -> Dict:
+        """
+        Replace the database's contents with a snapshot.
+        
+        Args:
+            file: Snapshot file name, as listed by snapshots()
+            keep_current: Snapshot the current database first (label 'pre-restore')
+        
+        Returns:
+            The restored snapshot's manifest
+        
+        Raises:
+            ValueError: If the snapshot is missing or its checksum does not match
+        """
+        if not self.verify(file):
+            raise ValueError(f"Snapshot {file} is missing or does not match its checksum")
+        if keep_current:
+            # Pruned after the restore, so the snapshot being restored is not removed first
+            self.backup(label="pre-restore", prune=False)
+        
+        versions = self.db.get_table_versions()
+        with self._backup_lock:
+            source = sqlite3.connect(os.path.join(self.directory, file))
+            target = sqlite3.connect(self.db.db_path)
+            try:
+                # One step, so other connections see either the old or the restored database
+                source.backup(target)
+                with target:
+                    for table, version in versions.items():
+                        target.execute("UPDATE change_log_versions SET version = MAX(version, ?) + 1 "
+                                       "WHERE table_name = ?", (version, table))
+            finally:
+                target.close()
+                source.close()
+        self.db.clear_lookup_cache()
+        
+        with open(os.path.join(self.directory, f"{file}.json"), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        self.prune()
+        return manifest
+    
+    def start(self, interval_seconds: float = 3600):
+        """Run backup every interval_seconds on a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        
+        def run():
+            while not self._stop_event.is_set():
+                try:
+                    self.backup()
+                except Exception as e:
+                    print(f"Backup error: {e}")
+                self._stop_event.wait(interval_seconds)
+        
+        self._thread = threading.Thread(target=run, name='backups', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background backup thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Back up or restore the vendor management database.")
+    parser.add_argument("--db", default="vendor_management.db", help="SQLite database path")
+    parser.add_argument("--dir", default=os.environ.get('BACKUP_DIR', DEFAULT_BACKUP_DIR), help="Snapshot folder")
+    parser.add_argument("--keep", type=int, default=14, help="Snapshots retained")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Seconds between snapshots (0 takes one and exits)")
+    parser.add_argument("--restore", metavar="FILE", help="Restore this snapshot instead of backing up")
+    parser.add_argument("--verify", action="store_true", help="Check every snapshot's checksum and exit")
+    args = parser.parse_args()
+    
+    manager = BackupManager(Database(args.db), args.dir, args.keep)
+    if args.verify:
+        results = {manifest['file']: manager.verify(manifest['file']) for manifest in manager.snapshots()}
+        for file, ok in results.items():
+            print(f"{'ok      ' if ok else 'MISMATCH'} {file}")
+        raise SystemExit(0 if all(results.values()) else 1)
+    if args.restore:
+        manifest = manager.restore(args.restore)
+        print(f"Restored {manifest['file']} (taken {manifest['created_at']})")
+    elif args.interval > 0:
+        manager.start(args.interval)
+        try:
+            manager._thread.join()
+        except KeyboardInterrupt:
+            manager.stop()
+    else:
+        manifest = manager.backup(label="manual")
+        print(f"Backed up to {manifest['file']} in {manifest['duration_seconds']:.2f}s")
+        print(manager.status().to_string(index=False))
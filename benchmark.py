@@ -0,0 +1,851 @@
+"""
+Benchmark suite for the vendor management dashboard.
+
+Times every page in app.py's navigation (rendered headlessly with
+Streamlit's AppTest) and every Database method against synthetic data
+from synthetic_data.py, measures the memory of plain versus schema-typed
+frames, compares reads from the database file and its in-memory replica,
+checks and times table exports, times KPI snapshot queries, read model
+loads and rollups on each analytics engine and from the spend cube,
+load-tests the shared cache from several processes at once, measures
+rerun latency with several sessions open (load_test.py), and checks
+Drive sync and concurrent folder creation against a local stand-in for
+the Drive API (fake_drive.py), comparing the sync and async Drive
+clients there. Results are written as JSON; when a baseline file is
+given, any benchmark slower than the baseline by more than the tolerance
+is reported and the run exits with status 1.
+
+Usage:
+    python benchmark.py --scale 10k --output baseline.json
+    python benchmark.py --scale 10k --baseline baseline.json --tolerance 0.25
+"""
+
+import argparse
+import asyncio
+import contextlib
+import inspect
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from analytics import available_engines, group_aggregate, time_rollup
+from database import Database
+from dimensions import VendorDimension
+from drive_sync import DriveSyncEngine
+from exports import available_formats, export_table
+from fake_drive import FakeDriveServer, drive_manager
+from google_drive import AsyncDriveClient, get_folder_template
+from kpi_store import KPI_METRICS, KPIStore
+from load_test import shared_cache_worker
+from read_model import VIEWS, ReadModel
+from schema import apply_schema
+from spend_cube import DIMENSIONS, UNKNOWN_MONTH, UNKNOWN_STATUS, UNKNOWN_TYPE, SpendCube
+from synthetic_data import SCALES, generate_dataset, load_into_database
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# Database methods that are setup rather than operations worth timing
+DATABASE_SKIP = {'get_connection', 'init_database'}
+
+# Reader threads and reads per thread in the replica benchmark
+REPLICA_SESSIONS = 8
+REPLICA_READS = 25
+
+# Rows changed by the bulk update benchmarks
+BULK_UPDATE_ROWS = 1000
+
+# Timings closer than this (seconds) are never reported as regressions
+NOISE_FLOOR = 0.005
+
+# Shared cache load test: worker processes and requests per worker
+LOAD_TEST_PROCESSES = 4
+LOAD_TEST_REQUESTS = 20
+
+# Sessions open at once in the session load test
+SESSION_LOAD_SESSIONS = 4
+
+# Vendor and project rows with Drive folders in the Drive sync check
+DRIVE_SYNC_ROWS = 40
+
+# Session threads and folder trees in the Drive concurrency check, and the
+# simulated round trip the fake Drive server adds to each request
+DRIVE_THREADS = 16
+DRIVE_TREES = 64
+DRIVE_LATENCY = 0.01
+
+# Folder trees created per run when comparing sync and async Drive clients
+DRIVE_ASYNC_TREES = 16
+
+
+def time_call(func: Callable, repeat: int, setup: Optional[Callable] = None) -> Dict:
+    """
+    Time func over several runs.
+    
+    Args:
+        func: Callable to time; receives setup()'s return value if setup is given
+        repeat: Number of timed runs
+        setup: Untimed callable run before each timed run (optional)
+    
+    Returns:
+        Dictionary with median, min and max seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            args = setup()
+            start = time.perf_counter()
+            func(args)
+        else:
+            start = time.perf_counter()
+            func()
+        timings.append(time.perf_counter() - start)
+    return {'median': statistics.median(timings), 'min': min(timings), 'max': max(timings)}
+
+
+def bench_pages(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """Time a rerun of every page with the dataset loaded into session state."""
+    from streamlit.testing.v1 import AppTest
+    
+    # Keep benchmark KPI snapshots out of the real history
+    os.environ.setdefault('KPI_HISTORY_DB', os.path.join(tempfile.mkdtemp(), 'kpi_history.db'))
+    
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    for table, df in dataset.items():
+        at.session_state[table] = df
+    at.run()
+    
+    results = {}
+    for page in at.sidebar.radio[0].options:
+        at.sidebar.radio[0].set_value(page).run()
+        if at.exception:
+            raise RuntimeError(f"{page} raised: {at.exception[0].message}")
+        results[f"page:{page}"] = time_call(at.run, repeat)
+    return results
+
+
+def _database_cases(db: Database) -> Dict[str, Dict]:
+    """Benchmark cases for every public Database method, keyed by method name."""
+    vendor_id = contract_id = project_id = 1
+    
+    def new_vendor():
+        return db.add_vendor(name="Benchmark Vendor", status="Active")
+    
+    def new_contract():
+        return db.add_contract(vendor_id=vendor_id, contract_name="Benchmark Contract")
+    
+    def new_project():
+        return db.add_project(project_name="Benchmark Project", vendor_id=vendor_id)
+    
+    def new_expired_contract():
+        return db.add_contract(vendor_id=vendor_id, contract_name="Benchmark Contract",
+                               end_date="2000-01-01", status="Expired")
+    
+    # Bulk status changes, alternating so every run changes the rows
+    bulk_statuses = itertools.cycle(["Pending Renewal", "Active"])
+    
+    def bulk_update():
+        status = next(bulk_statuses)
+        db.update_many('contracts', [(row_id, {'status': status}) for row_id in range(1, BULK_UPDATE_ROWS + 1)])
+    
+    def looped_update():
+        status = next(bulk_statuses)
+        for row_id in range(1, BULK_UPDATE_ROWS + 1):
+            db.update_contract(row_id, status=status)
+    
+    return {
+        'add_vendor': {'func': new_vendor},
+        'get_vendors': {'func': lambda: db.get_vendors()},
+        'get_vendor_by_id': {'func': lambda: db.get_vendor_by_id(vendor_id)},
+        'update_vendor': {'func': lambda: db.update_vendor(vendor_id, status="Active")},
+        'delete_vendor': {'setup': new_vendor, 'func': db.delete_vendor},
+        'add_contract': {'func': new_contract},
+        'get_contracts': {'func': lambda: db.get_contracts()},
+        'get_contract_by_id': {'func': lambda: db.get_contract_by_id(contract_id)},
+        'get_contract_by_id:uncached': {'setup': lambda: db._invalidate_lookups('contracts'),
+                                        'func': lambda _: db.get_contract_by_id(contract_id)},
+        'get_many_by_ids': {'setup': lambda: db._invalidate_lookups('contracts'),
+                            'func': lambda _: db.get_many_by_ids('contracts', range(1, 101))},
+        'get_many_by_ids:one_at_a_time': {'setup': lambda: db._invalidate_lookups('contracts'),
+                                          'func': lambda _: [db.get_contract_by_id(row_id) for row_id in range(1, 101)]},
+        'get_lookup_cache_stats': {'func': db.get_lookup_cache_stats},
+        'clear_lookup_cache': {'func': db.clear_lookup_cache},
+        'update_contract': {'func': lambda: db.update_contract(contract_id, status="Active")},
+        'delete_contract': {'setup': new_contract, 'func': db.delete_contract},
+        'add_project': {'func': new_project},
+        'get_projects': {'func': lambda: db.get_projects()},
+        'get_project_by_id': {'func': lambda: db.get_project_by_id(project_id)},
+        'update_project': {'func': lambda: db.update_project(project_id, status="Green")},
+        'delete_project': {'setup': new_project, 'func': db.delete_project},
+        'update_many': {'func': bulk_update},
+        'update_many:one_at_a_time': {'func': looped_update},
+        'get_sync_state': {'func': lambda: db.get_sync_state('benchmark')},
+        'set_sync_state': {'func': lambda: db.set_sync_state('benchmark', 'value')},
+        'apply_drive_folder_changes': {'func': lambda: db.apply_drive_folder_changes([('missing', None, None)])},
+        'get_contracts_for_alerts': {'func': lambda: db.get_contracts_for_alerts(
+            '2024-01-01', '2024-01-31', '2024-01-01 00:00:00', 2 ** 62)},
+        'record_contract_alerts': {'func': lambda: db.record_contract_alerts(
+            [(contract_id, 'benchmark', '2024-01-01', 'Benchmark alert')])},
+        'get_pending_alerts': {'func': db.get_pending_alerts},
+        'mark_alerts_notified': {'func': lambda: db.mark_alerts_notified([1])},
+        'get_alert_feed': {'func': db.get_alert_feed},
+        'get_change_sequence': {'func': db.get_change_sequence},
+        'get_table_versions': {'func': db.get_table_versions},
+        'get_changes_since': {'func': lambda: db.get_changes_since(db.get_change_sequence() - 1000)},
+        'get_change_log_floor': {'func': db.get_change_log_floor},
+        'compact_change_log': {'func': db.compact_change_log},
+        'archive_rows': {'setup': new_expired_contract, 'func': lambda _: db.archive_rows('contracts', '2001-01-01')},
+        'get_history': {'func': lambda: db.get_history('contracts')},
+        'get_archive_stats': {'func': db.get_archive_stats},
+        'get_read_connection': {'func': lambda: db.get_read_connection().close()},
+        'iter_table': {'func': lambda: sum(len(chunk) for chunk in db.iter_table('contracts'))},
+        'get_column_types': {'func': lambda: db.get_column_types('contracts')},
+        'get_current_timestamp': {'func': db.get_current_timestamp},
+        'iter_table_delta': {'func': lambda: sum(len(chunk) for chunk in db.iter_table_delta(
+            'contracts', '2024-01-01 00:00:00', db.get_current_timestamp()))},
+        'delta_is_complete': {'func': lambda: db.delta_is_complete('2024-01-01 00:00:00')},
+        'get_delta_watermark': {'func': lambda: db.get_delta_watermark('benchmark', 'contracts')},
+        'set_delta_watermark': {'func': lambda: db.set_delta_watermark('benchmark', 'contracts', '2024-01-01 00:00:00')},
+        'get_dashboard_stats': {'func': db.get_dashboard_stats},
+        'get_vendor_status_distribution': {'func': db.get_vendor_status_distribution},
+        'get_contract_status_distribution': {'func': db.get_contract_status_distribution},
+        'get_project_status_distribution': {'func': db.get_project_status_distribution},
+        'initialize_sample_data': {'func': db.initialize_sample_data},
+    }
+
+
+def bench_database(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """Time every public Database method against a database loaded with the dataset."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'benchmark.db'))
+        load_into_database(db, dataset)
+        cases = _database_cases(db)
+        
+        methods = {name for name, _ in inspect.getmembers(Database, inspect.isfunction)
+                   if not name.startswith('_')} - DATABASE_SKIP
+        missing = sorted(methods - set(cases))
+        if missing:
+            print(f"Warning: no benchmark for Database methods: {', '.join(missing)}")
+        
+        return {f"db:{name}": time_call(case['func'], repeat, case.get('setup'))
+                for name, case in cases.items()}
+
+
+def bench_memory(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """Compare memory, filter and join speed of plain and schema-typed frames."""
+    typed = apply_schema(dataset)
+    results = {}
+    
+    for table in dataset:
+        results[f"memory:{table}:plain"] = {'bytes': int(dataset[table].memory_usage(deep=True).sum())}
+        results[f"memory:{table}:typed"] = {'bytes': int(typed[table].memory_usage(deep=True).sum())}
+    
+    for label, frames in (('plain', dataset), ('typed', typed)):
+        tickets = frames['tickets']
+        results[f"filter:tickets_open:{label}"] = time_call(
+            lambda: tickets[tickets['status'].isin(['Open', 'In Progress'])], repeat)
+        results[f"filter:tickets_high:{label}"] = time_call(
+            lambda: tickets[tickets['priority'] == 'High'], repeat)
+    
+    vendor_names = typed['vendors'][['vendor_id', 'vendor_name']]
+    vendor_dim = VendorDimension(typed['vendors'])
+    results["join:tickets_vendor_name:merge"] = time_call(
+        lambda: typed['tickets'].merge(vendor_names, on='vendor_id', how='left'), repeat)
+    results["join:tickets_vendor_name:dimension"] = time_call(
+        lambda: vendor_dim.join_names(typed['tickets']), repeat)
+    
+    return results
+
+
+def bench_kpi(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """Time KPI snapshot queries over a year of hourly history."""
+    start = datetime(2024, 1, 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = KPIStore(os.path.join(tmp, 'kpi_history.db'))
+        conn = store.get_connection()
+        conn.executemany("INSERT INTO kpi_snapshots (metric, ts, value) VALUES (?, ?, ?)",
+                         ((metric, store.bucket(start + timedelta(hours=hour)), float(hour))
+                          for hour in range(24 * 365) for metric in KPI_METRICS))
+        conn.commit()
+        conn.close()
+        
+        end = start + timedelta(days=365)
+        return {
+            'kpi:range_30d': time_call(lambda: store.query(start=end - timedelta(days=30), end=end), repeat),
+            'kpi:daily_year': time_call(lambda: store.query(end=end, freq='day'), repeat),
+            'kpi:monthly_mean': time_call(lambda: store.query(end=end, freq='month', agg='mean'), repeat),
+            'kpi:value_at': time_call(lambda: store.value_at(when=end - timedelta(days=7)), repeat),
+        }
+
+
+def bench_analytics(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """Time the dashboard's rollups on every available analytics engine."""
+    typed = apply_schema(dataset)
+    contracts = typed['contracts'].assign(
+        vendor_type=VendorDimension(typed['vendors']).types_for(typed['contracts']['vendor_id']))
+    cases = {
+        'budget_by_status': lambda engine: group_aggregate(
+            typed['projects'], 'status', {'budget': ('budget', 'sum')}, engine=engine),
+        'tickets_by_type': lambda engine: group_aggregate(
+            typed['tickets'], 'ticket_type', {'count': ('ticket_id', 'size')},
+            where={'status': ['Open', 'In Progress']}, engine=engine),
+        'spend_by_vendor_type': lambda engine: group_aggregate(
+            contracts, ['vendor_type', 'status'], {'spend': ('contract_value', 'sum')}, engine=engine),
+        'monthly_spend_running': lambda engine: time_rollup(
+            contracts, 'start_date', {'spend': ('contract_value', 'sum')}, by='vendor_type',
+            cumulative=True, engine=engine),
+    }
+    results = {f"analytics:{name}:{engine}": time_call(lambda: case(engine), repeat)
+               for name, case in cases.items() for engine in available_engines()}
+    
+    # The same rollup over a Parquet snapshot instead of a frame in memory
+    if 'arrow' in available_engines():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'tickets.parquet')
+            typed['tickets'].to_parquet(path)
+            for engine in available_engines():
+                results[f"analytics:tickets_by_type_parquet:{engine}"] = time_call(
+                    lambda: group_aggregate(path, 'ticket_type', {'count': ('ticket_id', 'size')},
+                                            where={'status': ['Open', 'In Progress']}, engine=engine), repeat)
+    return results
+
+
+def _concurrent_reads(db: Database, write_interval: Optional[float] = None) -> Dict:
+    """
+    Latency of the Data Management page's database reads from REPLICA_SESSIONS
+    threads at once, optionally with another thread writing every write_interval seconds.
+    """
+    latencies = []
+    lock = threading.Lock()
+    done = threading.Event()
+    
+    def session(offset: int):
+        timings = []
+        for i in range(REPLICA_READS):
+            start = time.perf_counter()
+            db.get_dashboard_stats()
+            db.get_alert_feed()
+            db.get_archive_stats()
+            db.get_contract_by_id(offset * REPLICA_READS + i + 1)
+            timings.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(timings)
+    
+    def writer():
+        notes = itertools.count()
+        while not done.wait(write_interval):
+            db.update_vendor(1, notes=f"benchmark {next(notes)}")
+    
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(REPLICA_SESSIONS)]
+    if write_interval:
+        threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    for thread in threads[:REPLICA_SESSIONS]:
+        thread.join()
+    done.set()
+    threads[-1].join()
+    return {'median': statistics.median(latencies), 'min': min(latencies), 'max': max(latencies)}
+
+
+def bench_replica(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """Compare read latency from the database file and the in-memory replica under concurrent sessions."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'benchmark.db')
+        load_into_database(Database(db_path), dataset)
+        for mode, replica in (('disk', False), ('replica', True)):
+            db = Database(db_path, lookup_cache_size=0, replica=replica)
+            db.get_table_versions()  # copies the database into memory in replica mode
+            results[f"replica:reads:{mode}"] = _concurrent_reads(db)
+            results[f"replica:reads_with_writes:{mode}"] = _concurrent_reads(db, write_interval=0.05)
+        results['replica:refresh'] = time_call(lambda: db._refresh_replica(db._replica_version), repeat)
+    return results
+
+
+def _check_spend_cube(contracts: pd.DataFrame, vendor_dim: VendorDimension):
+    """Raise if the spend cube disagrees with grouping the frame, including rows missing a date, status or vendor."""
+    contracts = contracts.copy()
+    for offset, column in enumerate(('start_date', 'status', 'vendor_id')):
+        contracts.loc[contracts.index[offset::7], column] = None
+    
+    expected = contracts.assign(
+        vendor_type=pd.Series(vendor_dim.types_for(contracts['vendor_id']), index=contracts.index)
+        .astype(object).fillna(UNKNOWN_TYPE),
+        month=contracts['start_date'].dt.strftime('%Y-%m').astype(object).fillna(UNKNOWN_MONTH),
+        status=contracts['status'].astype(object).fillna(UNKNOWN_STATUS),
+    ).groupby(list(DIMENSIONS))['contract_value'].agg(value='sum', count='size').reset_index()
+    rolled = SpendCube(contracts, 'contract_value', 'contract_id', vendor_dim).rollup(DIMENSIONS)
+    
+    merged = expected.merge(rolled, on=list(DIMENSIONS), how='outer', suffixes=('', '_cube'))
+    if (len(merged) != len(expected) or not np.allclose(merged['value'], merged['value_cube'])
+            or not (merged['count'] == merged['count_cube']).all()):
+        raise RuntimeError("Spend cube rollup does not match grouping the contracts")
+
+
+def bench_spend_cube(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """Time spend cube builds, queries and status updates against grouping the frame."""
+    typed = apply_schema(dataset)
+    contracts = typed['contracts']
+    vendor_dim = VendorDimension(typed['vendors'])
+    _check_spend_cube(contracts, vendor_dim)
+    cube = SpendCube(contracts, 'contract_value', 'contract_id', vendor_dim)
+    where = {'status': ['Active', 'Pending Renewal']}
+    
+    def group_frame():
+        frame = contracts[contracts['status'].isin(where['status'])]
+        frame = frame.assign(vendor_type=vendor_dim.types_for(frame['vendor_id']),
+                             month=frame['start_date'].dt.strftime('%Y-%m'))
+        return frame.groupby(['vendor_type', 'month'], observed=True)['contract_value'].agg(['sum', 'size'])
+    
+    contract_ids = contracts['contract_id'].tolist()
+    statuses = ['Active', 'Expired']
+    updates = itertools.count()
+    
+    def update_status():
+        n = next(updates)
+        cube.update(contract_ids[n % len(contract_ids)], status=statuses[n % 2])
+    
+    return {
+        'spend_cube:build': time_call(
+            lambda: SpendCube(contracts, 'contract_value', 'contract_id', vendor_dim), repeat),
+        'spend_cube:type_by_month': time_call(lambda: cube.rollup(['vendor_type', 'month'], where), repeat),
+        'spend_cube:type_by_month_groupby': time_call(group_frame, repeat),
+        'spend_cube:drill_down': time_call(lambda: cube.drill_down(where), repeat),
+        'spend_cube:update_status': time_call(update_status, repeat),
+    }
+
+
+def _read_export(data: bytes, export_format: str) -> pd.DataFrame:
+    """Read a Parquet or Arrow IPC export back into a DataFrame."""
+    if export_format == 'Parquet':
+        return pd.read_parquet(io.BytesIO(data))
+    import pyarrow as pa
+    return pa.ipc.open_file(pa.BufferReader(data)).read_all().to_pandas()
+
+
+def _check_exports(tmp: str):
+    """
+    Raise unless multi-chunk Parquet and Arrow exports of a database table
+    read back intact (CSV carries no schema, so it is not affected).
+    
+    The first two-row chunk has vendor_id set and completion_date empty;
+    later chunks have vendor_id empty and one completion_date, so a schema
+    inferred from the first chunk alone cannot hold them.
+    """
+    db = Database(os.path.join(tmp, 'exports_check.db'))
+    vendor_id = db.add_vendor("Export Check Vendor")
+    for n in range(6):
+        db.add_project(f"Export Check {n}", vendor_id=vendor_id if n < 2 else None)
+    db.update_project(6, completion_date="2024-06-30")
+    
+    conn = db.get_connection()
+    expected = pd.read_sql_query("SELECT * FROM projects ORDER BY id", conn)
+    conn.close()
+    column_types = db.get_column_types('projects')
+    delta_types = {**column_types, 'is_deleted': 'INTEGER'}
+    
+    for export_format in available_formats():
+        if export_format == 'CSV (gzip)':
+            continue
+        exports = {
+            'table': export_table(db.iter_table('projects', chunksize=2), export_format, column_types),
+            'delta': export_table(db.iter_table_delta('projects', None, '9999-12-31', chunksize=2),
+                                  export_format, delta_types),
+        }
+        for name, data in exports.items():
+            actual = _read_export(data, export_format)[expected.columns]
+            try:
+                pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+            except AssertionError as error:
+                raise RuntimeError(f"{export_format} {name} export does not match the projects table: {error}")
+
+
+def bench_exports(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """Check multi-chunk exports, then time exporting each database table in each format."""
+    with tempfile.TemporaryDirectory() as tmp:
+        _check_exports(tmp)
+        
+        db = Database(os.path.join(tmp, 'benchmark.db'))
+        load_into_database(db, dataset)
+        results = {}
+        for table in Database.TABLES:
+            column_types = db.get_column_types(table)
+            for export_format in available_formats():
+                results[f"exports:{table}:{export_format}"] = time_call(
+                    lambda: export_table(db.iter_table(table), export_format, column_types), repeat)
+        return results
+
+
+def bench_read_model(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """
+    Compare loading views from SQLite with loading their read model snapshots.
+    
+    cold maps the snapshot in a fresh ReadModel (as a new process would);
+    warm reuses the mapping (as later sessions in the same process do).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, 'benchmark.db'))
+        load_into_database(db, dataset)
+        directory = os.path.join(tmp, 'read_model')
+        
+        results = {'read_model:refresh': time_call(
+            lambda _: ReadModel(db, directory).refresh(), repeat,
+            lambda: shutil.rmtree(directory, ignore_errors=True))}
+        warm = ReadModel(db, directory)
+        for name in VIEWS:
+            results[f"read_model:{name}:sqlite"] = time_call(lambda: VIEWS[name][1](db), repeat)
+            results[f"read_model:{name}:cold"] = time_call(lambda: ReadModel(db, directory).load(name), repeat)
+            results[f"read_model:{name}:warm"] = time_call(lambda: warm.load(name), repeat)
+        return results
+
+
+def _load_test(pool, db_path: str, cache_dir: Optional[str]) -> Dict:
+    """Run every worker at once; per-request latency, throughput and total builds."""
+    start = time.perf_counter()
+    runs = pool.map(shared_cache_worker, [(db_path, cache_dir, LOAD_TEST_REQUESTS)] * LOAD_TEST_PROCESSES)
+    elapsed = time.perf_counter() - start
+    timings = [timing for run in runs for timing in run['timings']]
+    return {
+        'median': statistics.median(timings),
+        'min': min(timings),
+        'max': max(timings),
+        'requests_per_second': len(timings) / elapsed,
+        'builds': sum(run['builds'] for run in runs),
+    }
+
+
+def bench_shared_cache(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """
+    Load-test derived database reads from several processes.
+    
+    Compares every process querying the database itself with all of them
+    sharing one cache, then changes a contract and checks that the stale
+    entries are rebuilt once in total rather than once per process.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'benchmark.db')
+        db = Database(db_path)
+        load_into_database(db, dataset)
+        cache_dir = os.path.join(tmp, 'shared_cache')
+        
+        # Fresh interpreters, like separate app processes
+        with multiprocessing.get_context('spawn').Pool(LOAD_TEST_PROCESSES) as pool:
+            # Start every worker before timing anything
+            pool.map(time.sleep, [0.1] * LOAD_TEST_PROCESSES)
+            results = {
+                'shared_cache:uncached': _load_test(pool, db_path, None),
+                'shared_cache:shared': _load_test(pool, db_path, cache_dir),
+            }
+            db.update_contract(1, status="Active" if db.get_contract_by_id(1)['status'] != "Active" else "Expired")
+            results['shared_cache:after_update'] = _load_test(pool, db_path, cache_dir)
+    
+    for name, result in results.items():
+        print(f"  {name}: {result['requests_per_second']:.0f} requests/s, {result['builds']} builds")
+    return results
+
+
+def bench_sessions(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """
+    Rerun latency and memory with several sessions open in one process.
+    
+    Runs load_test.py's page walk for SESSION_LOAD_SESSIONS sessions at once
+    without think time, so every rerun queues behind the others.
+    """
+    from load_test import run_load_test
+    
+    os.environ.setdefault('KPI_HISTORY_DB', os.path.join(tempfile.mkdtemp(), 'kpi_history.db'))
+    summary = run_load_test(SESSION_LOAD_SESSIONS, think_time=0, timeout=timeout, dataset=dataset)
+    if summary['errors']:
+        raise RuntimeError(f"Session load test raised: {summary['error_samples'][0]}")
+    
+    # Latency includes waiting for the other sessions' reruns; run time does not
+    results = {}
+    for name in ('latency', 'run'):
+        stats = summary[name]
+        results[f"sessions:{name}"] = {'median': stats['p50'], 'min': stats['min'], 'max': stats['max'],
+                                       'p95': stats['p95']}
+    if summary['memory']['rss_per_session'] is not None:
+        results['sessions:memory'] = {'bytes': summary['memory']['rss_per_session']}
+    return results
+
+
+@contextlib.contextmanager
+def _fake_drive(latency: float = 0.0):
+    """Run a FakeDriveServer for the duration of the block."""
+    server = FakeDriveServer(latency=latency)
+    server.start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+def bench_drive_sync(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """
+    Check DriveSyncEngine against the fake Drive server, then time sync runs.
+    
+    Creates folders for DRIVE_SYNC_ROWS vendors and projects and records them
+    on database rows as the app does, then renames, trashes and deletes some
+    of them in Drive. Raises unless one sync run brings every row in line
+    and a second run finds nothing left to do.
+    """
+    with tempfile.TemporaryDirectory() as tmp, _fake_drive() as server:
+        db = Database(os.path.join(tmp, 'benchmark.db'))
+        manager = drive_manager(server)
+        engine = DriveSyncEngine(db, manager, page_size=25)
+        engine.sync_once()  # stores the start page token
+        
+        rows = []
+        for n in range(DRIVE_SYNC_ROWS):
+            table, name = ('vendors', f"Sync Vendor {n}") if n % 2 else ('projects', f"Sync Project {n}")
+            folder = manager.create_folder(name)
+            fields = {'drive_folder_id': folder['folder_id'], 'drive_folder_link': folder['folder_link'],
+                      'drive_folder_name': name}
+            row_id = db.add_vendor(name, **fields) if table == 'vendors' else db.add_project(name, **fields)
+            rows.append((table, row_id, folder['folder_id']))
+        
+        # Renames, trashes and deletes made in Drive, plus folders no row refers to
+        expected = {}
+        for n, (table, row_id, folder_id) in enumerate(rows):
+            change = n % 4
+            if change == 0:
+                server.rename(folder_id, f"Renamed {n}")
+            elif change == 1:
+                server.trash(folder_id)
+            elif change == 2:
+                server.delete(folder_id)
+            name = server.files[folder_id]['name'] if change in (0, 3) else None
+            expected[(table, row_id)] = (folder_id if change in (0, 3) else None, name)
+            manager.create_folder(f"Unrelated {n}", folder_id if change == 3 else None)
+        
+        result = engine.sync_once()
+        actual = {}
+        for table in ('vendors', 'projects'):
+            for row in db.get_many_by_ids(table, [row_id for t, row_id, _ in rows if t == table]).values():
+                actual[(table, row['id'])] = (row['drive_folder_id'], row['drive_folder_name'])
+        mismatches = [key for key in expected if actual.get(key) != expected[key]]
+        if mismatches or result['rows_updated'] != DRIVE_SYNC_ROWS * 3 // 4:
+            raise RuntimeError(f"Drive sync left {len(mismatches)} row(s) out of step with Drive "
+                               f"(first: {mismatches[:1]}), updated {result['rows_updated']}")
+        if engine.sync_once() != {'changes_seen': 0, 'rows_updated': 0}:
+            raise RuntimeError("Drive sync found changes on a second run with none made")
+        
+        # Each timed run syncs a rename of every remaining folder
+        renamed = [folder_id for (_, _), (folder_id, _) in expected.items() if folder_id]
+        renames = itertools.count()
+        
+        def rename_all():
+            n = next(renames)
+            for folder_id in renamed:
+                server.rename(folder_id, f"Renamed {folder_id} {n}")
+        
+        return {
+            'drive_sync:no_changes': time_call(engine.sync_once, repeat),
+            'drive_sync:renames': time_call(lambda _: engine.sync_once(), repeat, rename_all),
+        }
+
+
+def _check_folder_trees(server: FakeDriveServer, trees: Dict[str, Optional[Dict]], template: str = 'project'):
+    """Raise unless every tree was created in full, with each folder under its parent."""
+    paths = get_folder_template(template).folder_paths()
+    for name, tree in trees.items():
+        if tree is None or sorted(tree['subfolders']) != sorted(paths):
+            raise RuntimeError(f"Folder tree for {name!r} is incomplete: {tree}")
+        folder_ids = {'': tree['main_folder_id']}
+        folder_ids.update({path: folder['folder_id'] for path, folder in tree['subfolders'].items()})
+        for path in paths:
+            parent_id = folder_ids[path.rpartition('/')[0]]
+            if server.files[folder_ids[path]]['parents'] != [parent_id]:
+                raise RuntimeError(f"Folder {path!r} of {name!r} is not inside its parent")
+
+
+def bench_drive_concurrency(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """
+    Stress the shared GoogleDriveManager from many session threads at once.
+    
+    DRIVE_THREADS threads create DRIVE_TREES project folder trees through one
+    manager against the fake Drive server, starting with expired credentials
+    so every thread's first request races to refresh them. Raises unless
+    the token endpoint is hit exactly once, no request goes out with a stale
+    token and every tree is complete; then times the same load.
+    """
+    with _fake_drive(latency=DRIVE_LATENCY) as server:
+        manager = drive_manager(server)
+        manager.authenticate()
+        manager.creds.expiry = datetime.utcnow() - timedelta(minutes=10)
+        runs = itertools.count()
+        
+        def create_trees():
+            names = [f"Concurrent Project {next(runs)}-{n}" for n in range(DRIVE_TREES)]
+            with ThreadPoolExecutor(DRIVE_THREADS) as pool, contextlib.redirect_stdout(io.StringIO()):
+                return dict(zip(names, pool.map(manager.create_project_folder_structure, names)))
+        
+        _check_folder_trees(server, create_trees())
+        if server.stats['token_requests'] != 1 or server.stats['unauthorized']:
+            raise RuntimeError(f"Concurrent requests refreshed credentials {server.stats['token_requests']} "
+                               f"time(s) and sent {server.stats['unauthorized']} unauthorized request(s)")
+        
+        return {'drive_concurrency:trees': time_call(create_trees, repeat)}
+
+
+def bench_drive_async(dataset: Dict[str, pd.DataFrame], repeat: int, timeout: float) -> Dict[str, Dict]:
+    """
+    Compare creating folder trees one after another with AsyncDriveClient.
+    
+    Both create DRIVE_ASYNC_TREES project trees against the fake Drive
+    server, which adds DRIVE_LATENCY to every request: the sync client with
+    create_project_folder_structure in a loop (one batch per level), the
+    async client with create_project_folder_structures. Raises unless
+    both create every tree in full.
+    """
+    with _fake_drive(latency=DRIVE_LATENCY) as server:
+        manager = drive_manager(server)
+        client = AsyncDriveClient(manager)
+        runs = itertools.count()
+        
+        def names():
+            run = next(runs)
+            return [f"Async Project {run}-{n}" for n in range(DRIVE_ASYNC_TREES)]
+        
+        def create_sync(project_names):
+            with contextlib.redirect_stdout(io.StringIO()):
+                return {name: manager.create_project_folder_structure(name) for name in project_names}
+        
+        def create_async(project_names):
+            return asyncio.run(client.create_project_folder_structures(project_names))
+        
+        try:
+            _check_folder_trees(server, create_sync(names()))
+            _check_folder_trees(server, create_async(names()))
+            return {
+                'drive_async:sync': time_call(create_sync, repeat, names),
+                'drive_async:async': time_call(create_async, repeat, names),
+            }
+        finally:
+            client.close()
+
+
+# Benchmark groups: name -> function(dataset, repeat, timeout)
+BENCHMARKS = {
+    'pages': bench_pages,
+    'database': bench_database,
+    'memory': bench_memory,
+    'kpi': bench_kpi,
+    'shared_cache': bench_shared_cache,
+    'read_model': bench_read_model,
+    'exports': bench_exports,
+    'analytics': bench_analytics,
+    'spend_cube': bench_spend_cube,
+    'replica': bench_replica,
+    'sessions': bench_sessions,
+    'drive_sync': bench_drive_sync,
+    'drive_concurrency': bench_drive_concurrency,
+    'drive_async': bench_drive_async,
+}
+
+
+def _format(result: Dict) -> str:
+    """Format a timing (ms) or memory (MB) result for display."""
+    if 'bytes' in result:
+        return f"{result['bytes'] / 1024 ** 2:>10.1f} MB"
+    return f"{result['median'] * 1000:>10.1f} ms"
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    List benchmarks that got worse than baseline by more than tolerance.
+    
+    Timings compare medians (ignoring differences under NOISE_FLOOR);
+    memory results compare bytes.
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if 'bytes' in current:
+            worse = current['bytes'] > previous['bytes'] * (1 + tolerance)
+            ratio = current['bytes'] / max(previous['bytes'], 1)
+        else:
+            worse = (current['median'] > previous['median'] * (1 + tolerance)
+                     and current['median'] - previous['median'] > NOISE_FLOOR)
+            ratio = current['median'] / previous['median']
+        if worse:
+            regressions.append(f"{name}: {_format(previous).strip()} -> {_format(current).strip()} ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark suite from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark dashboard pages and database methods.")
+    parser.add_argument("--scale", default="10k",
+                        help=f"Dataset size: {', '.join(SCALES)} or a ticket count")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic data seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--groups", default=",".join(BENCHMARKS),
+                        help=f"Comma-separated groups to run ({', '.join(BENCHMARKS)})")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds allowed per page run")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write results")
+    parser.add_argument("--baseline", help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown versus baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    
+    rows = SCALES.get(args.scale.lower()) or int(args.scale)
+    print(f"Generating {rows:,} rows (seed {args.seed})...")
+    dataset = generate_dataset(rows, seed=args.seed)
+    
+    results = {}
+    for group in args.groups.split(","):
+        print(f"Running {group} benchmarks...")
+        results.update(BENCHMARKS[group](dataset, args.repeat, args.timeout))
+    
+    for name, result in results.items():
+        print(f"  {name:<45} {_format(result)}")
+    
+    report = {
+        'meta': {
+            'scale': args.scale,
+            'rows': rows,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
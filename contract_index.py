@@ -0,0 +1,122 @@
+"""
+Sorted date index over contracts for expiry and renewal windows.
+
+Questions such as "expiring within 30 days" or "renewal notice due this
+week" used to be answered by subtracting now from every contract's end
+date. ContractDateIndex sorts the start, end and renewal notice dates
+once per contracts version and answers window queries with a binary
+search over the sorted dates, returning the k matching rows in
+O(log n + k).
+"""
+
+from datetime import datetime
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+# Which window bounds are inclusive, as in pandas Series.between
+INCLUSIVE = ('both', 'neither', 'left', 'right')
+
+
+def _to_datetime64(when) -> np.datetime64:
+    """Convert a datetime-like value to numpy datetime64[ns]."""
+    return pd.Timestamp(when).to_datetime64().astype('datetime64[ns]')
+
+
+class ContractDateIndex:
+    """Sorted start, end and renewal notice dates of a contracts table."""
+    
+    def __init__(self, contracts_df: pd.DataFrame):
+        """
+        Build the index.
+        
+        Args:
+            contracts_df: Contracts table with start_date, end_date and
+                (optionally) renewal_notice_days
+        """
+        start = contracts_df['start_date'].to_numpy(dtype='datetime64[ns]')
+        end = contracts_df['end_date'].to_numpy(dtype='datetime64[ns]')
+        if 'renewal_notice_days' in contracts_df.columns:
+            notice_days = contracts_df['renewal_notice_days'].fillna(0).to_numpy(dtype=np.int64)
+        else:
+            notice_days = np.zeros(len(contracts_df), dtype=np.int64)
+        notice = end - notice_days.astype('timedelta64[D]')
+        
+        # Per column: sorted dates and the rows they belong to (rows with
+        # missing dates are left out)
+        self._columns = {}
+        for name, values in (('start', start), ('end', end), ('notice', notice)):
+            rows = np.flatnonzero(~np.isnat(values))
+            rows = rows[np.argsort(values[rows], kind='stable')]
+            self._columns[name] = (values[rows], rows)
+        
+        # Contract periods, for overlap queries
+        self._end_by_row = end
+        spans = ~np.isnat(start) & ~np.isnat(end)
+        self._span_starts = np.sort(start[spans])
+        self._span_ends = np.sort(end[spans])
+    
+    def __len__(self) -> int:
+        """Number of contracts with an end date."""
+        return len(self._columns['end'][1])
+    
+    def _window(self, column: str, start=None, end=None, inclusive: str = 'both') -> np.ndarray:
+        """Rows whose date in column falls in the window, in date order."""
+        if inclusive not in INCLUSIVE:
+            raise ValueError(f"inclusive must be one of {INCLUSIVE}")
+        values, rows = self._columns[column]
+        lo, hi = 0, len(values)
+        if start is not None:
+            lo = np.searchsorted(values, _to_datetime64(start),
+                                 side='left' if inclusive in ('both', 'left') else 'right')
+        if end is not None:
+            hi = np.searchsorted(values, _to_datetime64(end),
+                                 side='right' if inclusive in ('both', 'right') else 'left')
+        return rows[lo:max(lo, hi)]
+    
+    def ending_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                       inclusive: str = 'both') -> np.ndarray:
+        """
+        Rows of contracts whose end date falls in a window.
+        
+        Args:
+            start: Window start (None for no lower bound)
+            end: Window end (None for no upper bound)
+            inclusive: Which bounds are inclusive: 'both', 'neither', 'left' or 'right'
+        
+        Returns:
+            Row positions in the contracts table, ordered by end date
+        """
+        return self._window('end', start, end, inclusive)
+    
+    def starting_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                         inclusive: str = 'both') -> np.ndarray:
+        """Rows of contracts whose start date falls in a window, ordered by start date."""
+        return self._window('start', start, end, inclusive)
+    
+    def notices_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                        inclusive: str = 'both') -> np.ndarray:
+        """Rows of contracts whose renewal notice date falls in a window, ordered by that date."""
+        return self._window('notice', start, end, inclusive)
+    
+    def count_overlapping(self, start: datetime, end: datetime) -> int:
+        """
+        Number of contracts whose period overlaps [start, end].
+        
+        Every contract either ends before start, starts after end, or
+        overlaps, so this takes two binary searches.
+        """
+        ended = np.searchsorted(self._span_ends, _to_datetime64(start), side='left')
+        not_started = len(self._span_starts) - np.searchsorted(self._span_starts, _to_datetime64(end), side='right')
+        return int(len(self._span_starts) - ended - not_started)
+    
+    def overlapping(self, start: datetime, end: datetime) -> np.ndarray:
+        """
+        Rows of contracts whose period overlaps [start, end], ordered by start date.
+        
+        Contracts starting after end are cut off by binary search; the
+        remaining candidates are filtered on end date in one vectorized pass.
+        """
+        candidates = self._window('start', None, end)
+        return candidates[self._end_by_row[candidates] >= _to_datetime64(start)]
@@ -3,19 +3,87 @@ Database module for vendor management dashboard.
 Handles all data operations using SQLite.
 """
 
+import functools
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 import os
 
 
 class Database:
     """Database handler for vendor management system."""
     
-    def __init__(self, db_path: str = "vendor_management.db"):
-        """Initialize database connection."""
+    # Entity tables that can be read generically (e.g. for exports)
+    TABLES = ("vendors", "contracts", "projects")
+    
+    # A contract's renewal notice date; queries must use this exact
+    # expression to be served by idx_contracts_notice_date
+    NOTICE_DATE_SQL = "date(end_date, '-' || IFNULL(renewal_notice_days, 30) || ' days')"
+    
+    # Change log entries kept by compact_change_log
+    CHANGE_LOG_RETAIN = 100000
+    
+    # Rows kept by the get_*_by_id read-through cache
+    LOOKUP_CACHE_SIZE = 1024
+    
+    # Seconds between checks for changes made by other processes, which
+    # drop the cached rows of the tables they changed
+    LOOKUP_CACHE_CHECK_SECONDS = 1.0
+    
+    # Pages copied per step when refreshing the in-memory replica; writers
+    # can commit between steps
+    REPLICA_BACKUP_PAGES = 1024
+    
+    # Columns the update methods may set, per table
+    UPDATABLE_COLUMNS = {
+        'vendors': ('name', 'contact_name', 'email', 'phone', 'location', 'status', 'onboarding_date',
+                    'notes', 'drive_folder_id', 'drive_folder_link', 'drive_folder_name'),
+        'contracts': ('vendor_id', 'contract_name', 'contract_type', 'start_date', 'end_date',
+                      'contract_value', 'status', 'po_number', 'document_link', 'notes',
+                      'renewal_notice_days'),
+        'projects': ('project_name', 'vendor_id', 'status', 'start_date', 'target_date',
+                     'completion_date', 'deliverables', 'drive_folder_id', 'drive_folder_link',
+                     'drive_folder_name', 'project_owner', 'notes'),
+    }
+    
+    # Finished rows that archive_rows moves to {table}_archive: table ->
+    # condition on the row, with ? standing for the cutoff date
+    ARCHIVE_POLICIES = {
+        'contracts': "status = 'Expired' AND end_date < ?",
+        'projects': "completion_date IS NOT NULL AND completion_date != '' AND completion_date < ?",
+    }
+    
+    def __init__(self, db_path: str = "vendor_management.db", lookup_cache_size: Optional[int] = None,
+                 replica: bool = False):
+        """
+        Initialize database connection.
+        
+        Args:
+            db_path: SQLite database file
+            lookup_cache_size: Rows kept by the get_*_by_id cache (defaults
+                to LOOKUP_CACHE_SIZE; 0 disables it)
+            replica: Serve queries from an in-memory copy of the database
+                (see get_read_connection)
+        """
         self.db_path = db_path
+        self.replica = replica
+        self.replica_stats = {'refreshes': 0, 'last_refresh_seconds': None, 'last_refresh_at': None}
+        self._replica_lock = threading.Lock()
+        self._replica_anchor = None
+        self._replica_uri = None
+        self._replica_version = None
+        self._replica_watch = None
+        self.lookup_cache_size = self.LOOKUP_CACHE_SIZE if lookup_cache_size is None else lookup_cache_size
+        self.lookup_stats = {table: {'hits': 0, 'misses': 0} for table in self.TABLES}
+        self._lookup_cache = OrderedDict()
+        self._lookup_generations = {table: 0 for table in self.TABLES}
+        self._lookup_versions = None
+        self._lookup_checked = 0.0
+        self._lookup_lock = threading.Lock()
         self.init_database()
     
     def get_connection(self) -> sqlite3.Connection:
@@ -24,6 +92,50 @@ class Database:
         conn.row_factory = sqlite3.Row
         return conn
     
+    def get_read_connection(self) -> sqlite3.Connection:
+        """
+        Get a connection for queries.
+        
+        In replica mode this is a connection to an in-memory copy of the
+        database, refreshed with the sqlite3 backup API whenever a commit
+        from any connection or process has changed the file since the last
+        copy (PRAGMA data_version), so reads still see every committed
+        write. Writes always go to the file through get_connection.
+        """
+        if not self.replica:
+            return self.get_connection()
+        
+        with self._replica_lock:
+            if self._replica_watch is None:
+                self._replica_watch = sqlite3.connect(self.db_path, check_same_thread=False)
+            version = self._replica_watch.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._replica_version:
+                self._refresh_replica(version)
+            # Opened under the lock, so a refresh cannot drop this copy before it is attached
+            conn = sqlite3.connect(self._replica_uri, uri=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _refresh_replica(self, version: int):
+        """Copy the database file into a new in-memory database and switch readers to it."""
+        start = time.perf_counter()
+        self.replica_stats['refreshes'] += 1
+        uri = f"file:vendor_replica_{id(self)}_{self.replica_stats['refreshes']}?mode=memory&cache=shared"
+        anchor = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        source = sqlite3.connect(self.db_path)
+        try:
+            source.backup(anchor, pages=self.REPLICA_BACKUP_PAGES)
+        finally:
+            source.close()
+        
+        # Connections still reading the previous copy keep it alive until they close
+        previous = self._replica_anchor
+        self._replica_anchor, self._replica_uri, self._replica_version = anchor, uri, version
+        if previous is not None:
+            previous.close()
+        self.replica_stats['last_refresh_seconds'] = time.perf_counter() - start
+        self.replica_stats['last_refresh_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
     def init_database(self):
         """Initialize database tables."""
         conn = self.get_connection()
@@ -87,14 +199,174 @@ class Database:
             )
         """)
         
+        # Vendors created before Drive integration have no folder columns
+        self._ensure_column(cursor, "vendors", "drive_folder_id", "TEXT")
+        self._ensure_column(cursor, "vendors", "drive_folder_link", "TEXT")
+        
+        # Folder names as last seen in Drive, kept current by drive_sync.py
+        self._ensure_column(cursor, "vendors", "drive_folder_name", "TEXT")
+        self._ensure_column(cursor, "projects", "drive_folder_name", "TEXT")
+        
+        # Contracts created before renewal alerts have no notice period
+        self._ensure_column(cursor, "contracts", "renewal_notice_days", "INTEGER DEFAULT 30")
+        
+        # Drive sync looks rows up by folder ID
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_vendors_drive_folder ON vendors(drive_folder_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_drive_folder ON projects(drive_folder_id)")
+        
+        # Renewal alerts look contracts up by notice date, end date and last change
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_contracts_notice_date ON contracts({self.NOTICE_DATE_SQL})")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_contracts_end_date ON contracts(end_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_contracts_updated ON contracts(updated_at)")
+        
+        # Delta exports read rows changed in a time window
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_vendors_updated ON vendors(updated_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_updated ON projects(updated_at)")
+        
+        # Alerts fired by the renewal alert worker; the unique key stops the
+        # same alert firing twice
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS contract_alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                contract_id INTEGER NOT NULL,
+                alert_type TEXT NOT NULL,
+                due_date TEXT NOT NULL,
+                message TEXT,
+                fired_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                notified_at TEXT,
+                UNIQUE (contract_id, alert_type, due_date),
+                FOREIGN KEY (contract_id) REFERENCES contracts(id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_contract_alerts_pending ON contract_alerts(notified_at)")
+        
+        # Key/value state for background jobs (e.g. Drive change tokens)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Change data capture: triggers on the entity tables append every
+        # insert, update and delete to change_log under an increasing seq,
+        # and bump a per-table version
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS change_log (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                row_id INTEGER NOT NULL,
+                op TEXT NOT NULL,
+                changed_columns TEXT,
+                version INTEGER NOT NULL,
+                changed_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS change_log_versions (
+                table_name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        # Deletes are read back as delta export tombstones
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_change_log_deletes ON change_log(table_name, changed_at)
+            WHERE op = 'delete'
+        """)
+        for table in self.TABLES:
+            cursor.execute("INSERT OR IGNORE INTO change_log_versions (table_name) VALUES (?)", (table,))
+            self._ensure_change_triggers(cursor, table)
+        
+        # Cold storage for finished rows, plus views over hot and archived rows
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_projects_completion ON projects(completion_date)")
+        for table in self.ARCHIVE_POLICIES:
+            self._ensure_archive(cursor, table)
+        
         conn.commit()
         conn.close()
+        
+        # Keep the log bounded across restarts
+        self.compact_change_log()
+    
+    @staticmethod
+    def _ensure_change_triggers(cursor: sqlite3.Cursor, table: str):
+        """
+        Create the change log triggers for a table.
+        
+        The update trigger lists the columns that changed, so it is
+        regenerated whenever the table's columns differ from the ones it was
+        written for (e.g. after _ensure_column added one).
+        """
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = [row[1] for row in cursor.fetchall() if row[1] not in ("id", "updated_at")]
+        changed = " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in columns)
+        changed_list = " || ".join(
+            f"CASE WHEN OLD.{column} IS NOT NEW.{column} THEN ',{column}' ELSE '' END" for column in columns)
+        
+        def log_entry(op, row, changed_columns):
+            return f"""
+                UPDATE change_log_versions SET version = version + 1 WHERE table_name = '{table}';
+                INSERT INTO change_log (table_name, row_id, op, changed_columns, version)
+                VALUES ('{table}', {row}, '{op}', {changed_columns},
+                        (SELECT version FROM change_log_versions WHERE table_name = '{table}'));"""
+        
+        triggers = {
+            f"{table}_cdc_insert": f"AFTER INSERT ON {table} BEGIN{log_entry('insert', 'NEW.id', 'NULL')}\nEND",
+            # Updates that change nothing but updated_at are not logged
+            f"{table}_cdc_update": (f"AFTER UPDATE ON {table} WHEN {changed} "
+                                    f"BEGIN{log_entry('update', 'NEW.id', f'substr({changed_list}, 2)')}\nEND"),
+            f"{table}_cdc_delete": f"AFTER DELETE ON {table} BEGIN{log_entry('delete', 'OLD.id', 'NULL')}\nEND",
+        }
+        for name, body in triggers.items():
+            sql = f"CREATE TRIGGER {name} {body}"
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,))
+            existing = cursor.fetchone()
+            if existing is None or existing[0] != sql:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(sql)
+    
+    @staticmethod
+    def _ensure_archive(cursor: sqlite3.Cursor, table: str):
+        """
+        Create the archive table and history view for a table.
+        
+        {table}_archive holds the table's columns plus archived_at. Columns
+        added to the table later are added to the archive as well, and the
+        {table}_history view (hot rows UNION ALL archived rows, archived_at
+        NULL for hot rows) is regenerated to match.
+        """
+        archive = f"{table}_archive"
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {archive} "
+                       "(id INTEGER PRIMARY KEY, archived_at TEXT DEFAULT CURRENT_TIMESTAMP)")
+        cursor.execute(f"PRAGMA table_info({table})")
+        columns = [(row[1], row[2]) for row in cursor.fetchall()]
+        for column, column_type in columns:
+            Database._ensure_column(cursor, archive, column, column_type or "TEXT")
+        
+        names = ", ".join(column for column, _ in columns)
+        sql = (f"CREATE VIEW {table}_history AS "
+               f"SELECT {names}, NULL AS archived_at FROM {table} "
+               f"UNION ALL SELECT {names}, archived_at FROM {archive}")
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'view' AND name = ?", (f"{table}_history",))
+        existing = cursor.fetchone()
+        if existing is None or existing[0] != sql:
+            cursor.execute(f"DROP VIEW IF EXISTS {table}_history")
+            cursor.execute(sql)
+    
+    @staticmethod
+    def _ensure_column(cursor: sqlite3.Cursor, table: str, column: str, column_type: str):
+        """Add a column to an existing table if it is missing."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
     
     # VENDOR OPERATIONS
     
     def add_vendor(self, name: str, contact_name: str = "", email: str = "", 
                    phone: str = "", location: str = "", status: str = "Pending", 
-                   notes: str = "") -> int:
+                   notes: str = "", drive_folder_id: str = "", drive_folder_link: str = "",
+                   drive_folder_name: str = "") -> int:
         """Add a new vendor."""
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -102,9 +374,11 @@ class Database:
         onboarding_date = datetime.now().strftime("%Y-%m-%d") if status != "Pending" else None
         
         cursor.execute("""
-            INSERT INTO vendors (name, contact_name, email, phone, location, status, onboarding_date, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (name, contact_name, email, phone, location, status, onboarding_date, notes))
+            INSERT INTO vendors (name, contact_name, email, phone, location, status, onboarding_date, notes,
+                                 drive_folder_id, drive_folder_link, drive_folder_name)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (name, contact_name, email, phone, location, status, onboarding_date, notes,
+              drive_folder_id, drive_folder_link, drive_folder_name))
         
         vendor_id = cursor.lastrowid
         conn.commit()
@@ -113,7 +387,7 @@ class Database:
     
     def get_vendors(self, status_filter: Optional[str] = None) -> pd.DataFrame:
         """Get all vendors or filtered by status."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         
         if status_filter and status_filter != "All":
             query = "SELECT * FROM vendors WHERE status = ? ORDER BY created_at DESC"
@@ -127,34 +401,11 @@ class Database:
     
     def get_vendor_by_id(self, vendor_id: int) -> Optional[Dict]:
         """Get vendor by ID."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM vendors WHERE id = ?", (vendor_id,))
-        row = cursor.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        return self.get_many_by_ids('vendors', [vendor_id]).get(vendor_id)
     
     def update_vendor(self, vendor_id: int, **kwargs):
-        """Update vendor information."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Build update query dynamically
-        fields = []
-        values = []
-        for key, value in kwargs.items():
-            if value is not None:
-                fields.append(f"{key} = ?")
-                values.append(value)
-        
-        fields.append("updated_at = ?")
-        values.append(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        values.append(vendor_id)
-        
-        query = f"UPDATE vendors SET {', '.join(fields)} WHERE id = ?"
-        cursor.execute(query, values)
-        conn.commit()
-        conn.close()
+        """Update vendor information (columns in UPDATABLE_COLUMNS['vendors'])."""
+        self.update_many('vendors', [(vendor_id, kwargs)])
     
     def delete_vendor(self, vendor_id: int):
         """Delete a vendor."""
@@ -163,23 +414,25 @@ class Database:
         cursor.execute("DELETE FROM vendors WHERE id = ?", (vendor_id,))
         conn.commit()
         conn.close()
+        self._invalidate_lookups('vendors', [vendor_id])
     
     # CONTRACT OPERATIONS
     
     def add_contract(self, vendor_id: int, contract_name: str, contract_type: str = "",
                      start_date: str = "", end_date: str = "", contract_value: float = 0,
                      status: str = "Draft", po_number: str = "", document_link: str = "",
-                     notes: str = "") -> int:
+                     notes: str = "", renewal_notice_days: int = 30) -> int:
         """Add a new contract."""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
             INSERT INTO contracts (vendor_id, contract_name, contract_type, start_date, 
-                                 end_date, contract_value, status, po_number, document_link, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                 end_date, contract_value, status, po_number, document_link, notes,
+                                 renewal_notice_days)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (vendor_id, contract_name, contract_type, start_date, end_date, 
-              contract_value, status, po_number, document_link, notes))
+              contract_value, status, po_number, document_link, notes, renewal_notice_days))
         
         contract_id = cursor.lastrowid
         conn.commit()
@@ -188,7 +441,7 @@ class Database:
     
     def get_contracts(self, status_filter: Optional[str] = None) -> pd.DataFrame:
         """Get all contracts with vendor information."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         
         query = """
             SELECT c.*, v.name as vendor_name
@@ -207,33 +460,11 @@ class Database:
     
     def get_contract_by_id(self, contract_id: int) -> Optional[Dict]:
         """Get contract by ID."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM contracts WHERE id = ?", (contract_id,))
-        row = cursor.fetchone()
-        conn.close()
-        return dict(row) if row else None
+        return self.get_many_by_ids('contracts', [contract_id]).get(contract_id)
     
     def update_contract(self, contract_id: int, **kwargs):
-        """Update contract information."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        fields = []
-        values = []
-        for key, value in kwargs.items():
-            if value is not None:
-                fields.append(f"{key} = ?")
-                values.append(value)
-        
-        fields.append("updated_at = ?")
-        values.append(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        values.append(contract_id)
-        
-        query = f"UPDATE contracts SET {', '.join(fields)} WHERE id = ?"
-        cursor.execute(query, values)
-        conn.commit()
-        conn.close()
+        """Update contract information (columns in UPDATABLE_COLUMNS['contracts'])."""
+        self.update_many('contracts', [(contract_id, kwargs)])
     
     def delete_contract(self, contract_id: int):
         """Delete a contract."""
@@ -242,23 +473,26 @@ class Database:
         cursor.execute("DELETE FROM contracts WHERE id = ?", (contract_id,))
         conn.commit()
         conn.close()
+        self._invalidate_lookups('contracts', [contract_id])
     
     # PROJECT OPERATIONS
     
     def add_project(self, project_name: str, vendor_id: int = None, status: str = "Green",
                     start_date: str = "", target_date: str = "", deliverables: str = "",
                     project_owner: str = "", notes: str = "", 
-                    drive_folder_id: str = "", drive_folder_link: str = "") -> int:
+                    drive_folder_id: str = "", drive_folder_link: str = "",
+                    drive_folder_name: str = "") -> int:
         """Add a new project."""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
             INSERT INTO projects (project_name, vendor_id, status, start_date, target_date, 
-                                deliverables, project_owner, notes, drive_folder_id, drive_folder_link)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                deliverables, project_owner, notes, drive_folder_id, drive_folder_link,
+                                drive_folder_name)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (project_name, vendor_id, status, start_date, target_date, 
-              deliverables, project_owner, notes, drive_folder_id, drive_folder_link))
+              deliverables, project_owner, notes, drive_folder_id, drive_folder_link, drive_folder_name))
         
         project_id = cursor.lastrowid
         conn.commit()
@@ -267,7 +501,7 @@ class Database:
     
     def get_projects(self, status_filter: Optional[str] = None) -> pd.DataFrame:
         """Get all projects with vendor information."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         
         query = """
             SELECT p.*, v.name as vendor_name
@@ -286,47 +520,657 @@ class Database:
     
     def get_project_by_id(self, project_id: int) -> Optional[Dict]:
         """Get project by ID."""
+        return self.get_many_by_ids('projects', [project_id]).get(project_id)
+    
+    def update_project(self, project_id: int, **kwargs):
+        """Update project information (columns in UPDATABLE_COLUMNS['projects'])."""
+        self.update_many('projects', [(project_id, kwargs)])
+    
+    def delete_project(self, project_id: int):
+        """Delete a project."""
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
+        cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+        conn.commit()
+        conn.close()
+        self._invalidate_lookups('projects', [project_id])
+    
+    # LOOKUP CACHE
+    
+    def _check_lookup_versions(self):
+        """Drop cached rows of tables changed since the last check (at most once per interval)."""
+        now = time.monotonic()
+        if now - self._lookup_checked < self.LOOKUP_CACHE_CHECK_SECONDS:
+            return
+        versions = self.get_table_versions()
+        with self._lookup_lock:
+            previous, self._lookup_versions = self._lookup_versions, versions
+            self._lookup_checked = now
+            if previous is not None:
+                changed = {table for table in versions if versions[table] != previous.get(table)}
+                for key in [key for key in self._lookup_cache if key[0] in changed]:
+                    del self._lookup_cache[key]
+                for table in changed & self._lookup_generations.keys():
+                    self._lookup_generations[table] += 1
+    
+    def _invalidate_lookups(self, table: str, row_ids: Optional[Iterable[int]] = None):
+        """Drop cached rows of a table (all of them if row_ids is None)."""
+        with self._lookup_lock:
+            # Reads already under way may have seen the old rows and must not cache them
+            self._lookup_generations[table] += 1
+            if row_ids is None:
+                for key in [key for key in self._lookup_cache if key[0] == table]:
+                    del self._lookup_cache[key]
+            else:
+                for row_id in row_ids:
+                    self._lookup_cache.pop((table, row_id), None)
+    
+    def clear_lookup_cache(self):
+        """Drop every cached row (e.g. after the database file was replaced)."""
+        for table in self.TABLES:
+            self._invalidate_lookups(table)
+    
+    def get_many_by_ids(self, table: str, row_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Get rows of a table by ID, through the read-through lookup cache.
+        
+        Cached rows are returned without touching the database; the rest
+        are read with one IN query per 500 IDs and cached. Rows changed
+        through this Database are dropped from the cache right away, and
+        rows changed by other processes within LOOKUP_CACHE_CHECK_SECONDS.
+        
+        Args:
+            table: One of TABLES
+            row_ids: IDs to look up
+        
+        Returns:
+            Dictionary of ID -> row for the IDs that exist
+        """
+        if table not in self.TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        if self.lookup_cache_size > 0:
+            self._check_lookup_versions()
+        
+        found = {}
+        missing = []
+        with self._lookup_lock:
+            for row_id in dict.fromkeys(row_ids):
+                row = self._lookup_cache.get((table, row_id))
+                if row is None:
+                    missing.append(row_id)
+                else:
+                    self._lookup_cache.move_to_end((table, row_id))
+                    found[row_id] = dict(row)
+            self.lookup_stats[table]['hits'] += len(found)
+            self.lookup_stats[table]['misses'] += len(missing)
+            generation = self._lookup_generations[table]
+        if not missing:
+            return found
+        
+        conn = self.get_read_connection()
+        cursor = conn.cursor()
+        rows = []
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            cursor.execute(f"SELECT * FROM {table} WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            rows.extend(dict(row) for row in cursor.fetchall())
+        conn.close()
+        
+        with self._lookup_lock:
+            cacheable = self.lookup_cache_size > 0 and generation == self._lookup_generations[table]
+            for row in rows:
+                found[row['id']] = row
+                if cacheable:
+                    self._lookup_cache[(table, row['id'])] = dict(row)
+                    self._lookup_cache.move_to_end((table, row['id']))
+            while len(self._lookup_cache) > self.lookup_cache_size:
+                self._lookup_cache.popitem(last=False)
+        return found
+    
+    def get_lookup_cache_stats(self) -> pd.DataFrame:
+        """Get the lookup cache's hits, misses and hit rate per table."""
+        with self._lookup_lock:
+            cached = {table: 0 for table in self.TABLES}
+            for table, _ in self._lookup_cache:
+                cached[table] += 1
+            rows = [{'table': table, **stats, 'cached_rows': cached[table],
+                     'hit_rate': stats['hits'] / (stats['hits'] + stats['misses'])
+                     if stats['hits'] + stats['misses'] else None}
+                    for table, stats in self.lookup_stats.items()]
+        return pd.DataFrame(rows)
+    
+    # BULK OPERATIONS
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _update_sql(table: str, columns: Tuple[str, ...]) -> str:
+        """UPDATE statement setting columns of one row, built once per table and column set."""
+        assignments = "".join(f"{column} = ?, " for column in columns)
+        return f"UPDATE {table} SET {assignments}updated_at = CURRENT_TIMESTAMP WHERE id = ?"
+    
+    def update_many(self, table: str, changes: Iterable[Tuple[int, Dict]]) -> int:
+        """
+        Apply many row updates in one transaction.
+        
+        Consecutive updates setting the same columns run as one executemany
+        of the same cached statement, so a bulk status change (e.g. marking
+        contracts 'Pending Renewal') prepares a single statement. Every
+        change is validated before anything is written.
+        
+        Args:
+            table: One of UPDATABLE_COLUMNS
+            changes: (row id, {column: value}) pairs, applied in order; None
+                values leave the column unchanged
+        
+        Returns:
+            Number of rows updated
+        
+        Raises:
+            ValueError: For an unknown table or a column not in UPDATABLE_COLUMNS
+        """
+        if table not in self.UPDATABLE_COLUMNS:
+            raise ValueError(f"Unknown table: {table}")
+        allowed = frozenset(self.UPDATABLE_COLUMNS[table])
+        
+        # Runs of consecutive changes to the same columns: (columns, parameter rows)
+        batches = []
+        for row_id, values in changes:
+            values = {column: value for column, value in values.items() if value is not None}
+            unknown = values.keys() - allowed
+            if unknown:
+                raise ValueError(f"Cannot update {table} columns: {', '.join(sorted(unknown))}")
+            columns = tuple(sorted(values))
+            params = [values[column] for column in columns] + [row_id]
+            if batches and batches[-1][0] == columns:
+                batches[-1][1].append(params)
+            else:
+                batches.append((columns, [params]))
+        if not batches:
+            return 0
+        
+        conn = self.get_connection()
+        try:
+            with conn:
+                updated = sum(conn.executemany(self._update_sql(table, columns), rows).rowcount
+                              for columns, rows in batches)
+        finally:
+            conn.close()
+            self._invalidate_lookups(table, [params[-1] for _, rows in batches for params in rows])
+        return updated
+    
+    # SYNC OPERATIONS
+    
+    def get_sync_state(self, key: str) -> Optional[str]:
+        """Get a persisted sync state value."""
+        conn = self.get_read_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM sync_state WHERE key = ?", (key,))
         row = cursor.fetchone()
         conn.close()
-        return dict(row) if row else None
+        return row[0] if row else None
     
-    def update_project(self, project_id: int, **kwargs):
-        """Update project information."""
+    def set_sync_state(self, key: str, value: str):
+        """Persist a sync state value."""
         conn = self.get_connection()
         cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO sync_state (key, value, updated_at) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+        """, (key, value, datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        conn.commit()
+        conn.close()
+    
+    def apply_drive_folder_changes(self, changes: List[Tuple[str, Optional[str], Optional[str]]]) -> int:
+        """
+        Reconcile vendor and project folder links and names with Drive changes.
         
-        fields = []
-        values = []
-        for key, value in kwargs.items():
-            if value is not None:
-                fields.append(f"{key} = ?")
-                values.append(value)
+        Args:
+            changes: List of (folder_id, folder_link, folder_name) tuples. A
+                folder_link of None means the folder was deleted or trashed,
+                and the row's folder reference is cleared.
         
-        fields.append("updated_at = ?")
-        values.append(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        values.append(project_id)
+        Returns:
+            Number of vendor and project rows updated
+        """
+        if not changes:
+            return 0
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        updated = 0
+        
+        for table in ("vendors", "projects"):
+            for folder_id, folder_link, folder_name in changes:
+                if folder_link is None:
+                    cursor.execute(f"""
+                        UPDATE {table} SET drive_folder_id = NULL, drive_folder_link = NULL,
+                                           drive_folder_name = NULL, updated_at = CURRENT_TIMESTAMP
+                        WHERE drive_folder_id = ?
+                    """, (folder_id,))
+                else:
+                    cursor.execute(f"""
+                        UPDATE {table} SET drive_folder_link = ?, drive_folder_name = ?,
+                                           updated_at = CURRENT_TIMESTAMP
+                        WHERE drive_folder_id = ?
+                          AND (IFNULL(drive_folder_link, '') != ? OR IFNULL(drive_folder_name, '') != ?)
+                    """, (folder_link, folder_name, folder_id, folder_link, folder_name))
+                updated += cursor.rowcount
         
-        query = f"UPDATE projects SET {', '.join(fields)} WHERE id = ?"
-        cursor.execute(query, values)
         conn.commit()
         conn.close()
+        if updated:
+            self._invalidate_lookups('vendors')
+            self._invalidate_lookups('projects')
+        return updated
     
-    def delete_project(self, project_id: int):
-        """Delete a project."""
+    # ALERT OPERATIONS
+    
+    def get_contracts_for_alerts(self, window_start: Optional[str], window_end: str,
+                                 changed_since: Optional[str] = None, after_id: int = 0) -> pd.DataFrame:
+        """
+        Get the contracts a renewal alert run needs to evaluate.
+        
+        Args:
+            window_start: First date (YYYY-MM-DD) of the window; None for no lower bound
+            window_end: Last date (YYYY-MM-DD) of the window
+            changed_since: Also include contracts updated at or after this
+                timestamp (database clock, see get_current_timestamp)
+            after_id: Also include contracts with a higher id (added since the last run)
+        
+        Returns:
+            DataFrame of contracts whose renewal notice date or end date falls
+            in the window, or that are new or changed, with notice_date and
+            vendor_name columns
+        """
+        lower = window_start or "0000-00-00"
+        conditions = [
+            (f"{self.NOTICE_DATE_SQL} BETWEEN ? AND ?", (lower, window_end)),
+            ("end_date BETWEEN ? AND ?", (lower, window_end)),
+            ("id > ?", (after_id,)),
+        ]
+        if changed_since:
+            conditions.append(("updated_at >= ?", (changed_since,)))
+        
+        # One indexed query per condition rather than a single OR scan
+        ids_sql = " UNION ".join(f"SELECT id FROM contracts WHERE {where}" for where, _ in conditions)
+        params = [value for _, values in conditions for value in values]
+        
+        conn = self.get_read_connection()
+        df = pd.read_sql_query(f"""
+            SELECT c.id, c.contract_name, c.status, c.end_date, c.renewal_notice_days,
+                   {self.NOTICE_DATE_SQL} AS notice_date,
+                   v.name AS vendor_name
+            FROM contracts c
+            LEFT JOIN vendors v ON c.vendor_id = v.id
+            WHERE c.id IN ({ids_sql})
+            ORDER BY c.id
+        """, conn, params=params)
+        conn.close()
+        return df
+    
+    def record_contract_alerts(self, alerts: List[Tuple[int, str, str, str]]) -> List[int]:
+        """
+        Record fired alerts, skipping any that were recorded before.
+        
+        Args:
+            alerts: List of (contract_id, alert_type, due_date, message)
+        
+        Returns:
+            IDs of the newly recorded alerts
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+        new_ids = []
+        for alert in alerts:
+            cursor.execute("""
+                INSERT OR IGNORE INTO contract_alerts (contract_id, alert_type, due_date, message)
+                VALUES (?, ?, ?, ?)
+            """, alert)
+            if cursor.rowcount:
+                new_ids.append(cursor.lastrowid)
+        conn.commit()
+        conn.close()
+        return new_ids
+    
+    def get_pending_alerts(self) -> pd.DataFrame:
+        """Get alerts whose notification has not been sent yet."""
+        conn = self.get_read_connection()
+        df = pd.read_sql_query(
+            "SELECT * FROM contract_alerts WHERE notified_at IS NULL ORDER BY id", conn)
+        conn.close()
+        return df
+    
+    def mark_alerts_notified(self, alert_ids: List[int]):
+        """Record that notifications for these alerts were sent."""
+        if not alert_ids:
+            return
+        conn = self.get_connection()
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        conn.executemany("UPDATE contract_alerts SET notified_at = ? WHERE id = ?",
+                         [(now, alert_id) for alert_id in alert_ids])
+        conn.commit()
+        conn.close()
+    
+    def get_alert_feed(self, limit: int = 20) -> pd.DataFrame:
+        """Get the most recent alerts, newest first."""
+        conn = self.get_read_connection()
+        df = pd.read_sql_query("""
+            SELECT a.id, a.alert_type, a.due_date, a.message, a.fired_at, a.notified_at,
+                   COALESCE(c.contract_name, ca.contract_name) AS contract_name
+            FROM contract_alerts a
+            LEFT JOIN contracts c ON a.contract_id = c.id
+            LEFT JOIN contracts_archive ca ON a.contract_id = ca.id
+            ORDER BY a.id DESC
+            LIMIT ?
+        """, conn, params=(limit,))
+        conn.close()
+        return df
+    
+    # CHANGE LOG OPERATIONS
+    
+    def get_change_sequence(self) -> int:
+        """Get the sequence number of the latest change (0 if none)."""
+        conn = self.get_read_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT IFNULL(MAX(seq), 0) FROM change_log")
+        seq = cursor.fetchone()[0]
+        conn.close()
+        return seq
+    
+    def get_table_versions(self) -> Dict[str, int]:
+        """Get each entity table's version, bumped on every logged change."""
+        conn = self.get_read_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT table_name, version FROM change_log_versions")
+        versions = {row[0]: row[1] for row in cursor.fetchall()}
+        conn.close()
+        return versions
+    
+    def get_changes_since(self, seq: int, tables: Optional[List[str]] = None,
+                          limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get changes logged after a sequence number, oldest first.
+        
+        Args:
+            seq: Last sequence number already seen (0 for everything retained)
+            tables: Only changes to these tables (defaults to all)
+            limit: Maximum number of changes to return; page through with
+                the last returned seq
+        
+        Returns:
+            DataFrame with seq, table_name, row_id, op ('insert', 'update',
+            'delete', or 'archive' for rows moved to the table's archive by
+            archive_rows), changed_columns (comma-separated, updates only),
+            version and changed_at. If seq is older than
+            get_change_log_floor(), changes in between were compacted away
+            and the caller should reload instead.
+        """
+        sql = "SELECT * FROM change_log WHERE seq > ?"
+        params = [seq]
+        if tables:
+            sql += f" AND table_name IN ({', '.join('?' * len(tables))})"
+            params.extend(tables)
+        sql += " ORDER BY seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        conn = self.get_read_connection()
+        df = pd.read_sql_query(sql, conn, params=params)
+        conn.close()
+        return df
+    
+    def get_change_log_floor(self) -> int:
+        """Get the sequence number up to which the change log was compacted."""
+        return int(self.get_sync_state("change_log_floor") or 0)
+    
+    def compact_change_log(self, retain: Optional[int] = None) -> int:
+        """
+        Drop all but the most recent change log entries.
+        
+        Args:
+            retain: Number of entries to keep (defaults to CHANGE_LOG_RETAIN)
+        
+        Returns:
+            Number of entries removed
+        """
+        retain = self.CHANGE_LOG_RETAIN if retain is None else retain
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT IFNULL(MAX(seq), 0) - ? FROM change_log", (retain,))
+        floor = cursor.fetchone()[0]
+        removed = 0
+        if floor > 0:
+            cursor.execute("DELETE FROM change_log WHERE seq <= ?", (floor,))
+            removed = cursor.rowcount
+        if removed:
+            cursor.execute("""
+                INSERT INTO sync_state (key, value, updated_at) VALUES ('change_log_floor', ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            """, (str(floor), datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
         conn.commit()
         conn.close()
+        return removed
+    
+    # ARCHIVE OPERATIONS
+    
+    def archive_rows(self, table: str, before: str, batch_size: int = 500,
+                     pause_seconds: float = 0.0, max_batches: Optional[int] = None) -> int:
+        """
+        Move finished rows older than a cutoff from a table to its archive.
+        
+        Rows matching ARCHIVE_POLICIES[table] are copied to {table}_archive
+        and deleted from the table batch_size rows per transaction, so
+        writers never wait longer than one small batch. Their change log
+        entries are recorded with op 'archive' rather than 'delete', so
+        delta exports do not turn archived rows into tombstones.
+        
+        Args:
+            table: One of ARCHIVE_POLICIES
+            before: Cutoff date (YYYY-MM-DD); rows whose date is earlier are archived
+            batch_size: Rows moved per transaction
+            pause_seconds: Pause between batches, leaving the database to other writers
+            max_batches: Stop after this many batches (None archives everything due)
+        
+        Returns:
+            Number of rows archived
+        """
+        if table not in self.ARCHIVE_POLICIES:
+            raise ValueError(f"Unknown archive table: {table}")
+        
+        conn = self.get_connection()
+        conn.isolation_level = None  # transactions are opened explicitly, one per batch
+        archived = 0
+        batches = 0
+        try:
+            names = ", ".join(row[1] for row in conn.execute(f"PRAGMA table_info({table})"))
+            while max_batches is None or batches < max_batches:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    ids = [row[0] for row in conn.execute(
+                        f"SELECT id FROM {table} WHERE {self.ARCHIVE_POLICIES[table]} ORDER BY id LIMIT ?",
+                        (before, batch_size))]
+                    if ids:
+                        placeholders = ", ".join("?" * len(ids))
+                        last_seq = conn.execute("SELECT IFNULL(MAX(seq), 0) FROM change_log").fetchone()[0]
+                        conn.execute(f"INSERT OR REPLACE INTO {table}_archive ({names}) "
+                                     f"SELECT {names} FROM {table} WHERE id IN ({placeholders})", ids)
+                        conn.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", ids)
+                        conn.execute("UPDATE change_log SET op = 'archive' WHERE seq > ? AND op = 'delete'",
+                                     (last_seq,))
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                
+                self._invalidate_lookups(table, ids)
+                archived += len(ids)
+                batches += 1
+                if len(ids) < batch_size:
+                    break
+                if pause_seconds:
+                    time.sleep(pause_seconds)
+        finally:
+            conn.close()
+        return archived
+    
+    def get_history(self, table: str, status_filter: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get a table's hot and archived rows with vendor information.
+        
+        Args:
+            table: One of ARCHIVE_POLICIES
+            status_filter: Only rows with this status ("All" or None for every row)
+        
+        Returns:
+            DataFrame like get_contracts / get_projects plus archived_at
+            (None for rows still in the hot table)
+        """
+        if table not in self.ARCHIVE_POLICIES:
+            raise ValueError(f"Unknown archive table: {table}")
+        
+        query = f"""
+            SELECT h.*, v.name as vendor_name
+            FROM {table}_history h
+            LEFT JOIN vendors v ON h.vendor_id = v.id
+        """
+        params = ()
+        if status_filter and status_filter != "All":
+            query += " WHERE h.status = ?"
+            params = (status_filter,)
+        
+        conn = self.get_read_connection()
+        df = pd.read_sql_query(query + " ORDER BY h.created_at DESC", conn, params=params)
+        conn.close()
+        return df
+    
+    def get_archive_stats(self) -> pd.DataFrame:
+        """Get hot and archived row counts and the last archive time per table."""
+        conn = self.get_read_connection()
+        cursor = conn.cursor()
+        rows = []
+        for table in self.ARCHIVE_POLICIES:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            hot = cursor.fetchone()[0]
+            cursor.execute(f"SELECT COUNT(*), MAX(archived_at) FROM {table}_archive")
+            archived, last_archived = cursor.fetchone()
+            rows.append({'table': table, 'hot_rows': hot, 'archived_rows': archived,
+                         'last_archived_at': last_archived})
+        conn.close()
+        return pd.DataFrame(rows)
+    
+    # EXPORT OPERATIONS
+    
+    def iter_table(self, table: str, chunksize: int = 50000) -> Iterator[pd.DataFrame]:
+        """Stream a table as DataFrame chunks without loading it whole."""
+        if table not in self.TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        
+        conn = self.get_read_connection()
+        try:
+            for chunk in pd.read_sql_query(f"SELECT * FROM {table} ORDER BY id", conn, chunksize=chunksize):
+                yield chunk
+        finally:
+            conn.close()
+    
+    def get_column_types(self, table: str) -> Dict[str, str]:
+        """Get a table's columns and their declared SQLite types, in table order."""
+        if table not in self.TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        
+        conn = self.get_read_connection()
+        columns = {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+        conn.close()
+        return columns
+    
+    def get_current_timestamp(self) -> str:
+        """Get the database clock's current time, as written to updated_at (UTC)."""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT CURRENT_TIMESTAMP")
+        timestamp = cursor.fetchone()[0]
+        conn.close()
+        return timestamp
+    
+    def iter_table_delta(self, table: str, since: Optional[str], until: str,
+                         chunksize: int = 50000) -> Iterator[pd.DataFrame]:
+        """
+        Stream the rows of a table changed or deleted in [since, until).
+        
+        Changed rows are found through the table's updated_at index and
+        deleted rows through the change log. The window is half-open so
+        that rows written during the second of until are picked up by the
+        next export rather than lost.
+        
+        Args:
+            table: One of TABLES
+            since: Previous export's until (None exports the whole table
+                without tombstones)
+            until: Upper bound, normally get_current_timestamp()
+            chunksize: Rows per chunk
+        
+        Yields:
+            DataFrame chunks with the table's columns plus is_deleted; a
+            tombstone (is_deleted = 1) carries only id and the deletion
+            time in updated_at
+        """
+        if table not in self.TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        
+        conn = self.get_read_connection()
+        try:
+            if since is None:
+                # Rows from before updated_at was added have none; a full
+                # export must still include them
+                sql = (f"SELECT *, 0 AS is_deleted FROM {table} "
+                       f"WHERE updated_at IS NULL OR updated_at < ? ORDER BY id")
+                params = [until]
+            else:
+                columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+                tombstone = ", ".join(
+                    "row_id" if column == "id" else "changed_at" if column == "updated_at" else "NULL"
+                    for column in columns)
+                sql = f"""
+                    SELECT *, 0 AS is_deleted FROM {table} WHERE updated_at >= ? AND updated_at < ?
+                    UNION ALL
+                    SELECT {tombstone}, 1 FROM change_log
+                    WHERE table_name = ? AND op = 'delete' AND changed_at >= ? AND changed_at < ?
+                """
+                params = [since, until, table, since, until]
+            for chunk in pd.read_sql_query(sql, conn, params=params, chunksize=chunksize):
+                yield chunk
+        finally:
+            conn.close()
+    
+    def delta_is_complete(self, since: Optional[str]) -> bool:
+        """
+        Whether a delta export from since still sees every delete.
+        
+        Returns False when change log entries after since have been
+        compacted away; the consumer should take a full export instead.
+        """
+        if since is None or self.get_change_log_floor() == 0:
+            return True
+        conn = self.get_read_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT MIN(changed_at) FROM change_log")
+        oldest = cursor.fetchone()[0]
+        conn.close()
+        return oldest is not None and oldest < since
+    
+    def get_delta_watermark(self, consumer: str, table: str) -> Optional[str]:
+        """Get the until of a consumer's last synced delta export of a table."""
+        return self.get_sync_state(f"delta_watermark:{consumer}:{table}")
+    
+    def set_delta_watermark(self, consumer: str, table: str, watermark: str):
+        """Record that a consumer has synced a table's changes up to watermark."""
+        self.set_sync_state(f"delta_watermark:{consumer}:{table}", watermark)
     
     # ANALYTICS OPERATIONS
     
     def get_dashboard_stats(self) -> Dict:
         """Get summary statistics for dashboard."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         cursor = conn.cursor()
         
         stats = {}
@@ -367,7 +1211,7 @@ class Database:
     
     def get_vendor_status_distribution(self) -> pd.DataFrame:
         """Get vendor status distribution."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         query = "SELECT status, COUNT(*) as count FROM vendors GROUP BY status"
         df = pd.read_sql_query(query, conn)
         conn.close()
@@ -375,7 +1219,7 @@ class Database:
     
     def get_contract_status_distribution(self) -> pd.DataFrame:
         """Get contract status distribution."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         query = "SELECT status, COUNT(*) as count FROM contracts GROUP BY status"
         df = pd.read_sql_query(query, conn)
         conn.close()
@@ -383,7 +1227,7 @@ class Database:
     
     def get_project_status_distribution(self) -> pd.DataFrame:
         """Get project status distribution."""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         query = "SELECT status, COUNT(*) as count FROM projects GROUP BY status"
         df = pd.read_sql_query(query, conn)
         conn.close()
@@ -0,0 +1,97 @@
+"""
+Shared dimension indexes for the dashboard pages.
+
+Pages used to merge vendors_df[['vendor_id', 'vendor_name']] into each
+child table on every rerun, and to look single vendors up with boolean
+masks over the whole vendor table. VendorDimension is built once per
+vendor-table version and answers both: a hash index from vendor_id to row
+position for single lookups, and vectorized gathers from precomputed
+name/type arrays for whole columns.
+"""
+
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+class VendorDimension:
+    """Vendor lookup index built from the vendors table."""
+    
+    def __init__(self, vendors_df: pd.DataFrame):
+        """
+        Build the index.
+        
+        Args:
+            vendors_df: Vendors table with vendor_id, vendor_name and vendor_type
+        """
+        vendor_ids = vendors_df['vendor_id'].astype(object)
+        first = ~vendor_ids.duplicated().to_numpy()
+        
+        # Unique vendor IDs and the table row each one refers to
+        self.index = pd.Index(vendor_ids[first])
+        self._rows = np.flatnonzero(first)
+        self.positions = dict(zip(self.index, self._rows.tolist()))
+        self.names = vendors_df['vendor_name'].to_numpy(dtype=object)
+        self.types = vendors_df['vendor_type'].to_numpy(dtype=object)
+        
+        # Factorized copies for building categorical columns by code
+        self._name_codes, self._name_categories = pd.factorize(self.names)
+        self._type_codes, self._type_categories = pd.factorize(self.types)
+    
+    def __len__(self) -> int:
+        """Number of distinct vendors."""
+        return len(self.index)
+    
+    def position(self, vendor_id) -> Optional[int]:
+        """Row position of a vendor, or None if unknown."""
+        return self.positions.get(vendor_id)
+    
+    def name(self, vendor_id) -> Optional[str]:
+        """Name of a vendor, or None if unknown."""
+        position = self.positions.get(vendor_id)
+        return None if position is None else self.names[position]
+    
+    def vendor_type(self, vendor_id) -> Optional[str]:
+        """Type of a vendor, or None if unknown."""
+        position = self.positions.get(vendor_id)
+        return None if position is None else self.types[position]
+    
+    def positions_for(self, vendor_ids: pd.Series) -> np.ndarray:
+        """
+        Row positions for a column of vendor IDs (-1 where unknown).
+        
+        Categorical columns are resolved per category and then gathered by
+        code, so the hash lookups scale with the number of vendors rather
+        than the number of rows.
+        """
+        if isinstance(vendor_ids.dtype, pd.CategoricalDtype):
+            category_positions = self._rows_for(vendor_ids.cat.categories.astype(object))
+            codes = vendor_ids.cat.codes.to_numpy()
+            return np.where(codes >= 0, category_positions[codes], -1)
+        return self._rows_for(vendor_ids.astype(object))
+    
+    def _rows_for(self, vendor_ids) -> np.ndarray:
+        """Map vendor IDs to table rows through the unique index."""
+        found = self.index.get_indexer(vendor_ids)
+        return np.where(found >= 0, self._rows[np.maximum(found, 0)] if len(self._rows) else -1, -1)
+    
+    def _gather(self, codes: np.ndarray, categories: pd.Index, vendor_ids: pd.Series) -> pd.Categorical:
+        """Gather a vendor attribute for a column of vendor IDs (NaN where unknown)."""
+        positions = self.positions_for(vendor_ids)
+        if len(codes):
+            gathered = np.where(positions >= 0, codes[np.maximum(positions, 0)], -1)
+        else:
+            gathered = np.full(len(positions), -1)
+        return pd.Categorical.from_codes(gathered, categories=categories)
+    
+    def names_for(self, vendor_ids: pd.Series) -> pd.Categorical:
+        """Vendor names for a column of vendor IDs."""
+        return self._gather(self._name_codes, self._name_categories, vendor_ids)
+    
+    def types_for(self, vendor_ids: pd.Series) -> pd.Categorical:
+        """Vendor types for a column of vendor IDs."""
+        return self._gather(self._type_codes, self._type_categories, vendor_ids)
+    
+    def join_names(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return df with a vendor_name column, like a left merge on vendor_id."""
+        return df.assign(vendor_name=self.names_for(df['vendor_id']))
@@ -0,0 +1,173 @@
+"""
+Incremental Google Drive -> database sync.
+
+Keeps the drive_folder_id / drive_folder_link / drive_folder_name values on
+vendors and projects in step with Drive: renamed folders update the stored
+name, and trashed or deleted folders clear the row's folder. Rather than
+scanning folders, the engine reads the Drive changes feed (changes.list)
+from a start page token persisted in the database, so each run only
+processes what changed since the previous one.
+
+The dashboard records each folder it creates on its vendor or project row.
+Run the engine on a schedule with python drive_sync.py --interval 300;
+fake_drive.FakeDriveServer stands in for Drive offline.
+"""
+
+import threading
+from typing import Optional, Dict, List, Tuple
+from googleapiclient.errors import HttpError
+
+from database import Database
+from google_drive import GoogleDriveManager, get_drive_manager
+
+
+# sync_state key holding the next changes.list page token
+START_PAGE_TOKEN_KEY = 'drive_changes_page_token'
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+CHANGE_FIELDS = ('nextPageToken, newStartPageToken, '
+                 'changes(fileId, removed, file(id, name, mimeType, trashed, webViewLink))')
+
+
+class DriveSyncEngine:
+    """Applies Drive folder changes to vendor and project rows."""
+    
+    def __init__(self, db: Database, drive_manager: Optional[GoogleDriveManager] = None,
+                 page_size: int = 100):
+        """
+        Initialize the sync engine.
+        
+        Args:
+            db: Database to reconcile
+            drive_manager: Manager used for Drive calls (defaults to the singleton)
+            page_size: Number of changes requested per page
+        """
+        self.db = db
+        self.drive_manager = drive_manager or get_drive_manager()
+        self.page_size = page_size
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.last_result = None
+    
+    @staticmethod
+    def _folder_change(change: Dict) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        Reduce a change record to (folder_id, folder_link, folder_name).
+        
+        The link and name are None when the file was removed or trashed.
+        Changes to files that are not folders are ignored.
+        """
+        file_id = change.get('fileId')
+        drive_file = change.get('file') or {}
+        if change.get('removed') or drive_file.get('trashed'):
+            return (file_id, None, None)
+        if drive_file.get('mimeType') != FOLDER_MIME_TYPE:
+            return None
+        return (file_id, drive_file.get('webViewLink'), drive_file.get('name'))
+    
+    def sync_once(self) -> Optional[Dict]:
+        """
+        Process all Drive changes since the persisted page token.
+        
+        On the first run there is no token yet; the current start page token
+        is stored and nothing is processed, since existing rows were written
+        from Drive's responses.
+        
+        Returns:
+            Dictionary with changes_seen and rows_updated, or None if failed
+        """
+        if not self.drive_manager.authenticated:
+            if not self.drive_manager.authenticate():
+                return None
+        
+        service = self.drive_manager.service
+        
+        try:
+            page_token = self.db.get_sync_state(START_PAGE_TOKEN_KEY)
+            if page_token is None:
+                response = self.drive_manager.execute(service.changes().getStartPageToken())
+                self.db.set_sync_state(START_PAGE_TOKEN_KEY, response['startPageToken'])
+                return {'changes_seen': 0, 'rows_updated': 0}
+            
+            changes_seen = 0
+            rows_updated = 0
+            
+            while page_token is not None:
+                response = self.drive_manager.execute(service.changes().list(
+                    pageToken=page_token,
+                    pageSize=self.page_size,
+                    spaces='drive',
+                    includeRemoved=True,
+                    fields=CHANGE_FIELDS
+                ))
+                
+                changes = response.get('changes', [])
+                changes_seen += len(changes)
+                
+                folder_changes: List[Tuple[str, Optional[str], Optional[str]]] = []
+                for change in changes:
+                    folder_change = self._folder_change(change)
+                    if folder_change:
+                        folder_changes.append(folder_change)
+                rows_updated += self.db.apply_drive_folder_changes(folder_changes)
+                
+                # Persist after every page so an interrupted run resumes here
+                if 'newStartPageToken' in response:
+                    self.db.set_sync_state(START_PAGE_TOKEN_KEY, response['newStartPageToken'])
+                    page_token = None
+                else:
+                    page_token = response.get('nextPageToken')
+                    if page_token:
+                        self.db.set_sync_state(START_PAGE_TOKEN_KEY, page_token)
+            
+            return {'changes_seen': changes_seen, 'rows_updated': rows_updated}
+        
+        except HttpError as error:
+            print(f"Drive sync error: {error}")
+            return None
+    
+    def start(self, interval_seconds: float = 300):
+        """Run sync_once every interval_seconds on a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        
+        def run():
+            while not self._stop_event.is_set():
+                try:
+                    self.last_result = self.sync_once()
+                except Exception as e:
+                    print(f"Drive sync error: {e}")
+                self._stop_event.wait(interval_seconds)
+        
+        self._thread = threading.Thread(target=run, name='drive-sync', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background sync thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Sync Drive folder changes into the database.")
+    parser.add_argument("--db", default="vendor_management.db", help="SQLite database path")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Seconds between runs (0 runs once and exits)")
+    args = parser.parse_args()
+    
+    engine = DriveSyncEngine(Database(args.db))
+    if args.interval > 0:
+        engine.start(args.interval)
+        try:
+            engine._thread.join()
+        except KeyboardInterrupt:
+            engine.stop()
+    else:
+        print(engine.sync_once())
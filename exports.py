@@ -0,0 +1,217 @@
+"""
+Data export helpers for the Data Management page.
+
+Tables are written chunk by chunk, so no export ever holds a full
+uncompressed CSV string in memory. Supported formats are gzip-compressed
+CSV, Parquet, Arrow IPC, and a ZIP bundle that holds every table in one of
+those formats. Parquet and Arrow need the optional pyarrow package.
+
+Parquet and Arrow files carry one schema for every chunk. A chunk's
+inferred types can be narrower than the table's (a column that is empty
+in the first chunk infers as null, an integer column with NULLs later
+reads as float), so database tables are exported with a schema built
+from their declared SQLite column types.
+"""
+
+import gzip
+import io
+import threading
+import zipfile
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet / Arrow exports are unavailable
+    pa = None
+
+
+DEFAULT_CHUNKSIZE = 50000
+
+# Export format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Arrow IPC': ('arrow', 'application/vnd.apache.arrow.file'),
+}
+
+
+def available_formats() -> list:
+    """List export formats usable with the installed packages."""
+    if pa is None:
+        return ['CSV (gzip)']
+    return list(EXPORT_FORMATS)
+
+
+def iter_frame_chunks(df: pd.DataFrame, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Yield a DataFrame in row chunks (views, not copies)."""
+    if len(df) == 0:
+        yield df
+        return
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def sqlite_schema(column_types: Dict[str, str]) -> 'pa.Schema':
+    """
+    Arrow schema for columns declared with SQLite types.
+    
+    Follows SQLite's type affinity rules: INT types become int64, REAL,
+    FLOA and DOUB types float64, and everything else (TEXT dates and
+    timestamps included) string.
+    
+    Args:
+        column_types: Column name -> declared type, in column order
+    """
+    fields = []
+    for column, declared in column_types.items():
+        declared = (declared or '').upper()
+        if 'INT' in declared:
+            arrow_type = pa.int64()
+        elif any(name in declared for name in ('REAL', 'FLOA', 'DOUB')):
+            arrow_type = pa.float64()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column, arrow_type))
+    return pa.schema(fields)
+
+
+def write_csv(chunks: Iterable[pd.DataFrame], out):
+    """Write chunks as UTF-8 CSV to a binary file object."""
+    text = io.TextIOWrapper(out, encoding='utf-8', newline='', write_through=True)
+    header = True
+    for chunk in chunks:
+        chunk.to_csv(text, index=False, header=header)
+        header = False
+    text.detach()
+
+
+def write_csv_gz(chunks: Iterable[pd.DataFrame], out, schema=None):
+    """Write chunks as gzip-compressed CSV to a binary file object (schema is unused)."""
+    with gzip.GzipFile(fileobj=out, mode='wb') as gz:
+        write_csv(chunks, gz)
+
+
+def _iter_record_batches(chunks: Iterable[pd.DataFrame],
+                         schema: Optional['pa.Schema'] = None) -> Iterator[Tuple['pa.Schema', 'pa.RecordBatch']]:
+    """
+    Convert chunks to Arrow tables sharing one schema.
+    
+    Without a schema, it is inferred from the first chunk, with columns
+    that are empty there (inferred as null) typed as string.
+    """
+    for chunk in chunks:
+        if schema is None:
+            inferred = pa.Schema.from_pandas(chunk, preserve_index=False)
+            schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                for field in inferred])
+        yield schema, pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+
+def write_parquet(chunks: Iterable[pd.DataFrame], out, schema: Optional['pa.Schema'] = None):
+    """Write chunks as Parquet, one row group per chunk."""
+    writer = None
+    for schema, table in _iter_record_batches(chunks, schema):
+        if writer is None:
+            writer = pq.ParquetWriter(out, schema, compression='zstd')
+        writer.write_table(table)
+    if writer is not None:
+        writer.close()
+
+
+def write_arrow(chunks: Iterable[pd.DataFrame], out, schema: Optional['pa.Schema'] = None):
+    """Write chunks as an Arrow IPC file, one record batch per chunk."""
+    writer = None
+    for schema, table in _iter_record_batches(chunks, schema):
+        if writer is None:
+            writer = pa.ipc.new_file(out, schema)
+        writer.write_table(table)
+    if writer is not None:
+        writer.close()
+
+
+_WRITERS = {
+    'CSV (gzip)': write_csv_gz,
+    'Parquet': write_parquet,
+    'Arrow IPC': write_arrow,
+}
+
+
+def _schema_for(column_types: Optional[Dict[str, str]]) -> Optional['pa.Schema']:
+    """Arrow schema for declared column types, if any were given and pyarrow is installed."""
+    return sqlite_schema(column_types) if column_types and pa is not None else None
+
+
+def export_table(chunks: Iterable[pd.DataFrame], export_format: str,
+                 column_types: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    Export one table in the given format and return the file contents.
+    
+    Args:
+        chunks: The table's rows, in chunks
+        export_format: One of EXPORT_FORMATS
+        column_types: Declared SQLite type per column (Database.get_column_types);
+            Parquet and Arrow use it for the schema instead of inferring one
+    """
+    out = io.BytesIO()
+    _WRITERS[export_format](chunks, out, _schema_for(column_types))
+    return out.getvalue()
+
+
+def export_bundle(tables: Dict[str, Callable[[], Iterable[pd.DataFrame]]], export_format: str,
+                  column_types: Optional[Dict[str, Dict[str, str]]] = None) -> bytes:
+    """
+    Export several tables into a single ZIP file.
+    
+    Args:
+        tables: Mapping of table name -> callable returning that table's chunks
+        export_format: Format for each table; CSV is stored uncompressed
+            inside the archive and left to the ZIP's own compression
+        column_types: Table name -> declared SQLite column types, as for
+            export_table (optional)
+    
+    Returns:
+        ZIP file contents
+    """
+    column_types = column_types or {}
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, mode='w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, get_chunks in tables.items():
+            if export_format == 'CSV (gzip)':
+                with zf.open(f"{name}.csv", mode='w') as entry:
+                    write_csv(get_chunks(), entry)
+            else:
+                extension = EXPORT_FORMATS[export_format][0]
+                with zf.open(f"{name}.{extension}", mode='w') as entry:
+                    _WRITERS[export_format](get_chunks(), entry, _schema_for(column_types.get(name)))
+    return out.getvalue()
+
+
+class ExportCache:
+    """
+    Keeps the most recent export per (name, format).
+    
+    Entries are tagged with the data version they were built from, so a
+    repeated download of unchanged data is served without re-exporting, and
+    a new version simply replaces the old entry.
+    """
+    
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get_or_build(self, name: str, export_format: str, version, build: Callable[[], bytes]) -> bytes:
+        """Return the cached export for version, building it if needed."""
+        key = (name, export_format)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == version:
+                return entry[1]
+        
+        data = build()
+        with self._lock:
+            self._entries[key] = (version, data)
+        return data
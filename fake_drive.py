@@ -0,0 +1,259 @@
+"""
+Local stand-in for the Google Drive v3 REST API.
+
+FakeDriveServer keeps a Drive in memory and serves the parts of the API
+the dashboard uses: creating folders (one at a time or in batch
+requests), renaming, trashing and deleting files, and the changes feed
+(changes.getStartPageToken and changes.list), plus an OAuth token
+endpoint for credential refreshes. Each HTTP request can be delayed by a
+fixed latency to stand in for network round trips.
+
+drive_manager() returns a GoogleDriveManager aimed at the server, so the
+Drive code paths (the shared manager, AsyncDriveClient, DriveSyncEngine)
+can be exercised offline; benchmark.py's drive group does this.
+"""
+
+import itertools
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from google.oauth2.credentials import Credentials
+
+from google_drive import GoogleDriveManager
+
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+
+class _FakeDriveHandler(BaseHTTPRequestHandler):
+    """Routes one HTTP request (or each part of a batch) to the server."""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def _handle(self):
+        self.server.begin_request()
+        try:
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+            
+            if self.path.startswith('/batch/'):
+                content_type, payload = 'multipart/mixed; boundary=batch_response', self._batch(body)
+                status = 200
+            else:
+                status, response = self.server.dispatch(self.command, self.path, body,
+                                                        self.headers.get('Authorization'))
+                content_type, payload = 'application/json', json.dumps(response).encode('utf-8')
+            
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            self.server.end_request()
+    
+    def _batch(self, body: bytes) -> bytes:
+        """Run each request of a multipart batch and build the multipart response."""
+        message = BytesParser().parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode('utf-8') + body)
+        parts = []
+        for part in message.get_payload():
+            request = part.get_payload(decode=True).decode('utf-8')
+            head, _, inner_body = request.replace('\r\n', '\n').partition('\n\n')
+            request_line, *header_lines = head.split('\n')
+            method, path, _ = request_line.split(' ', 2)
+            headers = dict(line.split(': ', 1) for line in header_lines if ': ' in line)
+            status, response = self.server.dispatch(method, path, inner_body.encode('utf-8'),
+                                                    headers.get('authorization') or headers.get('Authorization'))
+            content_id = part['Content-ID']
+            parts.append(f"--batch_response\r\n"
+                         f"Content-Type: application/http\r\n"
+                         f"Content-ID: <response-{content_id[1:-1]}>\r\n\r\n"
+                         f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\n"
+                         f"Content-Type: application/json\r\n\r\n"
+                         f"{json.dumps(response)}\r\n")
+        return ("".join(parts) + "--batch_response--\r\n").encode('utf-8')
+    
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+
+class FakeDriveServer(ThreadingHTTPServer):
+    """In-memory Drive served over HTTP on localhost."""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        """
+        Initialize the server.
+        
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency: Seconds each HTTP request is delayed before it is served
+        """
+        super().__init__((host, port), _FakeDriveHandler)
+        self.latency = latency
+        self.files: Dict[str, Dict] = {}
+        self.changes = []
+        self.stats = {'requests': 0, 'api_calls': 0, 'token_requests': 0, 'unauthorized': 0,
+                      'in_flight': 0, 'max_in_flight': 0}
+        self._ids = itertools.count(1)
+        self._tokens = {'fake-token-0'}
+        self._lock = threading.Lock()
+    
+    @property
+    def port(self) -> int:
+        """Port the server is listening on."""
+        return self.server_address[1]
+    
+    @property
+    def url(self) -> str:
+        """Root URL to use as GoogleDriveManager's api_endpoint."""
+        return f"http://{self.server_address[0]}:{self.port}"
+    
+    def begin_request(self):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['in_flight'] += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+    
+    def end_request(self):
+        with self._lock:
+            self.stats['in_flight'] -= 1
+    
+    def _record_change(self, file_id: str, removed: bool = False):
+        """Append a change to the feed. Caller must hold the lock."""
+        change = {'kind': 'drive#change', 'fileId': file_id, 'removed': removed}
+        if not removed:
+            change['file'] = dict(self.files[file_id])
+        self.changes.append(change)
+    
+    def dispatch(self, method: str, path: str, body: bytes, authorization: Optional[str]) -> Tuple[int, Dict]:
+        """Serve one API call; returns (HTTP status, JSON response)."""
+        url = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        
+        if url.path == '/token':
+            with self._lock:
+                self.stats['token_requests'] += 1
+                token = f"fake-token-{self.stats['token_requests']}"
+                self._tokens.add(token)
+            return 200, {'access_token': token, 'expires_in': 3600, 'token_type': 'Bearer'}
+        
+        with self._lock:
+            if not authorization or authorization.split(' ', 1)[-1] not in self._tokens:
+                self.stats['unauthorized'] += 1
+                return 401, {'error': {'code': 401, 'message': 'Invalid Credentials'}}
+            self.stats['api_calls'] += 1
+            
+            request = json.loads(body) if body.strip() else {}
+            segments = url.path.strip('/').split('/')
+            
+            if segments == ['files'] and method == 'POST':
+                file_id = f"fake{next(self._ids):06d}"
+                self.files[file_id] = {
+                    'id': file_id,
+                    'name': request.get('name', 'Untitled'),
+                    'mimeType': request.get('mimeType', 'application/octet-stream'),
+                    'parents': request.get('parents', []),
+                    'trashed': False,
+                    'webViewLink': f"https://drive.google.com/drive/folders/{file_id}",
+                }
+                self._record_change(file_id)
+                return 200, dict(self.files[file_id])
+            
+            if segments[0] == 'files' and len(segments) == 2:
+                file_id = segments[1]
+                if file_id not in self.files:
+                    return 404, {'error': {'code': 404, 'message': f"File not found: {file_id}"}}
+                if method == 'GET':
+                    return 200, dict(self.files[file_id])
+                if method == 'PATCH':
+                    self.files[file_id].update({key: request[key] for key in ('name', 'trashed') if key in request})
+                    self._record_change(file_id)
+                    return 200, dict(self.files[file_id])
+                if method == 'DELETE':
+                    del self.files[file_id]
+                    self._record_change(file_id, removed=True)
+                    return 204, {}
+            
+            if segments == ['changes', 'startPageToken']:
+                return 200, {'startPageToken': str(len(self.changes) + 1)}
+            
+            if segments == ['changes']:
+                start = int(query['pageToken']) - 1
+                end = start + int(query.get('pageSize', 100))
+                response = {'kind': 'drive#changeList', 'changes': self.changes[start:end]}
+                if end < len(self.changes):
+                    response['nextPageToken'] = str(end + 1)
+                else:
+                    response['newStartPageToken'] = str(len(self.changes) + 1)
+                return 200, response
+        
+        return 404, {'error': {'code': 404, 'message': f"Not found: {method} {url.path}"}}
+    
+    # Changes made "in Drive", outside the dashboard
+    
+    def rename(self, file_id: str, name: str):
+        """Rename a file, as a user would in Drive."""
+        with self._lock:
+            self.files[file_id]['name'] = name
+            self._record_change(file_id)
+    
+    def trash(self, file_id: str):
+        """Move a file to the trash."""
+        with self._lock:
+            self.files[file_id]['trashed'] = True
+            self._record_change(file_id)
+    
+    def delete(self, file_id: str):
+        """Delete a file permanently."""
+        with self._lock:
+            del self.files[file_id]
+            self._record_change(file_id, removed=True)
+    
+    def children(self, folder_id: str) -> Dict[str, str]:
+        """Name -> ID of the files directly inside a folder."""
+        with self._lock:
+            return {f['name']: f['id'] for f in self.files.values() if folder_id in f['parents']}
+    
+    def start(self):
+        """Serve on a background thread."""
+        threading.Thread(target=self.serve_forever, name='fake-drive', daemon=True).start()
+    
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+
+def drive_manager(server: FakeDriveServer, expired: bool = False, **kwargs) -> GoogleDriveManager:
+    """
+    GoogleDriveManager that talks to a FakeDriveServer.
+    
+    Args:
+        server: Running server
+        expired: Start with expired credentials, so the first request refreshes them
+        **kwargs: Passed on to GoogleDriveManager
+    
+    Returns:
+        Manager whose credentials are kept in memory only
+    """
+    creds = Credentials(
+        'fake-token-0', refresh_token='fake-refresh-token', token_uri=f"{server.url}/token",
+        client_id='fake-client', client_secret='fake-secret',
+        expiry=datetime.utcnow() + (timedelta(minutes=-10) if expired else timedelta(hours=1)))
+    return GoogleDriveManager(api_endpoint=server.url, credentials=creds, token_path=None, **kwargs)
+
@@ -2,39 +2,177 @@
 Google Drive API integration for automatic folder creation.
 """
 
+import asyncio
+import functools
+import json
 import os
 import pickle
-from typing import Optional, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Tuple
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
 
 
 # If modifying these scopes, delete the file token.pickle.
 # Using drive scope to allow access to user's existing folders
 SCOPES = ['https://www.googleapis.com/auth/drive']
 
+# Folder tree templates per entity type and the default parent folder
+FOLDER_TEMPLATES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                     'folder_templates.json')
+
+# Drive accepts at most 100 calls per batch request
+BATCH_LIMIT = 100
+
+
+class FolderTemplate:
+    """
+    A nested folder tree compiled into a creation plan.
+    
+    The plan groups folders by depth. Every folder in a level only depends
+    on folders from the level above, so a whole level can be created in a
+    single batch round trip once its parents exist.
+    """
+    
+    def __init__(self, name: str, tree: Dict):
+        """
+        Compile a template.
+        
+        Args:
+            name: Template name (e.g. 'project', 'vendor')
+            tree: Nested mapping of folder name -> subtree ({} for a leaf)
+        """
+        self.name = name
+        self.tree = tree
+        # Each level is a list of (path, folder_name, parent_path); a parent
+        # path of '' refers to the root folder created for the entity.
+        self.levels: List[List[Tuple[str, str, str]]] = []
+        
+        frontier = [('', tree)]
+        while frontier:
+            level = []
+            next_frontier = []
+            for parent_path, subtree in frontier:
+                for folder_name, children in subtree.items():
+                    path = f"{parent_path}/{folder_name}" if parent_path else folder_name
+                    level.append((path, folder_name, parent_path))
+                    if children:
+                        next_frontier.append((path, children))
+            if level:
+                self.levels.append(level)
+            frontier = next_frontier
+    
+    def folder_paths(self) -> List[str]:
+        """List every folder path in the template, level by level."""
+        return [path for level in self.levels for path, _, _ in level]
+    
+    def format_tree(self, root_name: str) -> str:
+        """Render the tree as indented text for display."""
+        lines = [f"📂 {root_name}/"]
+        
+        def walk(subtree: Dict, depth: int):
+            for folder_name, children in subtree.items():
+                lines.append(f"{'    ' * depth}📁 {folder_name}/")
+                walk(children or {}, depth + 1)
+        
+        walk(self.tree, 1)
+        return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_folder_config(path: str, mtime: float) -> Dict:
+    """Parse the template config; cached until the file changes."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_template(path: str, mtime: float, template_name: str) -> FolderTemplate:
+    """Compile a template from the config; cached until the file changes."""
+    templates = _load_folder_config(path, mtime).get('templates', {})
+    if template_name not in templates:
+        raise KeyError(f"Unknown folder template: {template_name}")
+    return FolderTemplate(template_name, templates[template_name])
+
+
+def get_folder_template(template_name: str) -> FolderTemplate:
+    """Get the compiled folder template for an entity type."""
+    path = FOLDER_TEMPLATES_FILE
+    return _compile_template(path, os.path.getmtime(path), template_name)
+
+
+def get_default_parent_folder_id() -> Optional[str]:
+    """
+    Get the Drive folder new entity folders are created in.
+    
+    The DRIVE_PARENT_FOLDER_ID environment variable takes precedence over
+    the value in folder_templates.json.
+    """
+    env_value = os.environ.get('DRIVE_PARENT_FOLDER_ID')
+    if env_value:
+        return env_value
+    path = FOLDER_TEMPLATES_FILE
+    return _load_folder_config(path, os.path.getmtime(path)).get('parent_folder_id')
+
 
 class GoogleDriveManager:
-    """Manages Google Drive folder creation and organization."""
+    """
+    Manages Google Drive folder creation and organization.
+    
+    One manager is shared by every Streamlit session thread. The httplib2
+    client underneath the Drive service is not thread-safe, so each request
+    runs on an AuthorizedHttp client checked out of a pool, while all
+    clients share a single set of credentials guarded by a lock.
+    """
     
-    def __init__(self):
-        """Initialize Google Drive manager."""
-        self.creds = None
+    def __init__(self, max_idle_clients: int = 8, api_endpoint: Optional[str] = None,
+                 credentials: Optional[Credentials] = None, token_path: Optional[str] = 'token.pickle'):
+        """
+        Initialize Google Drive manager.
+        
+        Args:
+            max_idle_clients: Number of idle HTTP clients kept for reuse
+            api_endpoint: Override for the Drive API root URL (optional)
+            credentials: Credentials to use instead of token_path / credentials.json (optional)
+            token_path: File caching the user's tokens between runs (None keeps them in memory)
+        """
+        self.creds = credentials
+        self.token_path = token_path
         self.service = None
         self.authenticated = False
+        self.max_idle_clients = max_idle_clients
+        self.api_endpoint = api_endpoint
+        
+        # Guards the credential store (self.creds and token_path)
+        self._creds_lock = threading.RLock()
+        # Guards the pool of idle AuthorizedHttp clients
+        self._pool_lock = threading.Lock()
+        self._idle_clients = []
     
     def authenticate(self) -> bool:
         """
         Authenticate with Google Drive API.
         Returns True if authentication successful, False otherwise.
         """
+        with self._creds_lock:
+            if self.authenticated:
+                return True
+            return self._authenticate_locked()
+    
+    def _authenticate_locked(self) -> bool:
+        """Run the authentication flow. Caller must hold the credential lock."""
         try:
             # The file token.pickle stores the user's access and refresh tokens
-            if os.path.exists('token.pickle'):
-                with open('token.pickle', 'rb') as token:
+            if self.creds is None and self.token_path and os.path.exists(self.token_path):
+                with open(self.token_path, 'rb') as token:
                     self.creds = pickle.load(token)
             
             # If there are no (valid) credentials available, let the user log in
@@ -51,18 +189,73 @@ class GoogleDriveManager:
                     self.creds = flow.run_local_server(port=0)
                 
                 # Save the credentials for the next run
-                with open('token.pickle', 'wb') as token:
-                    pickle.dump(self.creds, token)
+                self._save_credentials()
+            
+            # Build the service. Requests are executed on pooled clients,
+            # so the service's own http object is never used concurrently.
+            client_options = {'api_endpoint': self.api_endpoint} if self.api_endpoint else None
+            self.service = build('drive', 'v3', credentials=self.creds,
+                                 client_options=client_options, cache_discovery=False)
+            
+            # Clients built around previous credentials are no longer valid
+            with self._pool_lock:
+                self._idle_clients.clear()
             
-            # Build the service
-            self.service = build('drive', 'v3', credentials=self.creds)
             self.authenticated = True
             return True
-            
+        
         except Exception as e:
             print(f"Authentication error: {e}")
             return False
     
+    def _refresh_credentials(self):
+        """
+        Refresh the shared credentials if they have expired.
+        
+        Refreshing under the lock means only one thread talks to the token
+        endpoint; the others see valid credentials once it is released.
+        """
+        with self._creds_lock:
+            if self.creds and not self.creds.valid and self.creds.expired and self.creds.refresh_token:
+                self.creds.refresh(Request())
+                self._save_credentials()
+    
+    def _save_credentials(self):
+        """Write the credentials to token_path. Caller must hold the credential lock."""
+        if self.token_path:
+            with open(self.token_path, 'wb') as token:
+                pickle.dump(self.creds, token)
+    
+    @contextmanager
+    def _http_client(self):
+        """Check out an AuthorizedHttp client for the calling thread."""
+        self._refresh_credentials()
+        
+        with self._pool_lock:
+            http = self._idle_clients.pop() if self._idle_clients else None
+        if http is None:
+            http = AuthorizedHttp(self.creds, http=httplib2.Http())
+        
+        try:
+            yield http
+        finally:
+            with self._pool_lock:
+                if http.credentials is self.creds and len(self._idle_clients) < self.max_idle_clients:
+                    self._idle_clients.append(http)
+    
+    def execute(self, request):
+        """
+        Execute a Drive API request on a pooled HTTP client.
+        
+        Args:
+            request: Request built from self.service (e.g. files().get(...))
+        
+        Returns:
+            The decoded API response
+        """
+        with self._http_client() as http:
+            return request.execute(http=http)
+    
     def create_folder(self, folder_name: str, parent_folder_id: Optional[str] = None) -> Optional[Dict]:
         """
         Create a folder in Google Drive.
@@ -87,38 +280,99 @@ class GoogleDriveManager:
             if parent_folder_id:
                 file_metadata['parents'] = [parent_folder_id]
             
-            folder = self.service.files().create(
+            folder = self.execute(self.service.files().create(
                 body=file_metadata,
                 fields='id, webViewLink'
-            ).execute()
+            ))
             
             return {
                 'folder_id': folder.get('id'),
                 'folder_link': folder.get('webViewLink')
             }
-            
+        
         except HttpError as error:
             print(f"An error occurred: {error}")
             return None
     
+    def _new_batch(self, callback) -> BatchHttpRequest:
+        """Create a batch request aimed at the configured API endpoint."""
+        if self.api_endpoint:
+            # The service derives its batch URI from the discovery document,
+            # which ignores an api_endpoint override.
+            return BatchHttpRequest(callback=callback,
+                                    batch_uri=f"{self.api_endpoint.rstrip('/')}/batch/drive/v3")
+        return self.service.new_batch_http_request(callback=callback)
+    
+    def create_folders_batch(self, folders: List[Tuple[str, Optional[str]]]) -> List[Optional[Dict]]:
+        """
+        Create many folders using Drive batch requests.
+        
+        Args:
+            folders: List of (folder_name, parent_folder_id) pairs
+        
+        Returns:
+            List with folder_id and folder_link per input (None where failed)
+        """
+        if not self.authenticated:
+            if not self.authenticate():
+                return [None] * len(folders)
+        
+        results: List[Optional[Dict]] = [None] * len(folders)
+        
+        def callback(request_id, response, exception):
+            if exception is not None:
+                print(f"An error occurred: {exception}")
+                return
+            results[int(request_id)] = {
+                'folder_id': response.get('id'),
+                'folder_link': response.get('webViewLink')
+            }
+        
+        for start in range(0, len(folders), BATCH_LIMIT):
+            batch = self._new_batch(callback)
+            for index in range(start, min(start + BATCH_LIMIT, len(folders))):
+                folder_name, parent_folder_id = folders[index]
+                file_metadata = {
+                    'name': folder_name,
+                    'mimeType': 'application/vnd.google-apps.folder'
+                }
+                if parent_folder_id:
+                    file_metadata['parents'] = [parent_folder_id]
+                batch.add(self.service.files().create(body=file_metadata, fields='id, webViewLink'),
+                          request_id=str(index))
+            
+            try:
+                with self._http_client() as http:
+                    batch.execute(http=http)
+            except HttpError as error:
+                print(f"An error occurred: {error}")
+        
+        return results
+    
     def create_project_folder_structure(self, project_name: str, 
-                                       parent_folder_id: Optional[str] = None) -> Optional[Dict]:
+                                       parent_folder_id: Optional[str] = None,
+                                       template: str = 'project') -> Optional[Dict]:
         """
-        Create a complete folder structure for a new project.
+        Create a complete folder structure for a new project or vendor.
         
-        Structure:
+        The structure comes from the named template in folder_templates.json.
+        The default 'project' template is:
         - Project Name/
           - Contracts/
           - Deliverables/
           - Meeting Notes/
           - Documentation/
         
+        Each depth level of the tree is created in one batch round trip.
+        
         Args:
-            project_name: Name of the project
+            project_name: Name of the project (root folder name)
             parent_folder_id: ID of parent folder (optional)
+            template: Name of the folder template to use
         
         Returns:
-            Dictionary with main folder info and subfolders, or None if failed
+            Dictionary with main folder info and subfolders keyed by path,
+            or None if failed
         """
         if not self.authenticated:
             print("Not authenticated, attempting to authenticate...")
@@ -127,6 +381,8 @@ class GoogleDriveManager:
                 return None
         
         try:
+            folder_template = get_folder_template(template)
+            
             print(f"Creating main folder: {project_name}")
             print(f"Parent folder ID: {parent_folder_id}")
             
@@ -140,18 +396,23 @@ class GoogleDriveManager:
             main_folder_id = main_folder['folder_id']
             print(f"Main folder created with ID: {main_folder_id}")
             
-            # Create subfolders
-            subfolders = ['Contracts', 'Deliverables', 'Meeting Notes', 'Documentation']
+            # Create subfolders one depth level at a time
+            folder_ids = {'': main_folder_id}
             subfolder_info = {}
             
-            for subfolder_name in subfolders:
-                print(f"Creating subfolder: {subfolder_name}")
-                subfolder = self.create_folder(subfolder_name, main_folder_id)
-                if subfolder:
-                    subfolder_info[subfolder_name] = subfolder
-                    print(f"  ✓ Created {subfolder_name}")
-                else:
-                    print(f"  ✗ Failed to create {subfolder_name}")
+            for level in folder_template.levels:
+                pending = [(path, name, parent_path) for path, name, parent_path in level
+                           if parent_path in folder_ids]
+                created = self.create_folders_batch(
+                    [(name, folder_ids[parent_path]) for _, name, parent_path in pending]
+                )
+                for (path, _, _), subfolder in zip(pending, created):
+                    if subfolder:
+                        folder_ids[path] = subfolder['folder_id']
+                        subfolder_info[path] = subfolder
+                        print(f"  ✓ Created {path}")
+                    else:
+                        print(f"  ✗ Failed to create {path}")
             
             result = {
                 'main_folder_id': main_folder_id,
@@ -160,7 +421,7 @@ class GoogleDriveManager:
             }
             print(f"Folder structure created successfully")
             return result
-            
+        
         except Exception as e:
             print(f"Error creating project structure: {e}")
             import traceback
@@ -176,14 +437,140 @@ class GoogleDriveManager:
         return f"https://drive.google.com/drive/folders/{folder_id}"
 
 
+class AsyncDriveClient:
+    """
+    Asyncio front end for GoogleDriveManager.
+    
+    Each Drive call is offloaded to a worker thread, where it runs on one of
+    the manager's pooled HTTP clients, so network waits overlap. All
+    subfolders of a tree are created concurrently once the parent exists,
+    and trees for several projects can be created in parallel. At most
+    max_concurrency requests are in flight at any time.
+    """
+    
+    def __init__(self, manager: Optional[GoogleDriveManager] = None, max_concurrency: int = 8):
+        """
+        Initialize the async client.
+        
+        Args:
+            manager: Manager to issue requests through (defaults to the singleton)
+            max_concurrency: Maximum number of concurrent Drive requests
+        """
+        self.manager = manager or get_drive_manager()
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix='drive')
+        self._loop = None
+        self._semaphore = None
+    
+    def _limit(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+    
+    async def _run(self, func, *args):
+        """Run a blocking manager call in the worker pool."""
+        async with self._limit():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+    
+    async def authenticate(self) -> bool:
+        """Authenticate the underlying manager without blocking the loop."""
+        if self.manager.authenticated:
+            return True
+        return await self._run(self.manager.authenticate)
+    
+    async def create_folder(self, folder_name: str,
+                            parent_folder_id: Optional[str] = None) -> Optional[Dict]:
+        """Create a single folder. See GoogleDriveManager.create_folder."""
+        return await self._run(self.manager.create_folder, folder_name, parent_folder_id)
+    
+    async def create_project_folder_structure(self, project_name: str,
+                                              parent_folder_id: Optional[str] = None,
+                                              template: str = 'project') -> Optional[Dict]:
+        """
+        Create the project folder, then each level of subfolders concurrently.
+        
+        Returns the same dictionary as
+        GoogleDriveManager.create_project_folder_structure, or None if failed.
+        """
+        if not await self.authenticate():
+            print("Authentication failed")
+            return None
+        
+        folder_template = get_folder_template(template)
+        
+        main_folder = await self.create_folder(project_name, parent_folder_id)
+        if not main_folder:
+            print(f"Failed to create main folder: {project_name}")
+            return None
+        
+        main_folder_id = main_folder['folder_id']
+        folder_ids = {'': main_folder_id}
+        subfolder_info = {}
+        
+        for level in folder_template.levels:
+            pending = [(path, name, parent_path) for path, name, parent_path in level
+                       if parent_path in folder_ids]
+            created = await asyncio.gather(
+                *(self.create_folder(name, folder_ids[parent_path]) for _, name, parent_path in pending)
+            )
+            for (path, _, _), subfolder in zip(pending, created):
+                if subfolder:
+                    folder_ids[path] = subfolder['folder_id']
+                    subfolder_info[path] = subfolder
+                else:
+                    print(f"  ✗ Failed to create {path} in {project_name}")
+        
+        return {
+            'main_folder_id': main_folder_id,
+            'main_folder_link': main_folder['folder_link'],
+            'subfolders': subfolder_info
+        }
+    
+    async def create_project_folder_structures(self, project_names: List[str],
+                                               parent_folder_id: Optional[str] = None,
+                                               template: str = 'project') -> Dict[str, Optional[Dict]]:
+        """
+        Create folder trees for many projects in parallel.
+        
+        Args:
+            project_names: Names of the projects to create trees for
+            parent_folder_id: ID of parent folder (optional)
+            template: Name of the folder template to use
+        
+        Returns:
+            Dictionary mapping each project name to its folder info (None if failed)
+        """
+        if not await self.authenticate():
+            print("Authentication failed")
+            return {name: None for name in project_names}
+        
+        results = await asyncio.gather(
+            *(self.create_project_folder_structure(name, parent_folder_id, template)
+              for name in project_names)
+        )
+        return dict(zip(project_names, results))
+    
+    def close(self):
+        """Shut down the worker threads."""
+        self._executor.shutdown(wait=True)
+
+
 # Singleton instance
 _drive_manager = None
+_drive_manager_lock = threading.Lock()
 
 
 def get_drive_manager() -> GoogleDriveManager:
     """Get or create the GoogleDriveManager singleton instance."""
     global _drive_manager
     if _drive_manager is None:
-        _drive_manager = GoogleDriveManager()
+        with _drive_manager_lock:
+            if _drive_manager is None:
+                _drive_manager = GoogleDriveManager()
     return _drive_manager
 
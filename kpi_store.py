@@ -0,0 +1,296 @@
+"""
+Time-series snapshot store for dashboard KPIs.
+
+KPIs are recorded at most once per resolution bucket (hour or day) into a
+small SQLite table keyed by (metric, ts). The table is append-only and
+clustered on that key, so range queries, downsampling and "value as of"
+lookups for period-over-period deltas are index seeks that never touch the
+vendor, contract, project or ticket tables.
+
+Snapshots are only taken from the SQLite database
+(Database.get_dashboard_stats): by the dashboard while the database
+exists, or on a schedule by python kpi_store.py. Every value in a store
+then comes from the same data, so deltas compare like with like. Keep one
+store per database.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+import numpy as np
+import pandas as pd
+
+
+# Metrics recorded per snapshot: the ones Database.get_dashboard_stats() provides
+KPI_METRICS = [
+    'active_vendors',
+    'active_contracts',
+    'total_contract_value',
+    'green_projects',
+    'yellow_projects',
+    'red_projects',
+]
+
+# Snapshot resolution -> bucket width in seconds
+RESOLUTIONS = {'hour': 3600, 'day': 86400}
+
+# Downsampling frequency -> SQL expression for the bucket start (epoch seconds)
+FREQUENCIES = {
+    'hour': "ts - ts % 3600",
+    'day': "ts - ts % 86400",
+    'week': "ts - (ts + 259200) % 604800",  # weeks start on Monday
+    'month': "CAST(strftime('%s', ts, 'unixepoch', 'start of month') AS INTEGER)",
+}
+
+# Downsampling aggregate -> SQL expression; 'last' and 'first' rely on SQLite
+# returning the bare column from the row that matched MAX() / MIN()
+AGGREGATES = {
+    'last': "value, MAX(ts)",
+    'first': "value, MIN(ts)",
+    'mean': "AVG(value)",
+    'min': "MIN(value)",
+    'max': "MAX(value)",
+}
+
+DEFAULT_STORE_PATH = "kpi_history.db"
+
+
+def _epoch(when: Optional[datetime]) -> int:
+    """Epoch seconds for a datetime (now if None)."""
+    return int(pd.Timestamp(when if when is not None else datetime.now()).timestamp())
+
+
+def project_health(completion_pct: pd.Series) -> np.ndarray:
+    """Map project completion onto the database's Green/Yellow/Red status."""
+    return np.select([completion_pct >= 50, completion_pct >= 25], ['Green', 'Yellow'], default='Red')
+
+
+def compute_kpis(frames: Dict[str, pd.DataFrame]) -> Dict[str, float]:
+    """
+    Compute KPIs from the dashboard's in-memory tables.
+    
+    These feed the session's metric cards and are never recorded; they
+    include ticket and project counts the database does not have.
+    
+    Args:
+        frames: Mapping with 'vendors', 'contracts', 'projects' and 'tickets'
+    
+    Returns:
+        Dictionary of metric name -> value
+    """
+    vendors, contracts = frames['vendors'], frames['contracts']
+    projects, tickets = frames['projects'], frames['tickets']
+    
+    active = contracts['status'] == 'Active'
+    open_tickets = tickets['status'].isin(['Open', 'In Progress'])
+    health = pd.Series(project_health(projects['completion_pct'])).value_counts()
+    
+    return {
+        'active_vendors': int((vendors['status'] == 'Active').sum()),
+        'active_contracts': int(active.sum()),
+        'total_contract_value': float(contracts.loc[active, 'contract_value'].sum()),
+        'active_projects': int((projects['status'] == 'In Progress').sum()),
+        'open_tickets': int(open_tickets.sum()),
+        'high_priority_tickets': int((open_tickets & (tickets['priority'] == 'High')).sum()),
+        'green_projects': int(health.get('Green', 0)),
+        'yellow_projects': int(health.get('Yellow', 0)),
+        'red_projects': int(health.get('Red', 0)),
+    }
+
+
+def kpis_from_stats(stats: Dict) -> Dict[str, float]:
+    """Select the KPIs available in Database.get_dashboard_stats() output."""
+    return {metric: stats[metric] for metric in KPI_METRICS if metric in stats}
+
+
+class KPIStore:
+    """Append-only KPI snapshots with range and downsampling queries."""
+    
+    def __init__(self, db_path: str = DEFAULT_STORE_PATH, resolution: str = 'hour'):
+        """
+        Initialize the store.
+        
+        Args:
+            db_path: SQLite file holding the snapshots
+            resolution: Snapshot bucket, 'hour' or 'day'; at most one value
+                per metric is kept per bucket
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        self.db_path = db_path
+        self.resolution = resolution
+        self._last_bucket = None
+        self._lock = threading.Lock()
+        self.init_store()
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """Get a store connection."""
+        return sqlite3.connect(self.db_path)
+    
+    def init_store(self):
+        """Create the snapshot table."""
+        conn = self.get_connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS kpi_snapshots (
+                metric TEXT NOT NULL,
+                ts INTEGER NOT NULL,
+                value REAL NOT NULL,
+                PRIMARY KEY (metric, ts)
+            ) WITHOUT ROWID
+        """)
+        conn.commit()
+        conn.close()
+    
+    def bucket(self, when: Optional[datetime] = None) -> int:
+        """Start of the snapshot bucket containing when (epoch seconds)."""
+        ts = _epoch(when)
+        return ts - ts % RESOLUTIONS[self.resolution]
+    
+    def record(self, kpis: Dict[str, float], when: Optional[datetime] = None) -> bool:
+        """
+        Record a snapshot unless one exists for this bucket already.
+        
+        Args:
+            kpis: Metric name -> value
+            when: Snapshot time (defaults to now)
+        
+        Returns:
+            True if any value was written
+        """
+        bucket = self.bucket(when)
+        with self._lock:
+            if bucket == self._last_bucket:
+                return False
+            
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT OR IGNORE INTO kpi_snapshots (metric, ts, value) VALUES (?, ?, ?)",
+                [(metric, bucket, float(value)) for metric, value in kpis.items()])
+            written = cursor.rowcount
+            conn.commit()
+            conn.close()
+            
+            self._last_bucket = bucket
+        return written > 0
+    
+    def query(self, metrics: Optional[Iterable[str]] = None, start: Optional[datetime] = None,
+              end: Optional[datetime] = None, freq: Optional[str] = None,
+              agg: str = 'last') -> pd.DataFrame:
+        """
+        Read snapshots in a time range, optionally downsampled.
+        
+        Args:
+            metrics: Metrics to read (defaults to KPI_METRICS)
+            start: Inclusive range start (defaults to the beginning)
+            end: Inclusive range end (defaults to now)
+            freq: Downsample to 'hour', 'day', 'week' or 'month' buckets
+            agg: Aggregate per bucket: 'last', 'first', 'mean', 'min' or 'max'
+        
+        Returns:
+            DataFrame indexed by timestamp with one column per metric
+        """
+        metrics = list(metrics or KPI_METRICS)
+        if freq is not None and freq not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency: {freq}")
+        if agg not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {agg}")
+        
+        start_ts = _epoch(start) if start is not None else 0
+        end_ts = _epoch(end)
+        placeholders = ", ".join("?" * len(metrics))
+        where = f"metric IN ({placeholders}) AND ts BETWEEN ? AND ?"
+        params = metrics + [start_ts, end_ts]
+        
+        if freq is None:
+            sql = f"SELECT metric, ts, value FROM kpi_snapshots WHERE {where}"
+        else:
+            bucket = FREQUENCIES[freq]
+            sql = (f"SELECT metric, {bucket} AS bucket, {AGGREGATES[agg]} FROM kpi_snapshots "
+                   f"WHERE {where} GROUP BY metric, bucket")
+        
+        conn = self.get_connection()
+        rows = conn.execute(sql, params).fetchall()
+        conn.close()
+        
+        long = pd.DataFrame([row[:3] for row in rows], columns=['metric', 'ts', 'value'])
+        wide = long.pivot(index='ts', columns='metric', values='value').reindex(columns=metrics)
+        wide.index = pd.to_datetime(wide.index, unit='s')
+        wide.index.name = 'timestamp'
+        return wide.sort_index()
+    
+    def value_at(self, metrics: Optional[Iterable[str]] = None,
+                 when: Optional[datetime] = None) -> Dict[str, Optional[float]]:
+        """Latest recorded value of each metric at or before when (None if none)."""
+        when_ts = _epoch(when)
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        values = {}
+        for metric in metrics or KPI_METRICS:
+            cursor.execute("""
+                SELECT value FROM kpi_snapshots WHERE metric = ? AND ts <= ?
+                ORDER BY ts DESC LIMIT 1
+            """, (metric, when_ts))
+            row = cursor.fetchone()
+            values[metric] = row[0] if row else None
+        conn.close()
+        return values
+    
+    def deltas(self, current: Dict[str, float], since: datetime) -> Dict[str, Optional[float]]:
+        """
+        Change of each metric compared with its recorded value at a past time.
+        
+        Args:
+            current: Current metric name -> value
+            since: Time to compare against
+        
+        Returns:
+            Metric name -> current minus past value (None without history)
+        """
+        previous = self.value_at(current.keys(), since)
+        return {metric: None if previous[metric] is None else value - previous[metric]
+                for metric, value in current.items()}
+
+
+# Singleton instance
+_kpi_store = None
+_kpi_store_lock = threading.Lock()
+
+
+def get_kpi_store() -> KPIStore:
+    """Get or create the KPIStore singleton (path from KPI_HISTORY_DB)."""
+    global _kpi_store
+    if _kpi_store is None:
+        with _kpi_store_lock:
+            if _kpi_store is None:
+                _kpi_store = KPIStore(os.environ.get('KPI_HISTORY_DB', DEFAULT_STORE_PATH))
+    return _kpi_store
+
+
+if __name__ == "__main__":
+    import argparse
+    from database import Database
+    
+    parser = argparse.ArgumentParser(description="Record database KPIs into the snapshot store.")
+    parser.add_argument("--db", default="vendor_management.db", help="SQLite database path")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="KPI snapshot store path")
+    parser.add_argument("--resolution", choices=list(RESOLUTIONS), default='hour',
+                        help="Snapshot bucket")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Seconds between snapshots (0 records once and exits)")
+    args = parser.parse_args()
+    
+    db = Database(args.db)
+    store = KPIStore(args.store, args.resolution)
+    while True:
+        recorded = store.record(kpis_from_stats(db.get_dashboard_stats()))
+        print(f"{datetime.now():%Y-%m-%d %H:%M:%S} snapshot {'recorded' if recorded else 'already recorded'}")
+        if args.interval <= 0:
+            break
+        try:
+            time.sleep(args.interval)
+        except KeyboardInterrupt:
+            break
@@ -0,0 +1,466 @@
+"""
+Concurrent-session load harness for the dashboard.
+
+Simulates N users, each with their own Streamlit session (driven through
+AppTest), walking through every page in app.py's navigation. On each page
+they change filters, submit forms and click actions, with think time
+between interactions. It reports rerun latency percentiles (overall and
+per page), memory per session and throughput.
+
+AppTest swaps module-level Streamlit state on every run, so reruns within
+one process are serialized through a lock. This matches a single server
+process, where reruns share one interpreter (and its GIL): a rerun's
+latency is the time it waited for the lock plus the time it ran, and
+queueing shows up as wait time once sessions outnumber what the process
+can serve. Use --processes to spread sessions over several processes, as
+in a multi-process deployment.
+
+Usage:
+    python load_test.py --sessions 8 --cycles 2
+    python load_test.py --sessions 16 --processes 4 --scale 10k --output load.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from database import Database
+from shared_cache import SharedCache, database_derived
+from synthetic_data import SCALES, generate_dataset
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# Session tables the app keeps in st.session_state
+DATA_TABLES = ['vendors', 'contracts', 'projects', 'tickets']
+
+# Reported latency percentiles
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident memory of this process (None if it cannot be read)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # peak, in KB on Linux
+    except ImportError:
+        return None
+
+
+def _find(widgets, label: str):
+    """First widget with the given label, or None."""
+    return next((widget for widget in widgets if widget.label == label), None)
+
+
+# Page interactions: each takes (AppTest, random.Random), sets up one
+# interaction and returns False if the widget is not on the page
+
+def choose(kind: str, label: str, values: Optional[List] = None) -> Callable:
+    """
+    Pick a random option of a radio or selectbox.
+    
+    AppTest only exposes formatted options, so widgets with a format_func
+    need their underlying values passed in.
+    """
+    def action(at, rng):
+        widget = _find(getattr(at, kind), label)
+        if widget is None:
+            return False
+        widget.set_value(rng.choice(values or widget.options))
+        return True
+    action.__name__ = f"choose {label}"
+    return action
+
+
+def choose_many(label: str) -> Callable:
+    """Pick a random subset of a multiselect's options."""
+    def action(at, rng):
+        widget = _find(at.multiselect, label)
+        if widget is None:
+            return False
+        widget.set_value(rng.sample(widget.options, rng.randint(1, len(widget.options))))
+        return True
+    action.__name__ = f"filter {label}"
+    return action
+
+
+def type_text(label: str, texts: List[str]) -> Callable:
+    """Type one of the given texts into a text input."""
+    def action(at, rng):
+        widget = _find(at.text_input, label)
+        if widget is None:
+            return False
+        widget.input(rng.choice(texts))
+        return True
+    action.__name__ = f"type {label}"
+    return action
+
+
+def slide(label: str, low: int, high: int) -> Callable:
+    """Move a slider to a random value."""
+    def action(at, rng):
+        widget = _find(at.slider, label)
+        if widget is None:
+            return False
+        widget.set_value(rng.randint(low, high))
+        return True
+    action.__name__ = f"slide {label}"
+    return action
+
+
+def submit_vendor(at, rng) -> bool:
+    """Fill in and submit the add-vendor form."""
+    name = _find(at.text_input, "Vendor Name *")
+    submit = _find(at.button, "Add Vendor")
+    if name is None or submit is None:
+        return False
+    name.input(f"Load Test Vendor {rng.randint(1, 10 ** 6)}")
+    submit.click()
+    return True
+
+
+def click_random(key_prefix: str) -> Callable:
+    """Click a random button whose key starts with key_prefix."""
+    def action(at, rng):
+        buttons = [button for button in at.button if (button.key or '').startswith(key_prefix)]
+        if not buttons:
+            return False
+        rng.choice(buttons).click()
+        return True
+    action.__name__ = f"click {key_prefix}*"
+    return action
+
+
+# Interactions performed on each page after navigating to it
+SCENARIOS = {
+    "Dashboard Overview": [
+        choose('radio', "Compare with"),
+        choose('selectbox', "Range", [7, 30, 90, 365]),
+    ],
+    "Vendor Directory": [
+        type_text("🔍 Search vendors", ["a", "data", "solutions", "pro", ""]),
+        choose_many("Filter by Status"),
+        submit_vendor,
+    ],
+    "Contract Tracker": [
+        slide("Days to Expiry", 0, 365),
+        choose_many("Contract Status"),
+    ],
+    "Project Coordination": [
+        choose_many("Project Status"),
+    ],
+    "Ticket System": [
+        choose('selectbox', "Date Range"),
+        choose_many("Priority"),
+        click_random("resolve_"),
+    ],
+    "Spend Analytics": [
+        choose('radio', "Measure"),
+        choose_many("Status"),
+        choose('selectbox', "Vendor Type"),
+    ],
+    "Data Management": [
+        choose('radio', "Format"),
+        choose('selectbox', "Select Data Type"),
+    ],
+}
+
+
+class SimulatedSession:
+    """One simulated user with their own Streamlit session."""
+    
+    def __init__(self, session_id: int, seed: int, think_time: float, timeout: float,
+                 dataset: Optional[Dict[str, pd.DataFrame]] = None):
+        """
+        Initialize the session.
+        
+        Args:
+            session_id: Session number, used in records and the random seed
+            seed: Base random seed
+            think_time: Mean pause between interactions (seconds)
+            timeout: Seconds allowed per rerun
+            dataset: Tables to load into the session instead of the sample data
+        """
+        from streamlit.testing.v1 import AppTest
+        
+        self.session_id = session_id
+        self.think_time = think_time
+        self.rng = random.Random(seed * 1000 + session_id)
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        if dataset is not None:
+            for table, df in dataset.items():
+                self.at.session_state[table] = df.copy()
+        self.records = []
+    
+    def rerun(self, lock: threading.Lock, page: str, action: str):
+        """Run the app once, recording queue wait and run time."""
+        requested = time.perf_counter()
+        with lock:
+            started = time.perf_counter()
+            error = None
+            try:
+                self.at.run()
+                if self.at.exception:
+                    error = self.at.exception[0].message
+            except Exception as e:
+                error = repr(e)
+            finished = time.perf_counter()
+        self.records.append({
+            'session': self.session_id,
+            'page': page,
+            'action': action,
+            'wait': started - requested,
+            'run': finished - started,
+            'latency': finished - requested,
+            'error': error,
+        })
+    
+    def think(self):
+        if self.think_time > 0:
+            time.sleep(self.rng.expovariate(1 / self.think_time))
+    
+    def walk(self, lock: threading.Lock, cycles: int):
+        """Visit every page cycles times, interacting with each."""
+        for _ in range(cycles):
+            for page, actions in SCENARIOS.items():
+                navigation = _find(self.at.sidebar.radio, "Navigation")
+                if navigation is None:
+                    return
+                navigation.set_value(page)
+                self.rerun(lock, page, "navigate")
+                for action in actions:
+                    self.think()
+                    if action(self.at, self.rng):
+                        self.rerun(lock, page, action.__name__)
+                self.think()
+    
+    def table_bytes(self) -> int:
+        """Memory held by this session's tables."""
+        return int(sum(self.at.session_state[table].memory_usage(deep=True).sum()
+                       for table in DATA_TABLES if table in self.at.session_state))
+
+
+def run_sessions(session_ids: List[int], cycles: int, think_time: float, seed: int,
+                 timeout: float, dataset: Optional[Dict[str, pd.DataFrame]] = None) -> Dict:
+    """
+    Run simulated sessions concurrently in this process.
+    
+    Args:
+        session_ids: Session numbers to simulate
+        cycles: Times each session walks through every page
+        think_time: Mean pause between interactions (seconds)
+        seed: Random seed
+        timeout: Seconds allowed per rerun
+        dataset: Tables each session starts with (None for the sample data)
+    
+    Returns:
+        Dictionary with records, wall time and memory measurements
+    """
+    lock = threading.Lock()
+    
+    # Load modules and process-wide caches first so they are not counted per session
+    SimulatedSession(-1, seed, 0, timeout, dataset).rerun(lock, "Dashboard Overview", "warm-up")
+    rss_before = _rss_bytes()
+    sessions = [SimulatedSession(session_id, seed, think_time, timeout, dataset) for session_id in session_ids]
+    for session in sessions:
+        session.rerun(lock, "Dashboard Overview", "open")
+    rss_open = _rss_bytes()
+    
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session.walk, args=(lock, cycles)) for session in sessions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    
+    return {
+        'records': [record for session in sessions for record in session.records],
+        'wall_seconds': wall,
+        'sessions': len(sessions),
+        'rss_before': rss_before,
+        'rss_open': rss_open,
+        'rss_after': _rss_bytes(),
+        'table_bytes': [session.table_bytes() for session in sessions],
+    }
+
+
+def _worker(args) -> Dict:
+    return run_sessions(*args)
+
+
+def shared_cache_worker(args) -> Dict:
+    """
+    Read the derived contracts frame and dashboard stats repeatedly, as one app process would.
+    
+    Used by benchmark.py's shared_cache group. Spawned processes import it
+    from this module, since AppTest may have replaced __main__ by then.
+    
+    Args:
+        args: (database path, cache directory or None to query the database directly, requests)
+    
+    Returns:
+        Dictionary with per-request timings and the number of builds
+    """
+    db_path, cache_dir, requests = args
+    db = Database(db_path)
+    cache = SharedCache(cache_dir) if cache_dir else None
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        if cache is None:
+            db.get_contracts()
+            db.get_dashboard_stats()
+        else:
+            database_derived(db, 'contracts', ('contracts', 'vendors'), db.get_contracts, cache)
+            database_derived(db, 'dashboard_stats', Database.TABLES, db.get_dashboard_stats, cache)
+        timings.append(time.perf_counter() - start)
+    return {'timings': timings, 'builds': cache.stats['builds'] if cache else requests * 2}
+
+
+def _percentiles(values) -> Dict[str, float]:
+    """Min, PERCENTILES and max of a series of seconds."""
+    if not len(values):
+        return {}
+    return {'min': float(values.min()), **{f"p{p}": float(np.percentile(values, p)) for p in PERCENTILES},
+            'max': float(values.max())}
+
+
+def summarize(runs: List[Dict]) -> Dict:
+    """Combine per-process runs into latency, memory and throughput figures."""
+    records = pd.DataFrame([record for run in runs for record in run['records']])
+    timed = records[records['action'] != 'open']
+    wall = max(run['wall_seconds'] for run in runs)
+    sessions = sum(run['sessions'] for run in runs)
+    
+    measured = [run for run in runs if None not in (run['rss_before'], run['rss_open'], run['rss_after'])]
+    measured_sessions = sum(run['sessions'] for run in measured)
+    per_page = {page: {**_percentiles(group['latency']), 'reruns': len(group),
+                       'mean_run': float(group['run'].mean())}
+                for page, group in timed.groupby('page', sort=False)}
+    
+    return {
+        'sessions': sessions,
+        'processes': len(runs),
+        'reruns': len(timed),
+        'errors': int(records['error'].notna().sum()),
+        'error_samples': records.loc[records['error'].notna(), 'error'].head(5).tolist(),
+        'wall_seconds': wall,
+        'reruns_per_second': len(timed) / wall if wall else None,
+        'latency': _percentiles(timed['latency']),
+        'wait': _percentiles(timed['wait']),
+        'run': _percentiles(timed['run']),
+        'pages': per_page,
+        'memory': {
+            # Memory taken by opening the sessions, and growth while they ran
+            'rss_per_session': (sum(run['rss_open'] - run['rss_before'] for run in measured) / measured_sessions
+                                if measured else None),
+            'rss_growth_per_session': (sum(run['rss_after'] - run['rss_open'] for run in measured) / measured_sessions
+                                       if measured else None),
+            'table_bytes_per_session': float(np.mean([b for run in runs for b in run['table_bytes']])),
+        },
+    }
+
+
+def run_load_test(sessions: int, cycles: int = 1, processes: int = 1, think_time: float = 0.2,
+                  seed: int = 42, timeout: float = 600,
+                  dataset: Optional[Dict[str, pd.DataFrame]] = None) -> Dict:
+    """
+    Run the load test and summarize it.
+    
+    Args:
+        sessions: Simulated concurrent sessions in total
+        cycles: Times each session walks through every page
+        processes: Worker processes to spread sessions over (1 runs in this process)
+        think_time: Mean pause between interactions (seconds)
+        seed: Random seed
+        timeout: Seconds allowed per rerun
+        dataset: Tables each session starts with (None for the sample data)
+    
+    Returns:
+        Summary from summarize()
+    """
+    groups = [list(range(sessions))[index::processes] for index in range(processes)]
+    jobs = [(group, cycles, think_time, seed, timeout, dataset) for group in groups if group]
+    if len(jobs) == 1:
+        runs = [_worker(jobs[0])]
+    else:
+        with multiprocessing.get_context('spawn').Pool(len(jobs)) as pool:
+            runs = pool.map(_worker, jobs)
+    return summarize(runs)
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+
+def _mb(size: Optional[float]) -> str:
+    return "-" if size is None else f"{size / 1024 ** 2:.1f} MB"
+
+
+def print_report(summary: Dict):
+    """Print a load test summary."""
+    print(f"Sessions: {summary['sessions']} in {summary['processes']} process(es)")
+    print(f"Reruns: {summary['reruns']} in {summary['wall_seconds']:.1f}s "
+          f"({summary['reruns_per_second']:.1f} reruns/s), {summary['errors']} errors")
+    for sample in summary['error_samples']:
+        print(f"  error: {sample}")
+    for name in ('latency', 'wait', 'run'):
+        values = "  ".join(f"{key} {_ms(value)}" for key, value in summary[name].items())
+        print(f"{name.title():<8} (ms): {values}")
+    
+    print(f"\n{'Page':<24}{'reruns':>8}{'p50 ms':>9}{'p95 ms':>9}{'run ms':>9}")
+    for page, stats in summary['pages'].items():
+        print(f"{page:<24}{stats['reruns']:>8}{_ms(stats.get('p50')):>9}{_ms(stats.get('p95')):>9}"
+              f"{_ms(stats['mean_run']):>9}")
+    
+    memory = summary['memory']
+    print(f"\nMemory per session: {_mb(memory['rss_per_session'])} RSS after opening, "
+          f"{_mb(memory['rss_growth_per_session'])} growth during the run, "
+          f"{_mb(memory['table_bytes_per_session'])} in session tables")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the load harness from the command line."""
+    parser = argparse.ArgumentParser(description="Load-test the dashboard with concurrent sessions.")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent simulated sessions")
+    parser.add_argument("--cycles", type=int, default=1, help="Walks through all pages per session")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to spread sessions over")
+    parser.add_argument("--think-time", type=float, default=0.2, help="Mean seconds between interactions")
+    parser.add_argument("--scale", help=f"Synthetic data per session: {', '.join(SCALES)} or a ticket count "
+                                        "(default: the app's sample data)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds allowed per rerun")
+    parser.add_argument("--output", help="Write the summary as JSON to this file")
+    args = parser.parse_args(argv)
+    
+    dataset = None
+    if args.scale:
+        rows = SCALES.get(args.scale.lower()) or int(args.scale)
+        print(f"Generating {rows:,} rows (seed {args.seed})...")
+        dataset = generate_dataset(rows, seed=args.seed)
+    summary = run_load_test(args.sessions, args.cycles, args.processes, args.think_time,
+                            args.seed, args.timeout, dataset)
+    print_report(summary)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"Summary written to {args.output}")
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
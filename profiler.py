@@ -0,0 +1,269 @@
+"""
+Opt-in render profiler for the dashboard pages.
+
+Enabled per session with the ?profile=1 query parameter, or for every
+session with DASHBOARD_PROFILE=1 (use "timings" instead of 1 to skip
+cProfile and its overhead). A profiled rerun records:
+
+- wall time per section: the page is split at each st.header/st.subheader,
+  so sections need no instrumentation in the page code;
+- the size of every message sent to the browser, per section, and the time
+  and payload size of each st.plotly_chart and st.dataframe call;
+- a cProfile of the rerun, summarized as self time per package (pandas,
+  plotly, streamlit, ...) and the functions with the most cumulative time.
+
+Payload sizes are measured on the serialized messages themselves by
+wrapping the session's message queue for the duration of the rerun. Each
+rerun is appended as one JSON line to the profile log (DASHBOARD_PROFILE_LOG,
+default profile_log.jsonl) for offline comparison.
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+PROFILE_ENV = 'DASHBOARD_PROFILE'
+PROFILE_QUERY_PARAM = 'profile'
+PROFILE_LOG_ENV = 'DASHBOARD_PROFILE_LOG'
+DEFAULT_LOG_PATH = 'profile_log.jsonl'
+
+# Heading levels that start a new section (st.header, st.subheader)
+SECTION_TAGS = ('h2', 'h3')
+
+# Element calls timed individually
+TIMED_ELEMENTS = ('plotly_chart', 'dataframe')
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Profiler of the rerun running on this thread (scripts run one thread per session)
+_active = threading.local()
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+def profile_mode(query_params) -> Optional[str]:
+    """
+    Profiling mode requested for this rerun.
+    
+    Args:
+        query_params: st.query_params
+    
+    Returns:
+        'full' (timings and cProfile), 'timings', or None when disabled
+    """
+    value = query_params.get(PROFILE_QUERY_PARAM) or os.environ.get(PROFILE_ENV, '')
+    value = value.strip().lower()
+    if value in ('', '0', 'false', 'off'):
+        return None
+    return 'timings' if value == 'timings' else 'full'
+
+
+def active_profiler() -> Optional['RenderProfiler']:
+    """Profiler of the rerun on the current thread, if any."""
+    return getattr(_active, 'profiler', None)
+
+
+def _package(filename: str) -> str:
+    """Package a profiled function belongs to, for the self-time breakdown."""
+    if filename.startswith('~') or filename.startswith('<'):
+        return 'builtins'
+    if os.path.dirname(os.path.abspath(filename)) == _APP_DIR:
+        return os.path.splitext(os.path.basename(filename))[0]
+    path = filename.replace('\\', '/')
+    for marker in ('/site-packages/', '/dist-packages/'):
+        if marker in path:
+            return os.path.splitext(path.split(marker, 1)[1].split('/')[0])[0]
+    return 'stdlib'
+
+
+def _timed_element(name: str, method):
+    """Wrap an element method so profiled reruns record its time and payload."""
+    def wrapper(*args, **kwargs):
+        profiler = active_profiler()
+        if profiler is None:
+            return method(*args, **kwargs)
+        return profiler.time_element(name, method, *args, **kwargs)
+    wrapper.__wrapped__ = method
+    wrapper.__name__ = getattr(method, '__name__', name)
+    wrapper.__doc__ = getattr(method, '__doc__', None)
+    return wrapper
+
+
+def install_element_hooks():
+    """
+    Wrap st.plotly_chart and st.dataframe (and their container methods).
+    
+    The wrappers only do extra work on threads with an active profiler, so
+    installing them once per process is safe for unprofiled sessions.
+    """
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        for name in TIMED_ELEMENTS:
+            setattr(DeltaGenerator, name, _timed_element(name, getattr(DeltaGenerator, name)))
+            setattr(st, name, _timed_element(name, getattr(st, name)))
+        _hooks_installed = True
+
+
+class RenderProfiler:
+    """Section timings, payload sizes and cProfile stats for one rerun."""
+    
+    def __init__(self, use_cprofile: bool = True):
+        """
+        Initialize the profiler.
+        
+        Args:
+            use_cprofile: Also run cProfile (adds noticeable overhead)
+        """
+        self.page = None
+        self.sections = []
+        self.elements = []
+        self.total_seconds = None
+        self._section = None
+        self._section_start = None
+        self._message_bytes = 0
+        self._message_count = 0
+        self._ctx = None
+        self._enqueue = None
+        self._start = None
+        self._profile = cProfile.Profile() if use_cprofile else None
+    
+    def start(self, section: str = 'Setup'):
+        """Start profiling the current rerun."""
+        install_element_hooks()
+        self._ctx = get_script_run_ctx()
+        if self._ctx is not None:
+            self._enqueue = self._ctx._enqueue
+            self._ctx._enqueue = self._on_message
+        _active.profiler = self
+        self._start = time.perf_counter()
+        self.begin_section(section)
+        if self._profile is not None:
+            try:
+                self._profile.enable()
+            except ValueError:  # another profiler is already active
+                self._profile = None
+    
+    def stop(self):
+        """Stop profiling and restore the message queue."""
+        if self._profile is not None:
+            self._profile.disable()
+        if self._start is None:
+            return
+        self._close_section()
+        self.total_seconds = time.perf_counter() - self._start
+        if self._ctx is not None:
+            self._ctx._enqueue = self._enqueue
+        _active.profiler = None
+        self._start = None
+    
+    def begin_section(self, name: str):
+        """End the current section and start a new one."""
+        self._close_section()
+        if self.page and not name.startswith(self.page):
+            name = f"{self.page} › {name}"
+        self._section = {'name': name, 'seconds': 0.0, 'messages': 0, 'bytes': 0}
+        self._section_start = time.perf_counter()
+    
+    def set_page(self, page: str):
+        """Start the page's first section; later headings are prefixed with the page."""
+        self.page = page
+        self.begin_section(page)
+    
+    def _close_section(self):
+        if self._section is not None:
+            self._section['seconds'] = time.perf_counter() - self._section_start
+            self.sections.append(self._section)
+            self._section = None
+    
+    def _on_message(self, msg):
+        """Measure a message on its way to the browser."""
+        if msg.WhichOneof('type') == 'delta' and msg.delta.WhichOneof('type') == 'new_element':
+            element = msg.delta.new_element
+            if element.WhichOneof('type') == 'heading' and element.heading.tag in SECTION_TAGS:
+                self.begin_section(element.heading.body.strip())
+        size = msg.ByteSize()
+        self._message_bytes += size
+        self._message_count += 1
+        if self._section is not None:
+            self._section['bytes'] += size
+            self._section['messages'] += 1
+        self._enqueue(msg)
+    
+    def time_element(self, name: str, method, *args, **kwargs):
+        """Call an element method, recording its time and the bytes it sent."""
+        bytes_before = self._message_bytes
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self.elements.append({
+                'element': name,
+                'section': self._section['name'] if self._section else None,
+                'seconds': time.perf_counter() - start,
+                'bytes': self._message_bytes - bytes_before,
+            })
+    
+    def package_breakdown(self) -> Dict[str, float]:
+        """Self time in seconds per package, largest first (empty without cProfile)."""
+        if self._profile is None:
+            return {}
+        totals = {}
+        for (filename, _, _), (_, _, self_time, _, _) in pstats.Stats(self._profile).stats.items():
+            package = _package(filename)
+            totals[package] = totals.get(package, 0.0) + self_time
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+    
+    def top_functions(self, limit: int = 15) -> List[Dict]:
+        """Functions with the most cumulative time (empty without cProfile)."""
+        if self._profile is None:
+            return []
+        rows = []
+        for (filename, line, function), (_, calls, self_time, cumulative, _) in pstats.Stats(self._profile).stats.items():
+            if function == 'wrapper' and filename == __file__:
+                continue
+            rows.append({
+                'function': f"{os.path.basename(filename)}:{line}({function})" if line else function,
+                'package': _package(filename),
+                'calls': calls,
+                'self_seconds': self_time,
+                'cumulative_seconds': cumulative,
+            })
+        rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+        return rows[:limit]
+    
+    def summary(self) -> Dict:
+        """Everything recorded for the rerun, as plain data."""
+        return {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'page': self.page,
+            'total_seconds': self.total_seconds,
+            'messages': self._message_count,
+            'bytes': self._message_bytes,
+            'sections': self.sections,
+            'elements': self.elements,
+            'packages': self.package_breakdown(),
+            'top_functions': self.top_functions(),
+        }
+    
+    def write_log(self, path: Optional[str] = None) -> Dict:
+        """Append the rerun's summary to the profile log and return it."""
+        path = path or os.environ.get(PROFILE_LOG_ENV, DEFAULT_LOG_PATH)
+        summary = self.summary()
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(summary) + "\n")
+        except OSError as e:
+            print(f"Profile log error: {e}")
+        return summary
@@ -0,0 +1,283 @@
+"""
+Columnar read model of the database.
+
+ReadModel snapshots the database's tables, with vendor names joined in,
+to Arrow IPC files (and optionally Parquet, for other tools) whenever
+the tables they read change. Readers memory-map the Arrow file and hand
+pages DataFrames whose columns point straight at the mapped pages, so
+loading a snapshot costs about the same at any size, and every process
+on the host shares one copy of the data through the OS page cache.
+
+Snapshots are versioned by the change log's table versions
+(Database.get_table_versions) like the shared cache's entries. Each view
+has a small pointer file naming its current snapshot; a rebuild writes
+the new snapshot under a new name and then swaps the pointer, so readers
+always see a complete file. Run the builder in the background
+(ReadModel.start, or python read_model.py --interval 5) to rebuild as
+soon as the database changes; otherwise load() rebuilds a stale view on
+first use.
+
+Frames from load() are read-only views of the mapped file; pandas
+copies a column before changing it.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import pandas as pd
+
+from database import Database
+from shared_cache import database_version
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:  # views are rebuilt from the database in each process instead
+    pa = None
+
+
+DEFAULT_READ_MODEL_DIR = ".read_model"
+
+# View name -> (tables it reads, builder)
+VIEWS: Dict[str, Tuple[Tuple[str, ...], Callable[[Database], pd.DataFrame]]] = {
+    'vendors': (('vendors',), lambda db: db.get_vendors()),
+    'contracts': (('contracts', 'vendors'), lambda db: db.get_contracts()),
+    'projects': (('projects', 'vendors'), lambda db: db.get_projects()),
+}
+
+
+class ReadModel:
+    """Versioned Arrow snapshots of the database's views, shared by every process."""
+    
+    def __init__(self, db: Database, directory: str = DEFAULT_READ_MODEL_DIR, parquet: bool = False):
+        """
+        Initialize the read model.
+        
+        Args:
+            db: Database the views are built from
+            directory: Folder holding the snapshots and their pointer files
+            parquet: Also write each snapshot as Parquet
+        """
+        self.db = db
+        self.directory = directory
+        self.parquet = parquet
+        self.stats = {'loads': 0, 'maps': 0, 'builds': 0}
+        self._mapped = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+    
+    def _pointer_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+    
+    def _read_pointer(self, name: str) -> Optional[Dict]:
+        try:
+            with open(self._pointer_path(name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _versions(self, names: List[str]) -> Dict[str, Dict]:
+        """Current version of each view, from one table versions query."""
+        versions = database_version(self.db, Database.TABLES)
+        return {name: {'db': versions['db'], 'tables': {table: versions['tables'].get(table)
+                                                         for table in VIEWS[name][0]}}
+                for name in names}
+    
+    def _build(self, name: str, version: Dict) -> Dict:
+        """Write a snapshot of one view and point readers at it."""
+        start = time.perf_counter()
+        df = VIEWS[name][1](self.db)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        
+        stem = f"{name}-{time.time_ns()}-{os.getpid()}"
+        path = os.path.join(self.directory, f"{stem}.arrow")
+        with pa.OSFile(f"{path}.tmp", 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(f"{path}.tmp", path)
+        if self.parquet:
+            pq.write_table(table, os.path.join(self.directory, f"{stem}.parquet"), compression='zstd')
+        
+        pointer = {
+            'version': version,
+            'file': f"{stem}.arrow",
+            'parquet': f"{stem}.parquet" if self.parquet else None,
+            'rows': table.num_rows,
+            'bytes': os.path.getsize(path),
+            'built_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'build_seconds': time.perf_counter() - start,
+        }
+        previous = self._read_pointer(name)
+        pointer_path = self._pointer_path(name)
+        with open(f"{pointer_path}.{os.getpid()}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(pointer, f)
+        os.replace(f"{pointer_path}.{os.getpid()}.tmp", pointer_path)
+        self.stats['builds'] += 1
+        
+        # Processes still mapping the old files keep their pages until they remap
+        if previous:
+            for key in ('file', 'parquet'):
+                if previous.get(key):
+                    self._remove_file(previous[key])
+        return pointer
+    
+    def _remove_file(self, name: str):
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:  # already removed, or still mapped on Windows
+            pass
+    
+    def refresh(self, names: Optional[List[str]] = None) -> List[str]:
+        """
+        Rebuild every view whose tables changed since its snapshot.
+        
+        Args:
+            names: Views to check (default: all of VIEWS)
+        
+        Returns:
+            Names of the views rebuilt
+        """
+        if pa is None:
+            return []
+        names = list(names or VIEWS)
+        rebuilt = []
+        for name, version in self._versions(names).items():
+            pointer = self._read_pointer(name)
+            if pointer is None or pointer['version'] != version:
+                self._build(name, version)
+                rebuilt.append(name)
+        return rebuilt
+    
+    def _map(self, pointer: Dict) -> 'pa.Table':
+        with pa.memory_map(os.path.join(self.directory, pointer['file']), 'r') as source:
+            return pa.ipc.open_file(source).read_all()
+    
+    def table(self, name: str) -> 'pa.Table':
+        """
+        Current snapshot of a view as a memory-mapped Arrow table.
+        
+        Rebuilds the view first if its tables changed. The mapped table is
+        kept for the process, so later loads of the same version only check
+        the version.
+        """
+        if name not in VIEWS:
+            raise ValueError(f"Unknown view: {name}")
+        version = self._versions([name])[name]
+        with self._lock:
+            mapped = self._mapped.get(name)
+        if mapped is not None and mapped[0] == version:
+            return mapped[1]
+        
+        pointer = self._read_pointer(name)
+        if pointer is None or pointer['version'] != version:
+            pointer = self._build(name, version)
+        try:
+            table = self._map(pointer)
+        except OSError:  # removed since the pointer was read
+            table = self._map(self._build(name, version))
+        self.stats['maps'] += 1
+        with self._lock:
+            self._mapped[name] = (version, table)
+        return table
+    
+    def load(self, name: str) -> pd.DataFrame:
+        """
+        Current snapshot of a view as a DataFrame.
+        
+        Without pyarrow the view is built from the database on every call.
+        """
+        self.stats['loads'] += 1
+        if pa is None:
+            return VIEWS[name][1](self.db)
+        # split_blocks keeps each column a zero-copy view of the mapped file
+        return self.table(name).to_pandas(split_blocks=True)
+    
+    def parquet_path(self, name: str) -> Optional[str]:
+        """
+        Path of a view's current Parquet snapshot, e.g. for analytics queries.
+        
+        Rebuilds the view first if its tables changed. Returns None unless
+        the read model writes Parquet.
+        """
+        if pa is None or not self.parquet:
+            return None
+        self.refresh([name])
+        pointer = self._read_pointer(name)
+        if not pointer or not pointer.get('parquet'):
+            # Built by a process not writing Parquet
+            pointer = self._build(name, self._versions([name])[name])
+        return os.path.join(self.directory, pointer['parquet'])
+    
+    def status(self) -> pd.DataFrame:
+        """Snapshot size, build time and freshness of every view."""
+        versions = self._versions(list(VIEWS))
+        rows = []
+        for name in VIEWS:
+            pointer = self._read_pointer(name) or {}
+            rows.append({
+                'view': name,
+                'rows': pointer.get('rows'),
+                'bytes': pointer.get('bytes'),
+                'built_at': pointer.get('built_at'),
+                'build_seconds': pointer.get('build_seconds'),
+                'current': pointer.get('version') == versions[name],
+            })
+        return pd.DataFrame(rows)
+    
+    def start(self, interval_seconds: float = 5):
+        """Run refresh every interval_seconds on a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        
+        def run():
+            while not self._stop_event.is_set():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"Read model refresh error: {e}")
+                self._stop_event.wait(interval_seconds)
+        
+        self._thread = threading.Thread(target=run, name='read-model', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background refresh thread."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Build columnar snapshots of the database.")
+    parser.add_argument("--db", default="vendor_management.db", help="SQLite database path")
+    parser.add_argument("--dir", default=os.environ.get('READ_MODEL_DIR', DEFAULT_READ_MODEL_DIR),
+                        help="Snapshot folder")
+    parser.add_argument("--parquet", action="store_true", help="Also write Parquet snapshots")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="Seconds between checks for changes (0 builds once and exits)")
+    args = parser.parse_args()
+    
+    if pa is None:
+        raise SystemExit("The read model needs pyarrow (pip install pyarrow)")
+    
+    read_model = ReadModel(Database(args.db), args.dir, args.parquet)
+    if args.interval > 0:
+        read_model.start(args.interval)
+        try:
+            read_model._thread.join()
+        except KeyboardInterrupt:
+            read_model.stop()
+    else:
+        print(f"Rebuilt: {', '.join(read_model.refresh()) or 'nothing (up to date)'}")
+        print(read_model.status().to_string(index=False))
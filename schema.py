@@ -0,0 +1,121 @@
+"""
+Typed schema for the dashboard's in-memory tables.
+
+Status, type, priority and similar columns hold a handful of distinct
+values, but as Python object strings every row pays for a full string.
+apply_schema() stores them as pandas categoricals with fixed category sets,
+so each row is a small integer code and isin / == filters compare codes.
+vendor_id becomes a categorical sharing one category set across all tables,
+which makes it an integer vendor key in child tables while still displaying
+as 'VND001'. memory_usage() reports the resulting footprint per frame.
+"""
+
+from typing import Dict, List, Optional
+import pandas as pd
+
+
+# Known values per categorical column; values found in the data but missing
+# here are appended, so typing never drops data.
+CATEGORY_SETS = {
+    'vendors': {
+        'status': ['Pending', 'Onboarding', 'Active', 'Inactive'],
+        'vendor_type': ['Data Annotation', 'Software', 'Infrastructure', 'Support Services', 'Staffing', 'Other'],
+        'onboarding_stage': ['Pending', 'Contract Review', 'Access Provisioning', 'Completed', 'N/A'],
+        'location': None,
+    },
+    'contracts': {
+        'contract_type': ['MSA', 'SOW'],
+        'status': ['Draft', 'In Review', 'Active', 'Pending Renewal', 'Expired'],
+    },
+    'projects': {
+        'status': ['Planning', 'In Progress', 'Completed'],
+        'project_lead': None,
+    },
+    'tickets': {
+        'ticket_type': ['Access Request', 'Tooling Setup', 'Technical Issue', 'Document Request',
+                        'Admin Support', 'Contract Question', 'Payment Query'],
+        'priority': ['High', 'Medium', 'Low'],
+        'status': ['Open', 'In Progress', 'Resolved'],
+    },
+}
+
+# Ordered categoricals sort by category order rather than alphabetically
+ORDERED_COLUMNS = {('tickets', 'priority')}
+
+# Small integer columns stored in narrower types
+NUMERIC_TYPES = {
+    'contracts': {'renewal_notice_days': 'int16'},
+    'projects': {'completion_pct': 'int8'},
+}
+
+
+def to_category(series: pd.Series, categories: Optional[List] = None, ordered: bool = False) -> pd.Series:
+    """
+    Convert a column to a categorical.
+    
+    Args:
+        series: Column to convert
+        categories: Known categories in order (None infers them from the data)
+        ordered: Whether the category order is meaningful for comparisons
+    
+    Returns:
+        Categorical column with every value in series preserved
+    """
+    if categories is None:
+        categories = sorted(series.dropna().unique())
+    else:
+        known = set(categories)
+        extras = sorted(value for value in series.dropna().unique() if value not in known)
+        categories = list(categories) + extras
+    return pd.Series(pd.Categorical(series, categories=categories, ordered=ordered),
+                     index=series.index, name=series.name)
+
+
+def apply_schema(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Store a set of tables with compact dtypes.
+    
+    Args:
+        frames: Mapping of table name ('vendors', 'contracts', 'projects',
+            'tickets') to DataFrame; unknown tables are returned unchanged
+    
+    Returns:
+        New mapping with typed frames (inputs are not modified)
+    """
+    typed = {}
+    
+    # One vendor key space shared by every table, in vendor table order
+    vendor_keys = None
+    if 'vendors' in frames:
+        vendor_keys = list(pd.unique(frames['vendors']['vendor_id']))
+    
+    for table, df in frames.items():
+        columns = {}
+        
+        for column, categories in CATEGORY_SETS.get(table, {}).items():
+            if column in df.columns:
+                columns[column] = to_category(df[column], categories,
+                                              ordered=(table, column) in ORDERED_COLUMNS)
+        
+        for column, dtype in NUMERIC_TYPES.get(table, {}).items():
+            if column in df.columns:
+                columns[column] = df[column].astype(dtype)
+        
+        if vendor_keys is not None and 'vendor_id' in df.columns:
+            columns['vendor_id'] = to_category(df['vendor_id'], vendor_keys)
+        
+        typed[table] = df.assign(**columns) if columns else df
+    
+    return typed
+
+
+def memory_usage(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Report rows and deep memory usage (MB) per frame."""
+    rows = []
+    for table, df in frames.items():
+        rows.append({
+            'table': table,
+            'rows': len(df),
+            'memory_mb': df.memory_usage(deep=True).sum() / 1024 ** 2,
+        })
+    return pd.DataFrame(rows)
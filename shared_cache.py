@@ -0,0 +1,319 @@
+"""
+Cross-process cache for frames and results derived from the database.
+
+Each Streamlit process behind the load balancer used to rebuild the same
+derived frames and KPI results. SharedCache keeps them in one directory
+that every worker process on the host shares: a small SQLite index maps
+each key to the version it was built for, DataFrames are stored as Arrow
+IPC files read back through a memory map (pickle without pyarrow), and
+small results are stored inline as JSON.
+
+Versions come from the database's change log (Database.get_table_versions),
+so an entry is rebuilt exactly when one of the tables it depends on has
+changed. Builds are single-flight: the first process to miss claims a
+short lease and the others wait for its result rather than building the
+same entry in parallel. Each process also keeps the entries it has loaded
+in memory, so repeated reads of an unchanged entry cost one index lookup.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # frames are pickled instead
+    pa = None
+
+
+DEFAULT_CACHE_DIR = ".shared_cache"
+
+# Seconds a build lease is held before another process may take over
+DEFAULT_LEASE_SECONDS = 30
+
+# Poll interval while waiting for another process's build
+WAIT_INTERVAL = 0.02
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+class SharedCache:
+    """Versioned, disk-backed cache shared by every process using cache_dir."""
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory holding the index and frame files
+            lease_seconds: How long a process may hold a build before others
+                stop waiting for it
+        """
+        self.cache_dir = cache_dir
+        self.lease_seconds = lease_seconds
+        self.index_path = os.path.join(cache_dir, "index.db")
+        self.stats = {'local_hits': 0, 'shared_hits': 0, 'builds': 0, 'waits': 0}
+        self._local = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.init_index()
+    
+    def get_connection(self) -> sqlite3.Connection:
+        """Get an index connection."""
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+    
+    def init_index(self):
+        """Create the index tables."""
+        conn = self.get_connection()
+        # WAL lets readers in other processes proceed while an entry is written
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                built_at REAL NOT NULL,
+                build_seconds REAL
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_builds (
+                key TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                expires REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+    
+    def get(self, key: str, version: Any, default: Any = None) -> Any:
+        """Value cached under key for version, or default."""
+        version_text = json.dumps(version, sort_keys=True)
+        with self._lock:
+            local = self._local.get(key)
+        if local is not None and local[0] == version_text:
+            self.stats['local_hits'] += 1
+            return local[1]
+        
+        conn = self.get_connection()
+        row = conn.execute("SELECT version, kind, value FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        conn.close()
+        if row is None or row[0] != version_text:
+            return default
+        try:
+            value = self._load(row[1], row[2])
+        except OSError:  # file replaced by a newer version in the meantime
+            return default
+        with self._lock:
+            self._local[key] = (version_text, value)
+        self.stats['shared_hits'] += 1
+        return value
+    
+    def put(self, key: str, version: Any, value: Any, build_seconds: Optional[float] = None):
+        """Store value under key for version, replacing any older version."""
+        version_text = json.dumps(version, sort_keys=True)
+        kind, stored = self._store(key, version_text, value)
+        
+        conn = self.get_connection()
+        previous = conn.execute("SELECT kind, value FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        conn.execute("""
+            INSERT INTO cache_entries (key, version, kind, value, built_at, build_seconds)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET version = excluded.version, kind = excluded.kind,
+                value = excluded.value, built_at = excluded.built_at, build_seconds = excluded.build_seconds
+        """, (key, version_text, kind, stored, time.time(), build_seconds))
+        conn.execute("DELETE FROM cache_builds WHERE key = ?", (key,))
+        conn.commit()
+        conn.close()
+        
+        with self._lock:
+            self._local[key] = (version_text, value)
+        if previous and previous[0] != 'json' and previous[1] != stored:
+            self._remove_file(previous[1])
+    
+    def get_or_build(self, key: str, version: Any, build: Callable[[], Any]) -> Any:
+        """
+        Value cached under key for version, building and storing it on a miss.
+        
+        Only one process builds a given version at a time; the others wait
+        for its result for up to lease_seconds, then build it themselves.
+        """
+        missing = object()
+        value = self.get(key, version, missing)
+        if value is not missing:
+            return value
+        
+        version_text = json.dumps(version, sort_keys=True)
+        deadline = time.monotonic() + self.lease_seconds
+        while not self._claim(key, version_text):
+            self.stats['waits'] += 1
+            time.sleep(WAIT_INTERVAL)
+            value = self.get(key, version, missing)
+            if value is not missing:
+                return value
+            if time.monotonic() > deadline:
+                break
+        
+        start = time.perf_counter()
+        try:
+            value = build()
+        except Exception:
+            self._release(key)
+            raise
+        self.stats['builds'] += 1
+        self.put(key, version, value, time.perf_counter() - start)
+        return value
+    
+    def _claim(self, key: str, version_text: str) -> bool:
+        """Take the build lease for key unless another process holds it."""
+        now = time.time()
+        conn = self.get_connection()
+        cursor = conn.execute("""
+            INSERT INTO cache_builds (key, version, expires) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET version = excluded.version, expires = excluded.expires
+            WHERE cache_builds.expires < ? OR cache_builds.version != excluded.version
+        """, (key, version_text, now + self.lease_seconds, now))
+        claimed = cursor.rowcount > 0
+        conn.commit()
+        conn.close()
+        return claimed
+    
+    def _release(self, key: str):
+        conn = self.get_connection()
+        conn.execute("DELETE FROM cache_builds WHERE key = ?", (key,))
+        conn.commit()
+        conn.close()
+    
+    def _store(self, key: str, version_text: str, value: Any):
+        """Serialize value; returns (kind, stored value or file name)."""
+        if not isinstance(value, pd.DataFrame):
+            return 'json', json.dumps(value)
+        
+        name = f"{_digest(key)}-{_digest(version_text)}"
+        if pa is not None:
+            name += ".arrow"
+            table = pa.Table.from_pandas(value, preserve_index=True)
+            kind = 'arrow'
+        else:
+            name += ".pkl"
+            kind = 'pickle'
+        
+        # Write under a temporary name so readers never see a partial file
+        path = os.path.join(self.cache_dir, name)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            if kind == 'arrow':
+                with pa.ipc.new_file(f, table.schema) as writer:
+                    writer.write_table(table)
+            else:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        return kind, name
+    
+    def _load(self, kind: str, stored: str) -> Any:
+        """Deserialize a stored value."""
+        if kind == 'json':
+            return json.loads(stored)
+        path = os.path.join(self.cache_dir, stored)
+        if kind == 'arrow':
+            with pa.memory_map(path, 'r') as source:
+                return pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    
+    def _remove_file(self, name: str):
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except OSError:  # already removed, or still open on Windows
+            pass
+    
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one entry, or every entry if key is None."""
+        conn = self.get_connection()
+        if key is None:
+            rows = conn.execute("SELECT kind, value FROM cache_entries").fetchall()
+            conn.execute("DELETE FROM cache_entries")
+        else:
+            rows = conn.execute("SELECT kind, value FROM cache_entries WHERE key = ?", (key,)).fetchall()
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        conn.commit()
+        conn.close()
+        
+        with self._lock:
+            if key is None:
+                self._local.clear()
+            else:
+                self._local.pop(key, None)
+        for kind, stored in rows:
+            if kind != 'json':
+                self._remove_file(stored)
+    
+    def entries(self) -> pd.DataFrame:
+        """Cached entries with their size and build time."""
+        conn = self.get_connection()
+        df = pd.read_sql_query(
+            "SELECT key, version, kind, value, built_at, build_seconds FROM cache_entries ORDER BY key", conn)
+        conn.close()
+        
+        def size(row):
+            if row['kind'] == 'json':
+                return len(row['value'])
+            path = os.path.join(self.cache_dir, row['value'])
+            return os.path.getsize(path) if os.path.exists(path) else 0
+        
+        df['bytes'] = df.apply(size, axis=1) if len(df) else pd.Series(dtype='int64')
+        df['built_at'] = pd.to_datetime(df['built_at'], unit='s')
+        return df.drop(columns='value')
+
+
+def database_version(db, tables: Iterable[str]) -> Dict:
+    """Cache version for data derived from some of a database's tables."""
+    versions = db.get_table_versions()
+    return {'db': os.path.abspath(db.db_path), 'tables': {table: versions.get(table) for table in tables}}
+
+
+def database_derived(db, key: str, tables: Iterable[str], build: Callable[[], Any],
+                     cache: Optional[SharedCache] = None) -> Any:
+    """
+    Value derived from a database, shared across processes.
+    
+    Args:
+        db: Database the value is computed from
+        key: Cache key (the database path is added to it)
+        tables: Tables the value depends on; a change to any rebuilds it
+        build: Computes the value (a DataFrame or JSON-serializable result)
+        cache: Cache to use (defaults to get_shared_cache())
+    
+    Returns:
+        The cached or freshly built value
+    """
+    cache = cache or get_shared_cache()
+    version = database_version(db, tables)
+    return cache.get_or_build(f"{version['db']}:{key}", version, build)
+
+
+# Singleton instance
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache:
+    """Get or create the SharedCache singleton (directory from SHARED_CACHE_DIR)."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SharedCache(os.environ.get('SHARED_CACHE_DIR', DEFAULT_CACHE_DIR))
+    return _shared_cache
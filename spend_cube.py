@@ -0,0 +1,311 @@
+"""
+Precomputed spend rollups for the Spend Analytics page.
+
+Finance breaks contract value and project budget down by vendor type,
+month and status, and drills from there into single vendors. SpendCube
+aggregates one measure once per table version into dense sum and count
+arrays over those three dimensions, so any rollup or slice is a sum over
+a few small axes, and keeps one cell per (vendor, month, status) for
+drilling down to vendors. Added, changed and removed rows are applied to
+the cells and arrays in place rather than rebuilding the cube.
+
+Months are 'YYYY-MM' labels of each row's start date. Rows whose vendor
+is not in the vendor table are counted under UNKNOWN_TYPE; rows without a
+start date or status under UNKNOWN_MONTH or UNKNOWN_STATUS, and rows
+without a vendor under a None vendor.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+from dimensions import VendorDimension
+
+
+DIMENSIONS = ('vendor_type', 'month', 'status')
+
+UNKNOWN_TYPE = 'Unknown'
+UNKNOWN_MONTH = 'Unknown'
+UNKNOWN_STATUS = 'Unknown'
+
+
+class _Labels:
+    """Label <-> code mapping that grows as new labels appear."""
+    
+    def __init__(self, labels: Iterable = ()):
+        self.labels = list(labels)
+        self.codes = {label: code for code, label in enumerate(self.labels)}
+    
+    def __len__(self) -> int:
+        return len(self.labels)
+    
+    def code(self, label) -> int:
+        """Code of a label, adding it if new."""
+        code = self.codes.get(label)
+        if code is None:
+            code = self.codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+    
+    def codes_for(self, labels: Optional[Iterable]) -> Optional[np.ndarray]:
+        """Codes of the known labels among labels (None selects everything)."""
+        if labels is None:
+            return None
+        return np.array([self.codes[label] for label in labels if label in self.codes], dtype=np.int64)
+
+
+def _month(date) -> str:
+    return UNKNOWN_MONTH if pd.isna(date) else pd.Timestamp(date).strftime('%Y-%m')
+
+
+def _factorize(values: pd.Series, missing):
+    """pd.factorize, with missing values coded as the label missing rather than -1."""
+    codes, uniques = pd.factorize(values)
+    labels = list(uniques)
+    if (codes < 0).any():
+        if missing in labels:
+            missing_code = labels.index(missing)
+        else:
+            missing_code = len(labels)
+            labels.append(missing)
+        codes = np.where(codes < 0, missing_code, codes)
+    return codes, labels
+
+
+class SpendCube:
+    """Sums and counts of one measure by vendor type, month and status."""
+    
+    def __init__(self, df: pd.DataFrame, value_column: str, id_column: str,
+                 vendor_dim: VendorDimension, date_column: str = 'start_date'):
+        """
+        Build the cube.
+        
+        Args:
+            df: Contracts or projects table with vendor_id, status and the columns below
+            value_column: Measure to sum (contract_value, budget)
+            id_column: Row ID used for incremental changes (contract_id, project_id)
+            vendor_dim: Vendor index supplying each vendor's type
+            date_column: Date whose month places a row
+        """
+        self.value_column = value_column
+        
+        vendor_codes, vendor_ids = _factorize(df['vendor_id'].astype(object), None)
+        month_codes, months = _factorize(df[date_column].dt.strftime('%Y-%m'), UNKNOWN_MONTH)
+        status_codes, statuses = _factorize(df['status'].astype(object), UNKNOWN_STATUS)
+        self.vendors = _Labels(vendor_ids)
+        self.months = _Labels(months)
+        self.statuses = _Labels(statuses)
+        
+        # Vendor type of each vendor, as a code
+        self.types = _Labels()
+        self._vendor_types = [self.types.code(vendor_dim.vendor_type(vendor_id) or UNKNOWN_TYPE)
+                              for vendor_id in self.vendors.labels]
+        
+        # One cell per (vendor, month, status) combination present
+        values = np.nan_to_num(df[value_column].to_numpy(dtype=np.float64))
+        keys = (vendor_codes.astype(np.int64) * len(self.months) + month_codes) * len(self.statuses) + status_codes
+        cell_keys, row_cells = np.unique(keys, return_inverse=True)
+        n_cells = len(cell_keys)
+        self._cell_vendor = (cell_keys // (len(self.months) * len(self.statuses))).tolist()
+        self._cell_month = (cell_keys // len(self.statuses) % len(self.months)).tolist()
+        self._cell_status = (cell_keys % len(self.statuses)).tolist()
+        self._cell_sum = np.bincount(row_cells, weights=values, minlength=n_cells).tolist()
+        self._cell_count = np.bincount(row_cells, minlength=n_cells).tolist()
+        self._cells = {key: cell for cell, key in
+                       enumerate(zip(self._cell_vendor, self._cell_month, self._cell_status))}
+        
+        # Dense rollups over vendor type x month x status
+        self._sums = np.zeros((len(self.types), len(self.months), len(self.statuses)))
+        self._counts = np.zeros(self._sums.shape, dtype=np.int64)
+        cell_types = np.array(self._vendor_types, dtype=np.int64)[self._cell_vendor] if n_cells else np.array([], dtype=np.int64)
+        np.add.at(self._sums, (cell_types, self._cell_month, self._cell_status), self._cell_sum)
+        np.add.at(self._counts, (cell_types, self._cell_month, self._cell_status), self._cell_count)
+        
+        # Per-row state for incremental changes
+        self._rows = {row_id: row for row, row_id in enumerate(df[id_column].astype(object))}
+        self._row_cell = row_cells.tolist()
+        self._row_value = values.tolist()
+    
+    def __len__(self) -> int:
+        """Number of rows in the cube."""
+        return len(self._rows)
+    
+    @property
+    def n_cells(self) -> int:
+        """Number of (vendor, month, status) cells."""
+        return len(self._cell_sum)
+    
+    def _grow(self):
+        """Extend the dense arrays to new types, months or statuses."""
+        shape = (len(self.types), len(self.months), len(self.statuses))
+        if shape != self._sums.shape:
+            padding = [(0, new - old) for new, old in zip(shape, self._sums.shape)]
+            self._sums = np.pad(self._sums, padding)
+            self._counts = np.pad(self._counts, padding)
+    
+    def _cell(self, vendor_id, vendor_type: Optional[str], month: str, status: str) -> int:
+        """Cell for a combination, creating it if new."""
+        vendor = self.vendors.code(vendor_id)
+        if vendor == len(self._vendor_types):
+            self._vendor_types.append(self.types.code(vendor_type or UNKNOWN_TYPE))
+        key = (vendor, self.months.code(month), self.statuses.code(status))
+        self._grow()
+        
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = len(self._cell_sum)
+            self._cell_vendor.append(key[0])
+            self._cell_month.append(key[1])
+            self._cell_status.append(key[2])
+            self._cell_sum.append(0.0)
+            self._cell_count.append(0)
+        return cell
+    
+    def _apply(self, cell: int, value: float, count: int):
+        """Add value and count to a cell and its rollup."""
+        self._cell_sum[cell] += value
+        self._cell_count[cell] += count
+        index = (self._vendor_types[self._cell_vendor[cell]], self._cell_month[cell], self._cell_status[cell])
+        self._sums[index] += value
+        self._counts[index] += count
+    
+    def add(self, row_id, vendor_id, date, status: str, value: float, vendor_type: Optional[str] = None) -> int:
+        """
+        Add a new row.
+        
+        Args:
+            row_id: Row ID (must not already be in the cube)
+            vendor_id: Vendor of the row
+            date: Date whose month places the row
+            status: Row status
+            value: Measure value
+            vendor_type: Type of the vendor, needed only for vendors new to the cube
+        
+        Returns:
+            Position of the new row
+        """
+        if row_id in self._rows:
+            raise ValueError(f"Row already in cube: {row_id}")
+        value = 0.0 if pd.isna(value) else float(value)
+        vendor_id = None if pd.isna(vendor_id) else vendor_id
+        status = UNKNOWN_STATUS if pd.isna(status) else status
+        cell = self._cell(vendor_id, vendor_type, _month(date), status)
+        self._apply(cell, value, 1)
+        
+        row = self._rows[row_id] = len(self._row_cell)
+        self._row_cell.append(cell)
+        self._row_value.append(value)
+        return row
+    
+    def update(self, row_id, status: Optional[str] = None, value: Optional[float] = None) -> int:
+        """
+        Change a row's status and/or value; raises KeyError if unknown.
+        
+        Returns:
+            Position of the row
+        """
+        row = self._rows[row_id]
+        cell = self._row_cell[row]
+        old_value = self._row_value[row]
+        new_value = old_value if value is None else (0.0 if pd.isna(value) else float(value))
+        
+        new_cell = cell
+        if status is not None and self.statuses.labels[self._cell_status[cell]] != status:
+            vendor_id = self.vendors.labels[self._cell_vendor[cell]]
+            new_cell = self._cell(vendor_id, None, self.months.labels[self._cell_month[cell]], status)
+        
+        if new_cell != cell or new_value != old_value:
+            self._apply(cell, -old_value, -1)
+            self._apply(new_cell, new_value, 1)
+            self._row_cell[row] = new_cell
+            self._row_value[row] = new_value
+        return row
+    
+    def remove(self, row_id):
+        """Take a row out of the cube; raises KeyError if unknown."""
+        row = self._rows.pop(row_id)
+        self._apply(self._row_cell[row], -self._row_value[row], -1)
+        self._row_value[row] = 0.0
+    
+    def _select(self, where: Optional[Dict[str, Sequence]]) -> List[Optional[np.ndarray]]:
+        """Codes selected on each dimension (None for all)."""
+        where = where or {}
+        unknown = set(where) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown dimensions: {', '.join(sorted(unknown))}")
+        labels = {'vendor_type': self.types, 'month': self.months, 'status': self.statuses}
+        return [labels[dimension].codes_for(where.get(dimension)) for dimension in DIMENSIONS]
+    
+    def rollup(self, by: Sequence[str] = ('vendor_type',), where: Optional[Dict[str, Sequence]] = None) -> pd.DataFrame:
+        """
+        Total value and row count per combination of some dimensions.
+        
+        Args:
+            by: Dimensions to group by, from DIMENSIONS (empty for one total)
+            where: Dimension -> labels to keep, applied before grouping
+        
+        Returns:
+            DataFrame with the by columns, value and count, sorted by the
+            by columns; combinations without rows are left out
+        """
+        by = list(by)
+        unknown = set(by) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown dimensions: {', '.join(sorted(unknown))}")
+        
+        sums, counts = self._sums, self._counts
+        labels = [self.types.labels, self.months.labels, self.statuses.labels]
+        for axis, codes in enumerate(self._select(where)):
+            if codes is not None:
+                sums, counts = sums.take(codes, axis=axis), counts.take(codes, axis=axis)
+                labels[axis] = [labels[axis][code] for code in codes]
+        
+        other_axes = tuple(axis for axis, dimension in enumerate(DIMENSIONS) if dimension not in by)
+        sums, counts = np.atleast_1d(sums.sum(axis=other_axes)), np.atleast_1d(counts.sum(axis=other_axes))
+        # Remaining axes are in DIMENSIONS order
+        kept = [axis for axis in range(len(DIMENSIONS)) if axis not in other_axes]
+        present = np.nonzero(counts)
+        result = pd.DataFrame({DIMENSIONS[axis]: np.asarray(labels[axis], dtype=object)[positions]
+                               for axis, positions in zip(kept, present)})
+        result['value'] = sums[present]
+        result['count'] = counts[present]
+        if by:
+            result = result.sort_values(by, kind='stable')
+        return result[by + ['value', 'count']].reset_index(drop=True)
+    
+    def drill_down(self, where: Optional[Dict[str, Sequence]] = None) -> pd.DataFrame:
+        """
+        Total value and row count per vendor.
+        
+        Args:
+            where: Dimension -> labels to keep
+        
+        Returns:
+            DataFrame with vendor_id, vendor_type, value and count, largest
+            value first; vendors without rows are left out
+        """
+        cell_vendor = np.array(self._cell_vendor, dtype=np.int64)
+        cell_type = np.array(self._vendor_types, dtype=np.int64)[cell_vendor] if len(cell_vendor) else cell_vendor
+        mask = np.ones(len(cell_vendor), dtype=bool)
+        for cell_codes, codes in zip((cell_type, np.array(self._cell_month), np.array(self._cell_status)),
+                                     self._select(where)):
+            if codes is not None:
+                mask &= np.isin(cell_codes, codes)
+        
+        vendors = cell_vendor[mask]
+        sums = np.bincount(vendors, weights=np.array(self._cell_sum)[mask], minlength=len(self.vendors))
+        counts = np.bincount(vendors, weights=np.array(self._cell_count)[mask], minlength=len(self.vendors))
+        present = np.flatnonzero(counts > 0)
+        result = pd.DataFrame({
+            'vendor_id': np.asarray(self.vendors.labels, dtype=object)[present],
+            'vendor_type': np.asarray(self.types.labels, dtype=object)[np.array(self._vendor_types)[present]],
+            'value': sums[present],
+            'count': counts[present].astype(np.int64),
+        })
+        return result.sort_values('value', ascending=False, kind='stable').reset_index(drop=True)
+    
+    def labels(self, dimension: str) -> List:
+        """Labels of a dimension with at least one row, sorted."""
+        counts = self._counts.sum(axis=tuple(axis for axis, name in enumerate(DIMENSIONS) if name != dimension))
+        values = {'vendor_type': self.types, 'month': self.months, 'status': self.statuses}[dimension].labels
+        return sorted(label for label, count in zip(values, counts) if count > 0)
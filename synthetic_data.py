@@ -0,0 +1,257 @@
+"""
+Synthetic data generator for scale testing.
+
+Produces vendors, contracts, projects and tickets with the same columns as
+the sample data in app.py, at any size. Generation is seeded and
+vectorized with numpy, so a million tickets take seconds and the same seed
+always yields the same data. Child tables reference vendors through a
+Zipf-like distribution: a few large vendors own most contracts, projects
+and tickets, as in real vendor portfolios.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+from kpi_store import project_health
+
+
+# Dataset sizes used by the benchmark suite
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+VENDOR_TYPES = ['Data Annotation', 'Infrastructure', 'Software', 'Support Services', 'Staffing']
+VENDOR_TYPE_WEIGHTS = [0.25, 0.2, 0.3, 0.15, 0.1]
+VENDOR_STATUSES = ['Active', 'Onboarding', 'Inactive']
+VENDOR_STATUS_WEIGHTS = [0.75, 0.1, 0.15]
+ONBOARDING_STAGES = ['Contract Review', 'Access Provisioning']
+LOCATIONS = ['San Francisco, CA', 'Austin, TX', 'New York, NY', 'Seattle, WA', 'Denver, CO',
+             'Boston, MA', 'Remote (US)', 'Remote (Global)']
+SERVICES = ['Human feedback collection', 'Cloud infrastructure', 'Project management tools',
+            'Dataset labeling', 'Quality assurance', 'Administrative support',
+            'Contract staffing', 'Image annotation']
+NAME_PREFIXES = ['Data', 'Cloud', 'Tech', 'Quality', 'Rapid', 'Global', 'Precision', 'AI', 'Prime', 'Apex']
+NAME_SUFFIXES = ['Solutions', 'Partners', 'Services', 'Labs', 'Works', 'Systems', 'Group', 'Co']
+FIRST_NAMES = ['Sarah', 'Michael', 'Emily', 'David', 'Jessica', 'Robert', 'Amanda', 'Chris', 'Priya', 'Luis']
+LAST_NAMES = ['Johnson', 'Chen', 'Rodriguez', 'Kim', 'Williams', 'Taylor', 'Martinez', 'Anderson', 'Patel', 'Garcia']
+
+CONTRACT_TYPES = ['MSA', 'SOW']
+# Contracts past their end date are always 'Expired'
+CONTRACT_STATUSES = ['Active', 'In Review']
+CONTRACT_STATUS_WEIGHTS = [0.875, 0.125]
+RENEWAL_NOTICE_DAYS = [30, 60, 90]
+
+PROJECT_STATUSES = ['Planning', 'In Progress', 'Completed']
+PROJECT_STATUS_WEIGHTS = [0.15, 0.55, 0.3]
+PROJECT_LEADS = ['Internal Team A', 'Internal Team B', 'Internal Team C', 'Internal Team D']
+PROJECT_TOPICS = ['Dataset Annotation', 'Infrastructure Migration', 'Feedback Collection',
+                  'Quality Audit', 'Support Coverage', 'Image Classification']
+
+TICKET_TYPES = ['Access Request', 'Tooling Setup', 'Technical Issue', 'Document Request',
+                'Admin Support', 'Contract Question', 'Payment Query']
+TICKET_TYPE_WEIGHTS = [0.25, 0.15, 0.2, 0.15, 0.1, 0.08, 0.07]
+TICKET_PRIORITIES = ['High', 'Medium', 'Low']
+TICKET_PRIORITY_WEIGHTS = [0.25, 0.45, 0.3]
+TICKET_STATUSES = ['Open', 'In Progress', 'Resolved']
+TICKET_STATUS_WEIGHTS = [0.2, 0.2, 0.6]
+TICKET_DESCRIPTIONS = ['Need access to annotation platform', 'Setup project management tool access',
+                       'Update contact information', 'API integration not working', 'Request W9 form',
+                       'VPN access for remote team', 'Question about renewal terms',
+                       'Invoice processing delay', 'Connection timeout issues']
+
+
+def _choice(rng: np.random.Generator, options, size: int, weights=None) -> np.ndarray:
+    """Draw values from options, optionally weighted."""
+    return np.asarray(options, dtype=object)[rng.choice(len(options), size=size, p=weights)]
+
+
+def _ids(prefix: str, count: int, width: int = 3) -> pd.Series:
+    """Build IDs like 'VND001', widening the number as needed."""
+    width = max(width, len(str(count)))
+    return prefix + pd.Series(np.arange(1, count + 1)).astype(str).str.zfill(width)
+
+
+def _dates(rng: np.random.Generator, base: pd.Timestamp, low_days: int, high_days: int, size: int) -> pd.Series:
+    """Random dates between base + low_days and base + high_days."""
+    return base + pd.to_timedelta(rng.integers(low_days, high_days, size=size), unit='D')
+
+
+def _vendor_picks(rng: np.random.Generator, n_vendors: int, size: int, skew: float) -> np.ndarray:
+    """Pick vendor positions with a Zipf-like skew toward the first vendors."""
+    weights = 1.0 / np.arange(1, n_vendors + 1) ** skew
+    return rng.choice(n_vendors, size=size, p=weights / weights.sum())
+
+
+def generate_vendors(rng: np.random.Generator, count: int, today: pd.Timestamp) -> pd.DataFrame:
+    """Generate the vendors table."""
+    vendor_ids = _ids('VND', count)
+    status = _choice(rng, VENDOR_STATUSES, count, VENDOR_STATUS_WEIGHTS)
+    first = _choice(rng, FIRST_NAMES, count)
+    last = _choice(rng, LAST_NAMES, count)
+    domain = pd.Series(_choice(rng, NAME_PREFIXES, count)).str.lower() + vendor_ids.str[3:]
+    
+    onboarding_stage = np.where(status == 'Active', 'Completed',
+                                np.where(status == 'Inactive', 'N/A',
+                                         _choice(rng, ONBOARDING_STAGES, count)))
+    
+    return pd.DataFrame({
+        'vendor_id': vendor_ids,
+        'vendor_name': (pd.Series(_choice(rng, NAME_PREFIXES, count)) + ' '
+                        + pd.Series(_choice(rng, NAME_SUFFIXES, count)) + ' ' + vendor_ids.str[3:]),
+        'contact_name': pd.Series(first) + ' ' + pd.Series(last),
+        'contact_email': pd.Series(first).str.lower() + '@' + domain + '.com',
+        'location': _choice(rng, LOCATIONS, count),
+        'vendor_type': _choice(rng, VENDOR_TYPES, count, VENDOR_TYPE_WEIGHTS),
+        'status': status,
+        'onboarding_stage': onboarding_stage,
+        'date_added': _dates(rng, today, -1500, -1, count),
+        'primary_services': _choice(rng, SERVICES, count),
+    })
+
+
+def generate_contracts(rng: np.random.Generator, count: int, vendor_ids: pd.Series,
+                       today: pd.Timestamp, skew: float) -> pd.DataFrame:
+    """Generate the contracts table."""
+    contract_ids = _ids('CNT', count)
+    start_date = _dates(rng, today, -1000, 90, count)
+    end_date = start_date + pd.to_timedelta(rng.integers(180, 1096, size=count), unit='D')
+    
+    status = _choice(rng, CONTRACT_STATUSES, count, CONTRACT_STATUS_WEIGHTS)
+    status = np.where(end_date < today, 'Expired', status)
+    
+    return pd.DataFrame({
+        'contract_id': contract_ids,
+        'vendor_id': vendor_ids.values[_vendor_picks(rng, len(vendor_ids), count, skew)],
+        'contract_type': _choice(rng, CONTRACT_TYPES, count, [0.6, 0.4]),
+        'start_date': start_date,
+        'end_date': end_date,
+        'contract_value': (np.round(rng.lognormal(mean=11.5, sigma=0.8, size=count), -3)).astype(int),
+        'po_number': 'PO-' + pd.Series(start_date.year).astype(str) + '-' + contract_ids.str[3:],
+        'status': status,
+        'renewal_notice_days': np.where(status == 'Expired', 0, _choice(rng, RENEWAL_NOTICE_DAYS, count)).astype(int),
+    })
+
+
+def generate_projects(rng: np.random.Generator, count: int, vendor_ids: pd.Series,
+                      today: pd.Timestamp, skew: float) -> pd.DataFrame:
+    """Generate the projects table."""
+    project_ids = _ids('PRJ', count)
+    status = _choice(rng, PROJECT_STATUSES, count, PROJECT_STATUS_WEIGHTS)
+    start_date = _dates(rng, today, -540, 30, count)
+    
+    completion = rng.integers(0, 100, size=count)
+    completion = np.where(status == 'Completed', 100, np.where(status == 'Planning', completion // 10, completion))
+    
+    return pd.DataFrame({
+        'project_id': project_ids,
+        'project_name': pd.Series(_choice(rng, PROJECT_TOPICS, count)) + ' ' + project_ids.str[3:],
+        'vendor_id': vendor_ids.values[_vendor_picks(rng, len(vendor_ids), count, skew)],
+        'status': status,
+        'start_date': start_date,
+        'target_end_date': start_date + pd.to_timedelta(rng.integers(30, 365, size=count), unit='D'),
+        'completion_pct': completion.astype(int),
+        'budget': (np.round(rng.lognormal(mean=11.0, sigma=0.7, size=count), -3)).astype(int),
+        'project_lead': _choice(rng, PROJECT_LEADS, count),
+    })
+
+
+def generate_tickets(rng: np.random.Generator, count: int, vendor_ids: pd.Series,
+                     today: pd.Timestamp, skew: float) -> pd.DataFrame:
+    """Generate the tickets table."""
+    return pd.DataFrame({
+        'ticket_id': _ids('TKT', count),
+        'vendor_id': vendor_ids.values[_vendor_picks(rng, len(vendor_ids), count, skew)],
+        'ticket_type': _choice(rng, TICKET_TYPES, count, TICKET_TYPE_WEIGHTS),
+        'priority': _choice(rng, TICKET_PRIORITIES, count, TICKET_PRIORITY_WEIGHTS),
+        'status': _choice(rng, TICKET_STATUSES, count, TICKET_STATUS_WEIGHTS),
+        'created_date': _dates(rng, today, -365, 1, count),
+        'description': _choice(rng, TICKET_DESCRIPTIONS, count),
+    })
+
+
+def generate_dataset(n_rows: int, seed: int = 42, vendor_skew: float = 1.1,
+                     reference_date: Optional[datetime] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Generate a related dataset sized by ticket count.
+    
+    Tickets get n_rows rows, contracts and projects a tenth of that, and
+    vendors a hundredth (at least 8).
+    
+    Args:
+        n_rows: Number of tickets to generate
+        seed: Random seed; the same seed always yields the same data
+        vendor_skew: Zipf exponent for how child rows spread across vendors
+        reference_date: Date the data is generated around (defaults to today)
+    
+    Returns:
+        Dictionary with 'vendors', 'contracts', 'projects' and 'tickets' frames
+    """
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp(reference_date or datetime.now()).normalize()
+    
+    vendors = generate_vendors(rng, max(8, n_rows // 100), today)
+    vendor_ids = vendors['vendor_id']
+    child_rows = max(1, n_rows // 10)
+    
+    return {
+        'vendors': vendors,
+        'contracts': generate_contracts(rng, child_rows, vendor_ids, today, vendor_skew),
+        'projects': generate_projects(rng, child_rows, vendor_ids, today, vendor_skew),
+        'tickets': generate_tickets(rng, n_rows, vendor_ids, today, vendor_skew),
+    }
+
+
+def load_into_database(db, dataset: Dict[str, pd.DataFrame]):
+    """
+    Bulk-load a generated dataset into a database.Database.
+    
+    Vendor 'VND...' IDs become integer row IDs by position, and project
+    completion is mapped onto the database's Green/Yellow/Red health
+    status, with completed projects' target end date as their completion
+    date. Tickets have no database table and are skipped.
+    """
+    vendors = dataset['vendors']
+    vendor_keys = pd.Series(np.arange(1, len(vendors) + 1), index=vendors['vendor_id'].values)
+    contracts = dataset['contracts']
+    projects = dataset['projects']
+    health = project_health(projects['completion_pct'])
+    
+    def date_text(series: pd.Series) -> list:
+        return series.dt.strftime('%Y-%m-%d').tolist()
+    
+    conn = db.get_connection()
+    cursor = conn.cursor()
+    
+    cursor.executemany("""
+        INSERT INTO vendors (id, name, contact_name, email, location, status, onboarding_date, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, zip(vendor_keys.tolist(), vendors['vendor_name'], vendors['contact_name'],
+             vendors['contact_email'], vendors['location'], vendors['status'],
+             date_text(vendors['date_added']), vendors['primary_services']))
+    
+    cursor.executemany("""
+        INSERT INTO contracts (vendor_id, contract_name, contract_type, start_date, end_date,
+                               contract_value, status, po_number, renewal_notice_days)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, zip(vendor_keys[contracts['vendor_id']].tolist(), contracts['contract_id'],
+             contracts['contract_type'], date_text(contracts['start_date']),
+             date_text(contracts['end_date']), contracts['contract_value'].tolist(),
+             contracts['status'], contracts['po_number'],
+             contracts['renewal_notice_days'].tolist()))
+    
+    cursor.executemany("""
+        INSERT INTO projects (project_name, vendor_id, status, start_date, target_date,
+                              completion_date, project_owner)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, zip(projects['project_name'], vendor_keys[projects['vendor_id']].tolist(),
+             health.tolist(), date_text(projects['start_date']),
+             date_text(projects['target_end_date']),
+             date_text(projects['target_end_date'].where(projects['status'] == 'Completed')),
+             projects['project_lead']))
+    
+    conn.commit()
+    conn.close()
@@ -0,0 +1,243 @@
+"""
+Ticket queue engine for the Ticket System page.
+
+The page used to map priorities to ranks and re-sort the filtered tickets
+on every rerun. TicketQueue keeps that order as an index instead: one
+bucket per priority holding rows sorted by creation time, oldest first.
+A new ticket is appended to its bucket in O(1). New tickets are normally
+the newest, so the bucket stays sorted; a backdated one marks the bucket
+for a single sort the next time the order is read. The display order
+(priority, then newest first) is the buckets read back to front. SLA due
+times come from each ticket's priority; a heap of open tickets ordered by
+due time moves tickets into the breached set as time passes, and status
+changes update ages and breaches in place.
+
+Rows are positions in the tickets table the queue was built from; new
+tickets are appended after them, matching how the table grows.
+"""
+
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+
+# Queue order: lower rank first, then newest first
+PRIORITY_RANKS = {'High': 0, 'Medium': 1, 'Low': 2}
+
+# Time allowed from creation to resolution, per priority
+SLA_TARGETS = {
+    'High': timedelta(days=1),
+    'Medium': timedelta(days=3),
+    'Low': timedelta(days=7),
+}
+DEFAULT_SLA = SLA_TARGETS['Low']
+
+OPEN_STATUSES = ('Open', 'In Progress')
+RESOLVED = 'Resolved'
+
+
+def _epoch(when: Optional[datetime]) -> int:
+    """Epoch seconds for a datetime (now if None)."""
+    return int(pd.Timestamp(when if when is not None else datetime.now()).timestamp())
+
+
+class TicketQueue:
+    """Ordered ticket index with SLA tracking."""
+    
+    def __init__(self, tickets_df: pd.DataFrame, now: Optional[datetime] = None):
+        """
+        Build the queue.
+        
+        Args:
+            tickets_df: Tickets table with ticket_id, priority, status and created_date
+            now: Time to evaluate SLA breaches at (defaults to now)
+        """
+        # Per-priority values are looked up once per distinct priority
+        codes, priorities = pd.factorize(tickets_df['priority'])
+        rank_of = [PRIORITY_RANKS.get(p, len(PRIORITY_RANKS)) for p in priorities] + [len(PRIORITY_RANKS)]
+        sla_of = [int(SLA_TARGETS.get(p, DEFAULT_SLA).total_seconds()) for p in priorities]
+        sla_of.append(int(DEFAULT_SLA.total_seconds()))
+        ranks = np.array(rank_of, dtype=np.int64)[codes]
+        created = tickets_df['created_date'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+        due = created + np.array(sla_of, dtype=np.int64)[codes]
+        is_open = tickets_df['status'].isin(OPEN_STATUSES).to_numpy()
+        
+        # Per-row state
+        self._ids = tickets_df['ticket_id'].astype(object).tolist()
+        self._rows = {ticket_id: row for row, ticket_id in enumerate(self._ids)}
+        self._statuses = tickets_df['status'].astype(object).tolist()
+        self._created = created.tolist()
+        self._due = due.tolist()
+        self._resolved_at = {}
+        
+        # Order index: per priority rank, creation times (oldest first)
+        # with their rows alongside; unknown priorities go last
+        self._buckets = []
+        for rank in range(len(PRIORITY_RANKS) + 1):
+            rows = np.flatnonzero(ranks == rank)
+            rows = rows[np.argsort(created[rows], kind='stable')]
+            self._buckets.append((created[rows].tolist(), rows.tolist()))
+        self._unsorted = set()
+        self._order_cache = None
+        
+        # Open tickets past due, and a heap of the rest by due time
+        now_ts = _epoch(now)
+        breached = is_open & (due <= now_ts)
+        pending = np.flatnonzero(is_open & ~breached)
+        self._breached = set(np.flatnonzero(breached).tolist())
+        self._due_heap = list(zip(due[pending].tolist(), pending.tolist()))
+        heapq.heapify(self._due_heap)
+    
+    def __len__(self) -> int:
+        """Number of tickets in the queue."""
+        return len(self._ids)
+    
+    def __contains__(self, ticket_id) -> bool:
+        """Whether a ticket is in the queue."""
+        return ticket_id in self._rows
+    
+    def row(self, ticket_id) -> int:
+        """Row of a ticket; raises KeyError if unknown."""
+        return self._rows[ticket_id]
+    
+    def status(self, ticket_id) -> str:
+        """Current status of a ticket."""
+        return self._statuses[self._rows[ticket_id]]
+    
+    def insert(self, ticket_id: str, priority: str, status: str = 'Open',
+               created: Optional[datetime] = None, now: Optional[datetime] = None) -> int:
+        """
+        Add a new ticket.
+        
+        Args:
+            ticket_id: Ticket ID (must not already be queued)
+            priority: Ticket priority
+            status: Initial status
+            created: Creation time (defaults to now)
+            now: Time to evaluate the SLA at (defaults to now)
+        
+        Returns:
+            Row of the new ticket
+        """
+        if ticket_id in self._rows:
+            raise ValueError(f"Ticket {ticket_id} is already queued")
+        
+        row = len(self._ids)
+        created_ts = _epoch(created)
+        due = created_ts + int(SLA_TARGETS.get(priority, DEFAULT_SLA).total_seconds())
+        
+        self._ids.append(ticket_id)
+        self._rows[ticket_id] = row
+        self._statuses.append(status)
+        self._created.append(created_ts)
+        self._due.append(due)
+        
+        rank = PRIORITY_RANKS.get(priority, len(PRIORITY_RANKS))
+        times, rows = self._buckets[rank]
+        if times and created_ts < times[-1]:
+            self._unsorted.add(rank)
+        times.append(created_ts)
+        rows.append(row)
+        self._order_cache = None
+        
+        if status in OPEN_STATUSES:
+            self._track_open(row, _epoch(now))
+        elif status == RESOLVED:
+            self._resolved_at[row] = _epoch(now)
+        return row
+    
+    def set_status(self, ticket_id, status: str, now: Optional[datetime] = None) -> int:
+        """
+        Change a ticket's status.
+        
+        Resolving stops the ticket's age and removes it from the breached
+        set; reopening starts SLA tracking again against its original due time.
+        
+        Args:
+            ticket_id: Ticket to update
+            status: New status
+            now: Time of the change (defaults to now)
+        
+        Returns:
+            Row of the ticket
+        """
+        row = self._rows[ticket_id]
+        was_open = self._statuses[row] in OPEN_STATUSES
+        self._statuses[row] = status
+        now_ts = _epoch(now)
+        
+        if status in OPEN_STATUSES:
+            self._resolved_at.pop(row, None)
+            if not was_open:
+                self._track_open(row, now_ts)
+        else:
+            # Heap entries of closed tickets are skipped when they come due
+            self._breached.discard(row)
+            if status == RESOLVED:
+                self._resolved_at[row] = now_ts
+        return row
+    
+    def resolve(self, ticket_id, now: Optional[datetime] = None) -> int:
+        """Mark a ticket resolved; returns its row."""
+        return self.set_status(ticket_id, RESOLVED, now)
+    
+    def _track_open(self, row: int, now_ts: int):
+        """Start SLA tracking for an open ticket."""
+        if self._due[row] <= now_ts:
+            self._breached.add(row)
+        else:
+            heapq.heappush(self._due_heap, (self._due[row], row))
+    
+    def advance(self, now: Optional[datetime] = None):
+        """Move open tickets that have come due into the breached set."""
+        now_ts = _epoch(now)
+        while self._due_heap and self._due_heap[0][0] <= now_ts:
+            due, row = heapq.heappop(self._due_heap)
+            if self._statuses[row] in OPEN_STATUSES and self._due[row] == due:
+                self._breached.add(row)
+    
+    def order_positions(self) -> np.ndarray:
+        """Rows in queue order (priority, then newest first)."""
+        if self._order_cache is None:
+            for rank in self._unsorted:
+                # Stable, so tickets created at the same time keep insertion order
+                times, rows = (np.array(values, dtype=np.int64) for values in self._buckets[rank])
+                order = np.argsort(times, kind='stable')
+                self._buckets[rank] = (times[order].tolist(), rows[order].tolist())
+            self._unsorted.clear()
+            self._order_cache = np.concatenate(
+                [np.array(rows, dtype=np.int64)[::-1] for _, rows in self._buckets])
+        return self._order_cache
+    
+    def breached_mask(self, now: Optional[datetime] = None) -> np.ndarray:
+        """Boolean array over rows: open tickets past their SLA."""
+        self.advance(now)
+        mask = np.zeros(len(self._ids), dtype=bool)
+        if self._breached:
+            mask[np.fromiter(self._breached, dtype=np.int64, count=len(self._breached))] = True
+        return mask
+    
+    def sla_status(self, ticket_id, now: Optional[datetime] = None) -> Dict:
+        """
+        SLA details for one ticket.
+        
+        Returns:
+            Dictionary with due (datetime), age (timedelta, frozen once
+            resolved; None if the resolution time is unknown) and breached
+            (open and past due, or resolved late)
+        """
+        row = self._rows[ticket_id]
+        if self._statuses[row] in OPEN_STATUSES:
+            end = _epoch(now)
+            breached = self._due[row] <= end
+        else:
+            # Tickets loaded as resolved have no recorded resolution time
+            end = self._resolved_at.get(row)
+            breached = end is not None and end > self._due[row]
+        return {
+            'due': pd.Timestamp(self._due[row], unit='s').to_pydatetime(),
+            'age': None if end is None else timedelta(seconds=max(end - self._created[row], 0)),
+            'breached': breached,
+        }